@@ -0,0 +1,163 @@
+"""ASGI variant of ``flask_app``: ``uvicorn apps.asgi_app:app`` (needs the ``asgi`` extra).
+
+SIR runs and batch interaction checks go to a bounded process pool, so one long
+simulation never holds up the event loop; single checks and scheduler calls run
+in threads. Identical requests in flight together share one computation, and
+each endpoint turns work away with 429 + ``Retry-After`` once its concurrency
+limit is reached. ``/health`` is never limited.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from healthcare_suite.scheduler import BookingConflict
+from healthcare_suite.service import (
+    Coalescer,
+    ConcurrencyLimit,
+    Overloaded,
+    availability,
+    book_appointment,
+    check_interactions,
+    check_interactions_batch,
+    med_key,
+    run_sir,
+    scheduler_store,
+    sir_query,
+)
+
+Handler = Callable[[Request], Awaitable[Response]]
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.environ.get(name, default))
+
+
+WORKERS = _env_int("HEALTHCARE_WORKERS", os.cpu_count() or 1)
+LIMITS: Dict[str, ConcurrencyLimit] = {
+    "interactions": ConcurrencyLimit(_env_int("HEALTHCARE_LIMIT_INTERACTIONS", 64)),
+    "batch": ConcurrencyLimit(_env_int("HEALTHCARE_LIMIT_BATCH", WORKERS)),
+    "sir": ConcurrencyLimit(_env_int("HEALTHCARE_LIMIT_SIR", 2 * WORKERS), retry_after=2.0),
+    "scheduler": ConcurrencyLimit(_env_int("HEALTHCARE_LIMIT_SCHEDULER", 32)),
+}
+coalescer = Coalescer()
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+async def _offload(fn: Callable[[Any], Any], arg: Any) -> Any:
+    return await asyncio.get_running_loop().run_in_executor(_pool, fn, arg)
+
+
+async def _limited(limit: ConcurrencyLimit, work: Callable[[], Awaitable[Any]]) -> Any:
+    limit.acquire()
+    try:
+        return await work()
+    finally:
+        limit.release()
+
+
+def _error(message: str, status: int, headers: Optional[Dict[str, str]] = None) -> JSONResponse:
+    return JSONResponse({"error": message}, status_code=status, headers=headers)
+
+
+def _endpoint(handler: Handler) -> Handler:
+    """Map ``Overloaded`` to 429, ``BookingConflict`` to 409 and bad input to 400."""
+
+    async def endpoint(request: Request) -> Response:
+        try:
+            return await handler(request)
+        except Overloaded as exc:
+            return _error(str(exc), 429, {"Retry-After": exc.retry_after_header})
+        except BookingConflict as exc:
+            return _error(str(exc), 409)
+        except (KeyError, TypeError, ValueError) as exc:
+            return _error(str(exc), 400)
+
+    return endpoint
+
+
+async def health(request: Request) -> Response:
+    return JSONResponse({"status": "ok"})
+
+
+@_endpoint
+async def interactions_check(request: Request) -> Response:
+    payload = await request.json()
+    result = await coalescer.run(
+        ("check", med_key(payload)),
+        partial(run_in_threadpool, check_interactions, payload),
+        LIMITS["interactions"],
+    )
+    return JSONResponse(result)
+
+
+@_endpoint
+async def interactions_check_batch(request: Request) -> Response:
+    payload = await request.json()
+    result = await _limited(LIMITS["batch"], partial(_offload, check_interactions_batch, payload))
+    return JSONResponse(result)
+
+
+@_endpoint
+async def sir_simulate(request: Request) -> Response:
+    query = sir_query(await request.json())
+    work = partial(_offload, run_sir, query)
+    body, headers = await coalescer.run(("sir", query), work, LIMITS["sir"])
+    if isinstance(body, bytes):
+        return Response(body, media_type="application/octet-stream", headers=headers)
+    return JSONResponse(body)
+
+
+@_endpoint
+async def scheduler_book(request: Request) -> Response:
+    payload = await request.json()
+    work = partial(run_in_threadpool, book_appointment, scheduler_store(), payload)
+    booked = await _limited(LIMITS["scheduler"], work)
+    return JSONResponse(booked, status_code=201)
+
+
+@_endpoint
+async def scheduler_availability(request: Request) -> Response:
+    args = dict(request.query_params)
+    work = partial(run_in_threadpool, availability, scheduler_store(), args)
+    slots = await _limited(LIMITS["scheduler"], work)
+    return JSONResponse(slots)
+
+
+@asynccontextmanager
+async def lifespan(app: Starlette):
+    global _pool
+    _pool = ProcessPoolExecutor(max_workers=WORKERS)
+    try:
+        yield
+    finally:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+app = Starlette(
+    routes=[
+        Route("/health", health, methods=["GET"]),
+        Route("/interactions/check", interactions_check, methods=["POST"]),
+        Route("/interactions/check-batch", interactions_check_batch, methods=["POST"]),
+        Route("/sir/simulate", sir_simulate, methods=["POST"]),
+        Route("/scheduler/book", scheduler_book, methods=["POST"]),
+        Route("/scheduler/availability", scheduler_availability, methods=["GET"]),
+    ],
+    lifespan=lifespan,
+)
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host="0.0.0.0", port=8000)
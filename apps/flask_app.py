@@ -1,40 +1,115 @@
 from __future__ import annotations
 
-from flask import Flask, jsonify, request
+import os
+import time
 
-from healthcare_suite.interactions import InteractionDB
-from healthcare_suite.sir import SIRModel, SIRParams
+from flask import Flask, Response, g, jsonify, request
+
+from healthcare_suite import metrics, service
+from healthcare_suite.profiling import SamplingProfiler, profile_path
+from healthcare_suite.scheduler import BookingConflict, SQLiteCalendarStore
+from healthcare_suite.service import (
+    RequestError,
+    availability,
+    book_appointment,
+    check_interactions,
+    check_interactions_batch,
+    run_sir,
+    sir_query,
+)
 
 app = Flask(__name__)
-DEFAULT_INTERACTIONS = "data/sample_interactions.csv"
+# Requests slower than this many milliseconds get a sampled profile written to PROFILE_DIR.
+app.config["PROFILE_THRESHOLD_MS"] = float(os.environ.get("HEALTHCARE_PROFILE_THRESHOLD_MS", "0"))
+app.config["PROFILE_DIR"] = os.environ.get("HEALTHCARE_PROFILE_DIR", "profiles")
+
+# The service collects metrics unless HEALTHCARE_METRICS says otherwise.
+if "HEALTHCARE_METRICS" not in os.environ:
+    metrics.enable()
+
+REQUEST_SECONDS = metrics.histogram(
+    "healthcare_http_request_seconds", "Flask request latency.", ["endpoint", "method", "status"]
+)
+
+def scheduler_store() -> SQLiteCalendarStore:
+    return service.scheduler_store(app.config.get("SCHEDULER_DB", service.SCHEDULER_DB))
+
+@app.before_request
+def start_request():
+    g.started = time.perf_counter()
+    if app.config["PROFILE_THRESHOLD_MS"] > 0:
+        g.profiler = SamplingProfiler().start()
+
+@app.after_request
+def finish_request(response: Response) -> Response:
+    elapsed = time.perf_counter() - g.started
+    endpoint = request.endpoint or "unmatched"
+    REQUEST_SECONDS.observe(elapsed, endpoint, request.method, str(response.status_code))
+    profiler = g.pop("profiler", None)
+    if profiler is not None:
+        profiler.stop()
+        if elapsed * 1e3 >= app.config["PROFILE_THRESHOLD_MS"] and profiler.samples:
+            profiler.dump(profile_path(app.config["PROFILE_DIR"], endpoint, elapsed))
+    return response
 
 @app.get("/health")
 def health():
     return jsonify({"status": "ok"})
 
+@app.get("/metrics")
+def metrics_endpoint():
+    """Counters and histograms in the Prometheus text exposition format."""
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
 @app.post("/interactions/check")
 def interactions_check():
-    payload = request.get_json(force=True)
-    meds = payload.get("medications", [])
-    db_path = payload.get("db_path", DEFAULT_INTERACTIONS)
-    db = InteractionDB.from_csv(db_path)
-    hits = db.check_list(meds)
-    return jsonify({"count": len(hits), "hits": [h.__dict__ for h in hits]})
+    return jsonify(check_interactions(request.get_json(force=True)))
+
+@app.post("/interactions/check-batch")
+def interactions_check_batch():
+    """Check many medication lists in one round-trip (see ``check_interactions_batch``)."""
+    try:
+        return jsonify(check_interactions_batch(request.get_json(force=True)))
+    except RequestError as exc:
+        return jsonify({"error": str(exc)}), 400
 
 @app.post("/sir/simulate")
 def sir_simulate():
-    payload = request.get_json(force=True)
-    params = SIRParams(
-        population=int(payload["population"]),
-        beta=float(payload["beta"]),
-        gamma=float(payload["gamma"]),
-        initial_infected=int(payload.get("initial_infected", 1)),
-        initial_recovered=int(payload.get("initial_recovered", 0)),
-    )
-    days = int(payload.get("days", 160))
-    dt = float(payload.get("dt", 0.2))
-    df = SIRModel(params).simulate_euler(days=days, dt=dt)
-    return jsonify({"rows": df.to_dict(orient="records")})
+    """Simulate and return ``rows`` (default), ``columns`` or a ``binary`` float64 body.
+
+    ``max_points`` thins the result server-side; ``binary`` returns the ``t, S, I, R``
+    columns back to back as little-endian float64 with the row count in a header.
+    """
+    try:
+        query = sir_query(request.get_json(force=True))
+    except RequestError as exc:
+        return jsonify({"error": str(exc)}), 400
+    body, headers = run_sir(query)
+    if isinstance(body, bytes):
+        return Response(body, mimetype="application/octet-stream", headers=headers)
+    return jsonify(body)
+
+@app.post("/scheduler/book")
+def scheduler_book():
+    """Book the first free slot in ``[requested_start, requested_end)`` with ``provider_id``.
+
+    The check and the insert are one transaction, so concurrent workers cannot
+    double-book; returns 201 with the appointment, or 409 when nothing fits.
+    """
+    try:
+        return jsonify(book_appointment(scheduler_store(), request.get_json(force=True))), 201
+    except BookingConflict as exc:
+        return jsonify({"error": str(exc)}), 409
+    except RequestError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+@app.get("/scheduler/availability")
+def scheduler_availability():
+    """Free slots of ``duration_minutes`` for ``provider_id`` between ``start`` and ``end``."""
+    try:
+        return jsonify(availability(scheduler_store(), request.args))
+    except RequestError as exc:
+        return jsonify({"error": str(exc)}), 400
 
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=8000, debug=True)
@@ -5,7 +5,7 @@ from datetime import datetime, timedelta
 import pandas as pd
 import streamlit as st
 
-from healthcare_suite.interactions import InteractionDB, parse_med_list_from_text
+from healthcare_suite.interactions import default_registry, parse_med_list_from_text
 from healthcare_suite.sir import SIRModel, SIRParams
 from healthcare_suite.sir.plots import plot_sir_matplotlib, plot_sir_plotly
 from healthcare_suite.scheduler import AppointmentRequest, DoctorCalendar, Priority, schedule_requests
@@ -18,12 +18,17 @@ tab1, tab2, tab3 = st.tabs(["Drug interactions", "SIR simulator", "Appointment s
 with tab1:
     st.subheader("Drug interaction checker")
     db_path = st.text_input("Interaction CSV path", value="data/sample_interactions.csv")
+    aliases_path = st.text_input(
+        "Alias CSV path (brand names, synonyms, drug classes)", value="data/sample_aliases.csv"
+    )
     meds_text = st.text_area("Medications (comma or newline separated)", value="warfarin\nibuprofen\namiodarone", height=120)
     if st.button("Check interactions"):
         try:
-            db = InteractionDB.from_csv(db_path)
             meds = parse_med_list_from_text(meds_text)
-            hits = db.check_list(meds)
+            hits = default_registry().check(db_path, meds, aliases=aliases_path or None)
+            for u in hits.unresolved:
+                hint = f" Did you mean: {', '.join(u.suggestions)}?" if u.suggestions else ""
+                st.error(f"'{u.name}' is not in the interaction dataset and was not checked.{hint}")
             if not hits:
                 st.success("No interactions found in the current dataset.")
             else:
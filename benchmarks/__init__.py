@@ -0,0 +1 @@
+"""Performance benchmarks: ``python -m benchmarks --help`` (run from the repository root)."""
@@ -0,0 +1,138 @@
+"""Seeded synthetic data for the benchmarks; the same seed always gives the same data."""
+
+from __future__ import annotations
+
+import csv
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+
+from healthcare_suite.scheduler import AppointmentRequest, Priority
+from healthcare_suite.sir import SIRParams
+
+_SYLLABLES = "ab cor dex fen gli lor mab nol pra quin sar tin vir zol".split()
+_SEVERITIES = ["major", "moderate", "minor"]
+_DURATIONS = [10, 15, 20, 30, 45]
+
+
+def drug_names(n: int) -> List[str]:
+    """``n`` distinct pronounceable names; the i-th name never depends on ``n``."""
+    names = []
+    k = len(_SYLLABLES)
+    for i in range(n):
+        a, b, c = i % k, (i // k) % k, (i // (k * k)) % k
+        names.append(f"{_SYLLABLES[a]}{_SYLLABLES[b]}{_SYLLABLES[c]}{i // k**3 or ''}")
+    return names
+
+
+def interaction_table(
+    directory: str | Path, n_drugs: int, pairs_per_drug: int = 5, seed: int = 0
+) -> Tuple[Path, Path, List[str]]:
+    """Write an interactions CSV and an alias CSV; returns both paths and the drug names.
+
+    Partners are drawn with a Zipf-like skew, so a few drugs (the warfarins of the
+    table) interact with many others. One drug in ten gets a brand name and the
+    table has ``n_drugs // 50`` drug classes (also used as interaction partners).
+    """
+    rng = np.random.default_rng(seed)
+    names = drug_names(n_drugs)
+    weights = 1.0 / np.arange(1, n_drugs + 1) ** 0.8
+    weights /= weights.sum()
+    n_pairs = n_drugs * pairs_per_drug // 2
+    a = rng.integers(0, n_drugs, n_pairs)
+    b = rng.choice(n_drugs, n_pairs, p=weights)
+    severity = rng.integers(0, len(_SEVERITIES), n_pairs)
+    classes = [f"class{c}" for c in range(max(n_drugs // 50, 1))]
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    interactions = directory / f"interactions_{n_drugs}_{seed}.csv"
+    with interactions.open("w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["drug_a", "drug_b", "severity", "description"])
+        for i, j, s in zip(a.tolist(), b.tolist(), severity.tolist()):
+            if i != j:
+                w.writerow([names[i], names[j], _SEVERITIES[s], f"Synthetic interaction {i}-{j}."])
+        partners = rng.integers(0, n_drugs, len(classes))
+        for c, drug in zip(rng.integers(0, len(classes), len(classes)), partners):
+            w.writerow([classes[c], names[drug], "moderate", "Synthetic class interaction."])
+
+    aliases = directory / f"aliases_{n_drugs}_{seed}.csv"
+    with aliases.open("w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["name", "target", "kind"])
+        for i in range(0, n_drugs, 10):
+            w.writerow([f"{names[i]}brand", names[i], "brand"])
+        for i in range(n_drugs):
+            w.writerow([classes[i % len(classes)], names[i], "class"])
+    return interactions, aliases, names
+
+
+def polypharmacy_profiles(
+    names: List[str],
+    n_profiles: int,
+    min_meds: int = 5,
+    max_meds: int = 15,
+    unknown_rate: float = 0.02,
+    seed: int = 0,
+) -> List[List[str]]:
+    """Medication lists of ``min_meds`` to ``max_meds`` drugs, some misspelled or unknown."""
+    rng = np.random.default_rng(seed)
+    profiles = []
+    for size in rng.integers(min_meds, max_meds + 1, n_profiles).tolist():
+        meds = [names[i] for i in rng.choice(len(names), size, replace=False).tolist()]
+        for k in np.flatnonzero(rng.random(size) < unknown_rate).tolist():
+            meds[k] = meds[k] + "q"
+        profiles.append(meds)
+    return profiles
+
+
+def sir_params(population: int = 1_000_000, seed: int = 0) -> SIRParams:
+    """A realistic scenario: R0 between 1.5 and 4, recovery in 5 to 14 days."""
+    rng = np.random.default_rng(seed)
+    gamma = 1.0 / rng.uniform(5, 14)
+    beta = gamma * rng.uniform(1.5, 4.0)
+    return SIRParams(population, float(beta), float(gamma), initial_infected=10)
+
+
+def clinic_requests(
+    n_requests: int,
+    day: datetime = datetime(2026, 1, 12),
+    open_hour: int = 8,
+    close_hour: int = 18,
+    days: int = 1,
+    seed: int = 0,
+) -> List[AppointmentRequest]:
+    """Requests over ``days`` consecutive days: 5% emergencies, 20% urgent, the rest routine.
+
+    Windows are one to four hours inside opening hours, so a few hundred requests
+    make a day dense enough that most of them compete for the same slots.
+    """
+    rng = np.random.default_rng(seed)
+    open_minutes = (close_hour - open_hour) * 60
+    durations = rng.choice(_DURATIONS, n_requests)
+    widths = rng.integers(12, 49, n_requests) * 5
+    offsets = rng.integers(0, open_minutes // 5, n_requests) * 5
+    day_index = rng.integers(0, days, n_requests)
+    kind = rng.random(n_requests)
+    requests = []
+    for n in range(n_requests):
+        opening = day + timedelta(days=int(day_index[n]), hours=open_hour)
+        width = max(int(widths[n]), int(durations[n]))
+        start = min(int(offsets[n]), open_minutes - width)
+        if kind[n] < 0.05:
+            priority = Priority.EMERGENCY
+        else:
+            priority = Priority.URGENT if kind[n] < 0.25 else Priority.ROUTINE
+        requests.append(
+            AppointmentRequest(
+                patient_id=f"P{n:06d}",
+                requested_start=opening + timedelta(minutes=start),
+                requested_end=opening + timedelta(minutes=start + width),
+                duration_minutes=int(durations[n]),
+                priority=priority,
+            )
+        )
+    return requests
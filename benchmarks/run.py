@@ -0,0 +1,302 @@
+"""Run the benchmark cases, write JSON results and compare them against a baseline.
+
+Each case runs once untimed to warm up, then is timed on fresh inputs (built
+outside the timed region) at least ``repeat`` times and until ``MIN_TIME``
+seconds have been spent, so fast cases get enough samples to be stable. Peak
+Python-heap memory (NumPy arrays included) is measured in one extra run under
+``tracemalloc``, so tracing never slows the timed runs. A result regresses when
+its best time or peak memory exceeds the baseline by more than the threshold
+for its case; the best of many runs is far less noisy than the median.
+"""
+
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta
+from datetime import time as clock
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from healthcare_suite.interactions import InteractionDB
+from healthcare_suite.scheduler import (
+    ClinicScheduler,
+    DoctorCalendar,
+    SlotGridCalendar,
+    schedule_requests,
+)
+from healthcare_suite.scheduler.clinic import working_days
+from healthcare_suite.sir import SIRModel
+
+from . import generators
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+MIN_TIME = 0.5
+MAX_RUNS = 200
+# A case turns (size, seed, scratch directory) into a zero-argument callable to measure.
+Setup = Callable[[int, int, Path], Callable[[], Any]]
+
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    setup: Setup
+    sizes: Tuple[int, ...]
+    quick_sizes: Tuple[int, ...]
+    unit: str
+
+
+@dataclass
+class Result:
+    case: str
+    size: int
+    unit: str
+    runs: int
+    median_s: float
+    min_s: float
+    peak_mib: float
+
+
+def _interaction_load(size: int, seed: int, scratch: Path) -> Callable[[], Any]:
+    csv_path, aliases, _ = generators.interaction_table(scratch, size, seed=seed)
+    return lambda: InteractionDB.from_csv(csv_path, aliases=aliases)
+
+
+_databases: Dict[Tuple[int, int], Tuple[InteractionDB, List[str]]] = {}
+
+
+def _database(size: int, seed: int, scratch: Path) -> Tuple[InteractionDB, List[str]]:
+    if (size, seed) not in _databases:
+        csv_path, aliases, names = generators.interaction_table(scratch, size, seed=seed)
+        _databases[size, seed] = InteractionDB.from_csv(csv_path, aliases=aliases), names
+    return _databases[size, seed]
+
+
+def _interaction_check(size: int, seed: int, scratch: Path) -> Callable[[], Any]:
+    db, names = _database(size, seed, scratch)
+    profiles = generators.polypharmacy_profiles(names, 1000, seed=seed)
+    return lambda: [db.check_list(meds, suggest=False) for meds in profiles]
+
+
+def _interaction_check_many(size: int, seed: int, scratch: Path) -> Callable[[], Any]:
+    db, names = _database(size, seed, scratch)
+    profiles = generators.polypharmacy_profiles(names, 1000, seed=seed)
+    return lambda: db.check_many(profiles)
+
+
+def _sir(method: str) -> Setup:
+    def setup(size: int, seed: int, scratch: Path) -> Callable[[], Any]:
+        model = SIRModel(generators.sir_params(seed=seed))
+        return lambda: model.simulate(size, dt=0.1, method=method)
+
+    return setup
+
+
+def _schedule(calendar: Callable[..., Any]) -> Setup:
+    def setup(size: int, seed: int, scratch: Path) -> Callable[[], Any]:
+        requests = generators.clinic_requests(size, seed=seed)
+        day = requests[0].requested_start.replace(hour=8, minute=0)
+        cal = calendar(day, day + timedelta(hours=10), 5)
+        return lambda: schedule_requests(cal, requests)
+
+    return setup
+
+
+def _clinic(size: int, seed: int, scratch: Path) -> Callable[[], Any]:
+    days = 5
+    requests = generators.clinic_requests(size, days=days, seed=seed)
+    clinic = ClinicScheduler()
+    for p in range(max(size // 200, 1)):
+        calendars = working_days(date(2026, 1, 12), days, open_at=clock(8), close_at=clock(18))
+        clinic.add_provider(f"D{p:04d}", calendars)
+    return lambda: clinic.schedule(requests)
+
+
+CASES: List[Case] = [
+    Case("interactions.load", _interaction_load, (1_000, 10_000, 50_000), (1_000,), "drugs"),
+    Case("interactions.check", _interaction_check, (1_000, 10_000, 50_000), (1_000,), "drugs"),
+    Case(
+        "interactions.check_many",
+        _interaction_check_many,
+        (1_000, 10_000, 50_000),
+        (1_000,),
+        "drugs",
+    ),
+    Case("sir.euler", _sir("euler"), (365, 3_650, 36_500), (365,), "days"),
+    Case("sir.rk4", _sir("rk4"), (365, 3_650, 36_500), (365,), "days"),
+    Case("scheduler.interval", _schedule(DoctorCalendar), (100, 300, 1_000), (100,), "requests"),
+    Case("scheduler.slotgrid", _schedule(SlotGridCalendar), (100, 300, 1_000), (100,), "requests"),
+    Case("scheduler.clinic", _clinic, (1_000, 10_000), (1_000,), "requests"),
+]
+
+
+def measure(case: Case, size: int, seed: int, repeat: int, scratch: Path) -> Result:
+    case.setup(size, seed, scratch)()
+    times: List[float] = []
+    while len(times) < repeat or (sum(times) < MIN_TIME and len(times) < MAX_RUNS):
+        fn = case.setup(size, seed, scratch)
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    fn = case.setup(size, seed, scratch)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return Result(
+        case.name, size, case.unit, len(times), statistics.median(times), min(times), peak / 2**20
+    )
+
+
+def run(
+    cases: Sequence[Case],
+    quick: bool = False,
+    repeat: int = 5,
+    seed: int = 0,
+    log: Optional[Callable] = print,
+) -> List[Result]:
+    results = []
+    with tempfile.TemporaryDirectory(prefix="hs-bench-") as scratch:
+        for case in cases:
+            for size in case.quick_sizes if quick else case.sizes:
+                result = measure(case, size, seed, repeat, Path(scratch))
+                if log:
+                    log(
+                        f"{case.name:<26} {size:>8} {case.unit:<9} "
+                        f"best {result.min_s * 1e3:>9.2f} ms  "
+                        f"median {result.median_s * 1e3:>9.2f} ms  "
+                        f"peak {result.peak_mib:>7.2f} MiB  ({result.runs} runs)"
+                    )
+                results.append(result)
+    _databases.clear()
+    return results
+
+
+def environment() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def compare(
+    results: Sequence[Result],
+    baseline: Sequence[Dict[str, Any]],
+    threshold: float = 0.25,
+    memory_threshold: float = 0.25,
+    per_case: Optional[Dict[str, float]] = None,
+) -> List[str]:
+    """Describe every result slower or bigger than its baseline entry beyond the threshold.
+
+    ``per_case`` maps case-name patterns (``fnmatch`` style) to time thresholds that
+    override ``threshold``; results with no baseline entry are skipped.
+    """
+    base = {(b["case"], b["size"]): b for b in baseline}
+    regressions = []
+    for r in results:
+        b = base.get((r.case, r.size))
+        if b is None:
+            continue
+        limit = threshold
+        for pattern, value in (per_case or {}).items():
+            if fnmatch.fnmatchcase(r.case, pattern):
+                limit = value
+        if r.min_s > b["min_s"] * (1 + limit):
+            regressions.append(
+                f"{r.case}[{r.size}] time {r.min_s * 1e3:.2f} ms vs {b['min_s'] * 1e3:.2f} ms "
+                f"({r.min_s / b['min_s'] - 1:+.0%}, limit {limit:+.0%})"
+            )
+        if r.peak_mib > b["peak_mib"] * (1 + memory_threshold) and r.peak_mib - b["peak_mib"] > 1.0:
+            regressions.append(
+                f"{r.case}[{r.size}] memory {r.peak_mib:.2f} MiB vs {b['peak_mib']:.2f} MiB "
+                f"({r.peak_mib / b['peak_mib'] - 1:+.0%}, limit {memory_threshold:+.0%})"
+            )
+    return regressions
+
+
+def _case_threshold(text: str) -> Tuple[str, float]:
+    pattern, _, value = text.rpartition("=")
+    return pattern, float(value)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument(
+        "-k", "--only", action="append", default=[], help="case name pattern, e.g. 'sir.*'"
+    )
+    parser.add_argument("--quick", action="store_true", help="smallest size of each case only")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", type=Path, help="write results to this JSON file")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--no-compare", action="store_true", help="skip the baseline comparison")
+    parser.add_argument(
+        "--update-baseline", action="store_true", help="overwrite the baseline with these results"
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=0.25, help="allowed time regression (0.25 = +25%%)"
+    )
+    parser.add_argument("--memory-threshold", type=float, default=0.25)
+    parser.add_argument(
+        "--case-threshold",
+        type=_case_threshold,
+        action="append",
+        default=[],
+        metavar="PATTERN=X",
+        help="time threshold for matching cases",
+    )
+    args = parser.parse_args(argv)
+    if args.repeat <= 0:
+        parser.error("--repeat must be positive")
+
+    cases = [
+        c for c in CASES if not args.only or any(fnmatch.fnmatchcase(c.name, p) for p in args.only)
+    ]
+    if not cases:
+        parser.error("no case matches --only")
+    results = run(cases, quick=args.quick, repeat=args.repeat, seed=args.seed)
+    document = {
+        "environment": environment(),
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "results": [asdict(r) for r in results],
+    }
+    if args.output:
+        args.output.write_text(json.dumps(document, indent=2) + "\n")
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(document, indent=2) + "\n")
+        print(f"baseline written to {args.baseline}")
+        return 0
+    if args.no_compare or not args.baseline.exists():
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())
+    regressions = compare(
+        results,
+        baseline["results"],
+        args.threshold,
+        args.memory_threshold,
+        dict(args.case_threshold),
+    )
+    for line in regressions:
+        print(f"REGRESSION {line}", file=sys.stderr)
+    if not regressions:
+        print(f"no regressions against {args.baseline}")
+    return 1 if regressions else 0
@@ -1 +1 @@
-__all__ = ["interactions", "sir", "scheduler"]
+__all__ = ["interactions", "sir", "scheduler", "service", "metrics", "profiling"]
@@ -0,0 +1,216 @@
+"""``healthcare-suite``: check medication lists, simulate SIR runs and book appointments.
+
+Every subcommand reads a file (or stdin, the default) and writes CSV or JSON
+lines to stdout, so it fits in shell pipelines and cron jobs. Each subcommand
+imports only what it needs when it runs: ``check`` never loads NumPy or pandas
+and starts in a few tens of milliseconds.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import sys
+from datetime import datetime, time
+from typing import Dict, List, Optional, Sequence
+
+SCHEDULE_FIELDS = ["patient_id", "provider_id", "start", "end", "priority", "status"]
+
+
+def _check(args: argparse.Namespace) -> int:
+    from .interactions import InteractionDB
+    from .interactions.bulk import HitWriter, iter_patient_batches, screen_batch
+    from .interactions.db import check_meds
+    from .interactions.io import parse_med_list_from_text
+
+    if not args.db:
+        raise ValueError("no interactions database: pass --db or set HEALTHCARE_INTERACTIONS_DB")
+    db = InteractionDB.load(args.db, aliases=args.aliases or None)
+    writer = HitWriter(sys.stdout, args.format)
+    if args.extract:
+        batches = iter_patient_batches(
+            args.input, args.patient_column, args.medication_column, args.batch_rows
+        )
+        for batch, _ in batches:
+            for patient_id, hits in screen_batch(batch, db):
+                writer.write(patient_id, hits)
+        return 0
+
+    # One comma-separated medication list per line, identified by its line number.
+    resolved: Dict[str, Optional[int]] = {}
+    for n, line in enumerate(args.input, 1):
+        meds = parse_med_list_from_text(line)
+        if not meds:
+            continue
+        result = check_meds(db, meds, resolved, suggest=False)
+        writer.write(str(n), list(result))
+        for unknown in result.unresolved:
+            print(f"line {n}: unknown medication {unknown.name!r}", file=sys.stderr)
+    return 0
+
+
+def _simulate(args: argparse.Namespace) -> int:
+    from .sir.integrate import iter_sir
+    from .sir.model import SIRModel, SIRParams
+
+    params = SIRParams(
+        args.population, args.beta, args.gamma, args.initial_infected, args.initial_recovered
+    )
+    model = SIRModel(params)
+    samples = iter_sir(
+        model.initial_state(),
+        params.beta,
+        params.gamma,
+        float(params.population),
+        args.days,
+        args.dt,
+        method=args.method,
+        output_dt=args.output_dt,
+    )
+    writer = csv.writer(sys.stdout)
+    writer.writerow(["t", "S", "I", "R"])
+    for t, S, I, R in samples:
+        writer.writerow([f"{t:.6g}", f"{S:.6f}", f"{I:.6f}", f"{R:.6f}"])
+    return 0
+
+
+def _schedule(args: argparse.Namespace) -> int:
+    from .scheduler import AppointmentRequest, ClinicScheduler, Priority, working_days
+
+    requests: List[AppointmentRequest] = []
+    for row in csv.DictReader(args.input):
+        try:
+            text = (row.get("priority") or "ROUTINE").strip()
+            priority = Priority(int(text)) if text.isdigit() else Priority[text.upper()]
+            requests.append(
+                AppointmentRequest(
+                    patient_id=row["patient_id"],
+                    requested_start=datetime.fromisoformat(row["requested_start"]),
+                    requested_end=datetime.fromisoformat(row["requested_end"]),
+                    duration_minutes=int(row.get("duration_minutes") or 15),
+                    priority=priority,
+                    note=row.get("note") or "",
+                    specialty=row.get("specialty") or None,
+                )
+            )
+        except (KeyError, TypeError, ValueError) as exc:
+            raise ValueError(f"request on line {len(requests) + 2}: {exc!r}") from None
+
+    writer = csv.writer(sys.stdout)
+    writer.writerow(SCHEDULE_FIELDS)
+    if not requests:
+        return 0
+    first = min(r.requested_start for r in requests).date()
+    last = max(r.requested_end for r in requests).date()
+    clinic = ClinicScheduler()
+    for provider_id in args.provider or ["D1"]:
+        calendars = working_days(
+            first,
+            (last - first).days + 1,
+            args.open,
+            args.close,
+            args.slot_minutes,
+            weekends=args.weekends,
+        )
+        clinic.add_provider(provider_id, calendars)
+    result = clinic.schedule(requests)
+
+    bumped = {id(a) for a in result.preempted}
+    for a in result.confirmed:
+        status = "preempted" if id(a) in bumped else "booked"
+        writer.writerow(
+            [
+                a.patient_id,
+                a.provider_id,
+                a.start.isoformat(),
+                a.end.isoformat(),
+                a.priority.name,
+                status,
+            ]
+        )
+    for r in result.rejected:
+        writer.writerow([r.patient_id, "", "", "", r.priority.name, "rejected"])
+    return 0
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="healthcare-suite", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    infile = argparse.FileType("r", encoding="utf-8")
+
+    check = commands.add_parser(
+        "check",
+        help="check medication lists for interactions",
+        description="Check one comma-separated medication list per input line (or, with "
+        "--extract, a patient_id,medication CSV) and write every interaction found.",
+    )
+    check.add_argument(
+        "input", nargs="?", type=infile, default="-", help="input file (default: stdin)"
+    )
+    check.add_argument(
+        "--db",
+        default=os.environ.get("HEALTHCARE_INTERACTIONS_DB"),
+        help="interactions CSV or compiled snapshot (default: $HEALTHCARE_INTERACTIONS_DB)",
+    )
+    check.add_argument(
+        "--aliases",
+        default=os.environ.get("HEALTHCARE_ALIASES"),
+        help="aliases CSV (default: $HEALTHCARE_ALIASES)",
+    )
+    check.add_argument("--format", choices=["jsonl", "csv"], default="jsonl")
+    check.add_argument("--extract", action="store_true", help="input is a patient extract CSV")
+    check.add_argument("--patient-column", default="patient_id")
+    check.add_argument("--medication-column", default="medication")
+    check.add_argument("--batch-rows", type=int, default=50_000)
+    check.set_defaults(run=_check)
+
+    simulate = commands.add_parser(
+        "simulate",
+        help="simulate an SIR outbreak",
+        description="Write t,S,I,R rows as they are integrated.",
+    )
+    simulate.add_argument("--population", type=int, required=True)
+    simulate.add_argument("--beta", type=float, required=True)
+    simulate.add_argument("--gamma", type=float, required=True)
+    simulate.add_argument("--initial-infected", type=int, default=1)
+    simulate.add_argument("--initial-recovered", type=int, default=0)
+    simulate.add_argument("--days", type=float, default=160)
+    simulate.add_argument("--dt", type=float, default=0.1)
+    simulate.add_argument("--method", choices=["euler", "rk4", "rk45"], default="euler")
+    simulate.add_argument("--output-dt", type=float, help="sampling interval of the output")
+    simulate.set_defaults(run=_simulate)
+
+    schedule = commands.add_parser(
+        "schedule",
+        help="book appointment requests",
+        description="Book a CSV of requests (patient_id, requested_start, requested_end and "
+        "optionally duration_minutes, priority, note, specialty) in input order across the "
+        "providers' working days, and write one row per request.",
+    )
+    schedule.add_argument(
+        "input", nargs="?", type=infile, default="-", help="input file (default: stdin)"
+    )
+    schedule.add_argument(
+        "--provider", action="append", help="provider ID; repeat for several (default: D1)"
+    )
+    schedule.add_argument("--open", type=time.fromisoformat, default=time(9, 0), help="HH:MM")
+    schedule.add_argument("--close", type=time.fromisoformat, default=time(17, 0), help="HH:MM")
+    schedule.add_argument("--slot-minutes", type=int, default=5)
+    schedule.add_argument("--weekends", action="store_true", help="also open on weekends")
+    schedule.set_defaults(run=_schedule)
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = _parser()
+    args = parser.parse_args(argv)
+    try:
+        return args.run(args)
+    except (OSError, ValueError) as exc:
+        if isinstance(exc, BrokenPipeError):
+            # The reader went away (e.g. ``| head``); stop quietly.
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            return 1
+        parser.exit(2, f"{parser.prog}: error: {exc}\n")
+    return 0
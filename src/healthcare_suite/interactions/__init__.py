@@ -1,2 +1,7 @@
+from .aliases import AliasTable
+from .bulk import ScreeningReport, screen_extract
 from .db import InteractionDB
 from .io import load_med_list_from_csv, parse_med_list_from_text
+from .profile import MedProfile
+from .registry import InteractionRegistry, default_registry
+from .snapshot import InteractionSnapshot
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import csv
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Set
+
+from .models import normalize_drug_name
+
+ALIAS_KINDS = {"synonym", "brand", "class"}
+
+
+@dataclass
+class AliasTable:
+    """Synonym/brand names and drug classes, resolved to canonical ingredients.
+
+    ``synonyms`` maps a normalized alias to its normalized ingredient and ``classes``
+    maps a normalized class name to the closure of its member ingredients (nested
+    classes are flattened once, at load time).
+    """
+    synonyms: Dict[str, str] = field(default_factory=dict)
+    classes: Dict[str, List[str]] = field(default_factory=dict)
+
+    @classmethod
+    def from_csv(cls, path: str | Path) -> "AliasTable":
+        """Load a ``name,target,kind`` CSV.
+
+        ``kind`` is ``synonym`` or ``brand`` (``name`` is another name for ``target``) or
+        ``class`` (``target`` is a member of the class ``name``); it defaults to ``synonym``.
+        """
+        synonyms: Dict[str, str] = {}
+        members: Dict[str, List[str]] = {}
+        with Path(path).open(newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            required = {"name", "target"}
+            if not required.issubset(reader.fieldnames or set()):
+                raise ValueError(f"CSV must contain columns: {sorted(required)}")
+            for row in reader:
+                kind = (row.get("kind") or "synonym").strip().lower()
+                if kind not in ALIAS_KINDS:
+                    raise ValueError(
+                        f"unknown alias kind {kind!r}; expected one of {sorted(ALIAS_KINDS)}"
+                    )
+                name = normalize_drug_name(row["name"])
+                target = normalize_drug_name(row["target"])
+                if not name or not target:
+                    continue
+                if kind == "class":
+                    members.setdefault(name, []).append(target)
+                else:
+                    synonyms[name] = target
+
+        # Chase synonym chains (brand -> synonym -> ingredient) to a fixed point.
+        for name in list(synonyms):
+            seen = {name}
+            target = synonyms[name]
+            while target in synonyms and target not in seen:
+                seen.add(target)
+                target = synonyms[target]
+            synonyms[name] = target
+
+        table = cls(synonyms=synonyms)
+        for name in members:
+            table.classes[name] = table._closure(name, members, set())
+        return table
+
+    def canonical(self, name: str) -> str:
+        """Canonical ingredient for a normalized name (the name itself if unknown)."""
+        return self.synonyms.get(name, name)
+
+    def expand(self, name: str) -> List[str]:
+        """Ingredients a normalized name from an interaction row stands for."""
+        members = self.classes.get(name)
+        return members if members is not None else [self.canonical(name)]
+
+    def _closure(self, name: str, members: Dict[str, List[str]], visiting: Set[str]) -> List[str]:
+        visiting.add(name)
+        out: Dict[str, None] = {}
+        for m in members[name]:
+            if m in members:
+                if m not in visiting:
+                    out.update(dict.fromkeys(self._closure(m, members, visiting)))
+            else:
+                out[self.canonical(m)] = None
+        visiting.discard(name)
+        return list(out)
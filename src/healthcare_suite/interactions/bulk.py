@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import csv
+import json
+import os
+import time
+from collections import deque
+from contextlib import ExitStack
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Callable, Deque, Iterator, List, Optional, Set, Tuple, Union
+
+from .db import InteractionDB
+from .models import InteractionHit
+from .snapshot import InteractionSnapshot
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+# A batch of (patient_id, medications) groups and the number of extract rows it covers.
+PatientBatch = Tuple[List[Tuple[str, List[str]]], int]
+HIT_FIELDS = ["patient_id", "a", "b", "severity", "description"]
+
+
+@dataclass
+class ScreeningReport:
+    rows: int = 0
+    patients: int = 0
+    patients_with_hits: int = 0
+    hits: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+
+def iter_patient_batches(
+    path: str | Path | IO[str],
+    patient_column: str = "patient_id",
+    medication_column: str = "medication",
+    batch_rows: int = 50_000,
+    check_contiguous: bool = True,
+) -> Iterator[PatientBatch]:
+    """Stream an extract as batches of per-patient medication lists.
+
+    Rows for a patient must be contiguous (the usual order of a pharmacy extract);
+    only the current batch is held in memory. With ``check_contiguous``, a patient
+    that reappears after its group was closed raises ``ValueError`` rather than being
+    screened in two halves; this keeps every patient ID seen so far, so memory grows
+    with the number of patients. Turn it off for very large extracts already sorted
+    by patient. ``path`` may also be an open text file, such as ``sys.stdin``.
+    """
+    if batch_rows <= 0:
+        raise ValueError("batch_rows must be positive")
+    with ExitStack() as stack:
+        if hasattr(path, "read"):
+            f = path
+        else:
+            f = stack.enter_context(Path(path).open(newline="", encoding="utf-8"))
+        reader = csv.reader(f)
+        header = next(reader, None) or []
+        if patient_column not in header or medication_column not in header:
+            raise ValueError(
+                f"CSV must contain '{patient_column}' and '{medication_column}' columns"
+            )
+        pcol, mcol = header.index(patient_column), header.index(medication_column)
+
+        closed: Set[str] = set()
+        batch: List[Tuple[str, List[str]]] = []
+        batch_count = 0
+        current: Optional[str] = None
+        meds: List[str] = []
+        for row in reader:
+            if not row:
+                continue
+            pid = row[pcol]
+            if pid != current:
+                if current is not None:
+                    if check_contiguous:
+                        closed.add(current)
+                    batch.append((current, meds))
+                    if batch_count >= batch_rows:
+                        yield batch, batch_count
+                        batch, batch_count = [], 0
+                if check_contiguous and pid in closed:
+                    raise ValueError(f"rows for patient {pid!r} are not contiguous")
+                current, meds = pid, []
+            meds.append(row[mcol])
+            batch_count += 1
+        if current is not None:
+            batch.append((current, meds))
+        if batch:
+            yield batch, batch_count
+
+
+_worker_db: Union[InteractionDB, InteractionSnapshot, None] = None
+
+
+def _init_worker(source: Union[str, InteractionDB]) -> None:
+    global _worker_db
+    _worker_db = InteractionDB.load(source) if isinstance(source, str) else source
+
+
+def screen_batch(
+    batch: List[Tuple[str, List[str]]], db: Union[InteractionDB, InteractionSnapshot, None] = None
+) -> List[Tuple[str, List[InteractionHit]]]:
+    """``(patient_id, hits)`` for the patients in ``batch`` that have any hits.
+
+    ``db`` defaults to the database loaded by the process pool's initializer.
+    """
+    if db is None:
+        db = _worker_db
+    assert db is not None
+    results = db.check_many(meds for _, meds in batch)
+    return [(pid, hits) for (pid, _), hits in zip(batch, results) if hits]
+
+
+class HitWriter:
+    """Write hits as JSON lines or as CSV rows (with a ``HIT_FIELDS`` header)."""
+
+    def __init__(self, f: IO[str], fmt: str):
+        self._f = f
+        self._csv = None
+        if fmt == "csv":
+            self._csv = csv.writer(f)
+            self._csv.writerow(HIT_FIELDS)
+        elif fmt != "jsonl":
+            raise ValueError("output format must be 'jsonl' or 'csv'")
+
+    def write(self, patient_id: str, hits: List[InteractionHit]) -> None:
+        for h in hits:
+            if self._csv is not None:
+                self._csv.writerow([patient_id, h.a, h.b, h.severity, h.description])
+            else:
+                self._f.write(json.dumps({"patient_id": patient_id, **h.__dict__}) + "\n")
+
+
+def screen_extract(
+    extract: str | Path,
+    db: str | Path | InteractionDB | InteractionSnapshot,
+    out: str | Path,
+    patient_column: str = "patient_id",
+    medication_column: str = "medication",
+    batch_rows: int = 50_000,
+    workers: Optional[int] = None,
+    output_format: Optional[str] = None,
+    progress: Optional[Callable[[ScreeningReport], None]] = None,
+    check_contiguous: bool = True,
+) -> ScreeningReport:
+    """Screen a ``(patient_id, medication)`` extract and write every hit to ``out``.
+
+    Patients are batched and fanned out to ``workers`` processes (``workers <= 1``
+    screens in-process). Each worker loads the database once; pass a snapshot path
+    so the workers share its pages. At most ``2 * workers`` batches are in flight and
+    results are written in input order as they complete. ``output_format`` defaults
+    to the suffix of ``out`` (``.csv``, otherwise JSONL). ``check_contiguous`` is
+    passed to ``iter_patient_batches``.
+    """
+    out = Path(out)
+    fmt = output_format or ("csv" if out.suffix.lower() == ".csv" else "jsonl")
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    if isinstance(db, InteractionSnapshot):
+        source: Union[str, InteractionDB] = str(db.path)
+    elif isinstance(db, InteractionDB):
+        source = db
+    else:
+        source = str(db)
+
+    report = ScreeningReport()
+    started = time.perf_counter()
+    batches = iter_patient_batches(
+        extract, patient_column, medication_column, batch_rows, check_contiguous
+    )
+
+    with out.open("w", newline="", encoding="utf-8") as f:
+        writer = HitWriter(f, fmt)
+
+        def record(batch: List[Tuple[str, List[str]]], rows: int, results) -> None:
+            report.rows += rows
+            report.patients += len(batch)
+            report.patients_with_hits += len(results)
+            for pid, hits in results:
+                report.hits += len(hits)
+                writer.write(pid, hits)
+            report.seconds = time.perf_counter() - started
+            if progress is not None:
+                progress(report)
+
+        if workers <= 1:
+            local = InteractionDB.load(source) if isinstance(source, str) else source
+            for batch, rows in batches:
+                record(batch, rows, screen_batch(batch, local))
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            pending: Deque[Tuple[List[Tuple[str, List[str]]], int, Future]] = deque()
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker, initargs=(source,)
+            ) as pool:
+                for batch, rows in batches:
+                    pending.append((batch, rows, pool.submit(screen_batch, batch)))
+                    if len(pending) >= 2 * workers:
+                        b, r, fut = pending.popleft()
+                        record(b, r, fut.result())
+                while pending:
+                    b, r, fut = pending.popleft()
+                    record(b, r, fut.result())
+
+    report.seconds = time.perf_counter() - started
+    return report
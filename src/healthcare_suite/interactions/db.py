@@ -1,61 +1,276 @@
 from __future__ import annotations
 
 import csv
-from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Collection,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
-from .models import DrugInteraction, InteractionHit, normalize_drug_name
+from .. import metrics
+from .aliases import AliasTable
+from .fuzzy import FuzzyResolver
+from .models import (
+    CheckResult,
+    DrugInteraction,
+    InteractionHit,
+    UnresolvedDrug,
+    normalize_drug_name,
+    severity_rank,
+)
+
+if TYPE_CHECKING:
+    from .snapshot import InteractionSnapshot
+
+# Resolved medication profile: drug ID -> (first position in the input, caller's spelling).
+Profile = Dict[int, Tuple[int, str]]
+
+_LOAD_SECONDS = metrics.histogram(
+    "healthcare_interactions_load_seconds", "Time to build an InteractionDB from CSV."
+)
+_CHECK_SECONDS = metrics.histogram(
+    "healthcare_interactions_check_seconds", "Time to check one medication list."
+)
+_PAIRS_CHECKED = metrics.counter(
+    "healthcare_interactions_pairs_checked_total", "Drug pairs covered by medication list checks."
+)
+_HITS = metrics.counter("healthcare_interactions_hits_total", "Interactions found by checks.")
+
+
+def resolve_profile(
+    meds: Iterable[str],
+    lookup: Callable[[str], Optional[int]],
+    resolved: Dict[str, Optional[int]],
+    unresolved: Optional[Dict[str, str]] = None,
+) -> Profile:
+    """Map a medication list to drug IDs; ``resolved`` caches raw name -> ID across calls.
+
+    Names that match nothing are collected in ``unresolved`` (normalized -> first spelling).
+    """
+    profile: Profile = {}
+    for m in meds:
+        if m in resolved:
+            i = resolved[m]
+        else:
+            i = resolved[m] = lookup(normalize_drug_name(m)) if m and m.strip() else None
+        if i is None:
+            if unresolved is not None and m and m.strip():
+                unresolved.setdefault(normalize_drug_name(m), m)
+            continue
+        prev = profile.get(i)
+        profile[i] = (len(profile) if prev is None else prev[0], m)
+    return profile
+
+
+def check_meds(
+    db, meds: Iterable[str], resolved: Dict[str, Optional[int]], suggest: bool
+) -> CheckResult:
+    """``check_list`` for any backend: hits plus unresolved names, optionally with suggestions."""
+    unresolved: Dict[str, str] = {}
+    with _CHECK_SECONDS.time():
+        hits = check_profile(db, resolve_profile(meds, db._lookup, resolved, unresolved))
+    return CheckResult(
+        hits,
+        (
+            UnresolvedDrug(name, tuple(db.suggest(name)) if suggest else ())
+            for name in unresolved.values()
+        ),
+    )
+
+
+def check_profile(db, profile: Profile) -> List[InteractionHit]:
+    """Sorted hits for a resolved profile, using the backend's ``_partners``/``_describe``."""
+    hits: List[InteractionHit] = []
+    for i, (pos_i, name_i) in profile.items():
+        for j, handle in db._partners(i, profile):
+            pos_j, name_j = profile[j]
+            if pos_j > pos_i:
+                severity, description = db._describe(handle)
+                hits.append(
+                    InteractionHit(a=name_i, b=name_j, severity=severity, description=description)
+                )
+    hits.sort(key=InteractionHit.sort_key)
+    _PAIRS_CHECKED.inc(len(profile) * (len(profile) - 1) // 2)
+    _HITS.inc(len(hits))
+    return hits
 
 
-@dataclass
 class InteractionDB:
-    """In-memory interaction DB indexed by unordered normalized pairs."""
-    _index: Dict[Tuple[str, str], DrugInteraction]
+    """In-memory interaction DB over interned drug IDs.
+
+    Every normalized drug name is interned to an integer ID and ``_adj[i]`` maps each
+    neighbour ID of drug ``i`` to the interaction between them, so checking a
+    medication list only touches pairs that actually interact.
+
+    With an ``AliasTable``, brand names and synonyms resolve to their ingredient and
+    class-level rows (e.g. macrolides + statins) are expanded into member pairs up
+    front, so lookups stay O(1). Expanded pairs share the class row's
+    ``DrugInteraction`` object and never override an ingredient-level row.
+    """
+
+    def __init__(
+        self, interactions: Iterable[DrugInteraction] = (), aliases: Optional[AliasTable] = None
+    ):
+        self.aliases = aliases or AliasTable()
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._adj: List[Dict[int, DrugInteraction]] = []
+        self._pairs = 0
+        self._fuzzy: Optional[FuzzyResolver] = None
+        for di in interactions:
+            self.add(di)
 
     @classmethod
-    def from_csv(cls, path: str | Path) -> "InteractionDB":
+    def from_csv(
+        cls, path: str | Path, aliases: str | Path | AliasTable | None = None
+    ) -> "InteractionDB":
         path = Path(path)
-        index: Dict[Tuple[str, str], DrugInteraction] = {}
-        with path.open(newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            required = {"drug_a", "drug_b", "severity", "description"}
-            if not required.issubset(reader.fieldnames or set()):
-                raise ValueError(f"CSV must contain columns: {sorted(required)}")
-            for row in reader:
-                di = DrugInteraction(
-                    drug_a=row["drug_a"],
-                    drug_b=row["drug_b"],
-                    severity=row["severity"],
-                    description=row["description"],
-                )
-                index[di.key()] = di
-        return cls(index)
-
-    def check_list(self, meds: Iterable[str]) -> List[InteractionHit]:
-        meds_norm = [normalize_drug_name(m) for m in meds if m and m.strip()]
-        original_map = {normalize_drug_name(m): m for m in meds if m and m.strip()}
-
-        hits: List[InteractionHit] = []
-        seen = set()
-        for i in range(len(meds_norm)):
-            for j in range(i + 1, len(meds_norm)):
-                a, b = meds_norm[i], meds_norm[j]
-                key = tuple(sorted((a, b)))
-                if key in seen:
-                    continue
-                seen.add(key)
-                di = self._index.get(key)
-                if di:
-                    hits.append(
-                        InteractionHit(
-                            a=original_map.get(a, di.drug_a),
-                            b=original_map.get(b, di.drug_b),
-                            severity=di.severity,
-                            description=di.description,
-                        )
+        with _LOAD_SECONDS.time():
+            if aliases is not None and not isinstance(aliases, AliasTable):
+                aliases = AliasTable.from_csv(aliases)
+            with path.open(newline="", encoding="utf-8") as f:
+                reader = csv.DictReader(f)
+                required = {"drug_a", "drug_b", "severity", "description"}
+                if not required.issubset(reader.fieldnames or set()):
+                    raise ValueError(f"CSV must contain columns: {sorted(required)}")
+                rows = (
+                    DrugInteraction(
+                        drug_a=row["drug_a"],
+                        drug_b=row["drug_b"],
+                        severity=row["severity"],
+                        description=row["description"],
                     )
+                    for row in reader
+                )
+                return cls(rows, aliases=aliases)
+
+    @staticmethod
+    def compile(
+        csv_path: str | Path, out: str | Path, aliases: str | Path | AliasTable | None = None
+    ) -> Path:
+        """Parse ``csv_path`` once and write a memory-mappable snapshot to ``out``."""
+        from .snapshot import compile_snapshot
+
+        return compile_snapshot(InteractionDB.from_csv(csv_path, aliases=aliases), out)
+
+    @staticmethod
+    def open_snapshot(path: str | Path) -> "InteractionSnapshot":
+        from .snapshot import InteractionSnapshot
+
+        return InteractionSnapshot(path)
+
+    @classmethod
+    def load(
+        cls, path: str | Path, aliases: str | Path | AliasTable | None = None
+    ) -> "InteractionDB | InteractionSnapshot":
+        """Open ``path`` as a snapshot if it is one, otherwise parse it as CSV.
+
+        Snapshots carry the aliases they were compiled with, so ``aliases`` only
+        applies to CSVs.
+        """
+        from .snapshot import is_snapshot
+
+        return cls.open_snapshot(path) if is_snapshot(path) else cls.from_csv(path, aliases=aliases)
+
+    def __len__(self) -> int:
+        return self._pairs
+
+    def __contains__(self, name: str) -> bool:
+        return self._lookup(normalize_drug_name(name)) is not None
+
+    @property
+    def drugs(self) -> List[str]:
+        """Normalized names of every drug that appears in an interaction."""
+        return list(self._names)
+
+    def add(self, di: DrugInteraction) -> None:
+        """Index an interaction; a later row for the same pair replaces the earlier one.
+
+        Class-level rows fill in member pairs that have no ingredient-level row; when
+        two class rows cover the same pair, the more severe one is kept.
+        """
+        a, b = di.key()
+        classes = self.aliases.classes
+        if a in classes or b in classes:
+            for x in self.aliases.expand(a):
+                for y in self.aliases.expand(b):
+                    if x != y:
+                        self._link(x, y, di, derived=True)
+        else:
+            self._link(self.aliases.canonical(a), self.aliases.canonical(b), di, derived=False)
+
+    def get(self, a: str, b: str) -> Optional[DrugInteraction]:
+        ia = self._lookup(normalize_drug_name(a))
+        ib = self._lookup(normalize_drug_name(b))
+        if ia is None or ib is None:
+            return None
+        return self._adj[ia].get(ib)
+
+    def pairs(self) -> Iterator[Tuple[str, str, DrugInteraction]]:
+        """Every indexed pair as ``(drug, drug, interaction)`` with normalized drug names."""
+        for i, nbrs in enumerate(self._adj):
+            for j, di in nbrs.items():
+                if i <= j:
+                    yield self._names[i], self._names[j], di
+
+    def check_list(self, meds: Iterable[str], suggest: bool = True) -> CheckResult:
+        """Sorted hits for ``meds``; ``result.unresolved`` lists names not in the DB."""
+        return check_meds(self, meds, {}, suggest)
+
+    def check_many(
+        self, med_lists: Iterable[Iterable[str]], suggest: bool = False
+    ) -> List[CheckResult]:
+        """Check many medication lists in one call, sharing name resolution across them."""
+        resolved: Dict[str, Optional[int]] = {}
+        return [check_meds(self, meds, resolved, suggest) for meds in med_lists]
+
+    def suggest(self, name: str, max_distance: Optional[int] = None, limit: int = 5) -> List[str]:
+        """Known drug or alias names close to ``name`` (see ``FuzzyResolver.suggest``)."""
+        if self._fuzzy is None:
+            self._fuzzy = FuzzyResolver(self._names + list(self.aliases.synonyms))
+        return self._fuzzy.suggest(name, max_distance=max_distance, limit=limit)
+
+    def _lookup(self, name: str) -> Optional[int]:
+        return self._ids.get(self.aliases.synonyms.get(name, name))
+
+    def _is_class_row(self, di: DrugInteraction) -> bool:
+        return any(side in self.aliases.classes for side in di.key())
+
+    def _link(self, a: str, b: str, di: DrugInteraction, derived: bool) -> None:
+        ia, ib = self._intern(a), self._intern(b)
+        self._fuzzy = None
+        existing = self._adj[ia].get(ib)
+        if existing is None:
+            self._pairs += 1
+        elif derived and (
+            not self._is_class_row(existing)
+            or severity_rank(existing.severity) <= severity_rank(di.severity)
+        ):
+            return
+        self._adj[ia][ib] = di
+        self._adj[ib][ia] = di
+
+    def _intern(self, name: str) -> int:
+        i = self._ids.get(name)
+        if i is None:
+            i = self._ids[name] = len(self._names)
+            self._names.append(name)
+            self._adj.append({})
+        return i
+
+    def _partners(self, i: int, among: Collection[int]) -> List[Tuple[int, DrugInteraction]]:
+        """Drugs in ``among`` that interact with drug ``i``, walking the smaller side."""
+        nbrs = self._adj[i]
+        if len(nbrs) < len(among):
+            return [(j, di) for j, di in nbrs.items() if j in among]
+        return [(j, nbrs[j]) for j in among if j in nbrs]
 
-        severity_order = {"major": 0, "moderate": 1, "minor": 2}
-        hits.sort(key=lambda h: (severity_order.get(h.severity.lower(), 99), h.pair_key()))
-        return hits
+    def _describe(self, di: DrugInteraction) -> Tuple[str, str]:
+        return di.severity, di.description
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .models import normalize_drug_name
+
+
+def bounded_levenshtein(a: str, b: str, max_distance: int) -> Optional[int]:
+    """Edit distance between ``a`` and ``b``, or ``None`` if it exceeds ``max_distance``.
+
+    Uses Myers' bit-parallel algorithm (one machine word per column of the DP
+    table) with ``a`` as the pattern, and gives up once the distance can no longer
+    come back under the bound.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return None
+    if len(a) > len(b):
+        a, b = b, a
+    m = len(a)
+    if m == 0:
+        return len(b)
+    peq: Dict[str, int] = {}
+    for i, c in enumerate(a):
+        peq[c] = peq.get(c, 0) | (1 << i)
+    mask = (1 << m) - 1
+    last = 1 << (m - 1)
+    pv, mv, score = mask, 0, m
+    remaining = len(b)
+    for c in b:
+        eq = peq.get(c, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | ~(xh | pv)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        remaining -= 1
+        if score - remaining > max_distance:
+            return None
+        ph = (ph << 1) | 1
+        pv = ((mh << 1) | ~(xv | ph)) & mask
+        mv = ph & xv & mask
+    return score if score <= max_distance else None
+
+
+def auto_distance(name: str) -> int:
+    return 0 if len(name) <= 2 else 1 if len(name) <= 5 else 2
+
+
+class FuzzyResolver:
+    """Suggest vocabulary names close to a misspelled one.
+
+    Names are indexed by padded character ``q``-grams. An edit changes at most ``q``
+    grams, so a name within edit distance ``k`` must share at least
+    ``|grams(query)| - k * q`` distinct grams with the query; only those candidates
+    are verified with a banded Levenshtein. Names are numbered in (length, name)
+    order, so every posting list is sorted by length and the length filter
+    (``|len(a) - len(b)| <= k``) is a bisect into each list. Queries too short for
+    the gram filter fall back to a scan of the names of compatible length.
+    """
+
+    def __init__(self, vocabulary: Iterable[str], q: int = 3):
+        if q <= 0:
+            raise ValueError("q must be positive")
+        self.q = q
+        names = {normalize_drug_name(v) for v in vocabulary if v and v.strip()}
+        self._names: List[str] = sorted(names, key=lambda n: (len(n), n))
+        self._postings: Dict[str, List[int]] = {}
+        # first name ID of each length; names of length n are IDs [_starts[n], _starts[n + 1])
+        longest = len(self._names[-1]) if self._names else 0
+        self._starts: List[int] = [0] * (longest + 2)
+        for i, name in enumerate(self._names):
+            for g in self._grams(name):
+                self._postings.setdefault(g, []).append(i)
+        for n in range(longest + 1):
+            self._starts[n + 1] = bisect_left(self._names, n + 1, key=len)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def suggest(self, name: str, max_distance: Optional[int] = None, limit: int = 5) -> List[str]:
+        """Up to ``limit`` names within ``max_distance`` edits, closest first.
+
+        By default the bound scales with the query: no edits up to 2 characters, one
+        edit up to 5 and two beyond that, which keeps short names from matching half
+        the vocabulary.
+        """
+        query = normalize_drug_name(name)
+        if not query or limit <= 0:
+            return []
+        if max_distance is None:
+            max_distance = auto_distance(query)
+        longest = len(self._starts) - 2
+        lo = self._starts[min(max(len(query) - max_distance, 0), longest + 1)]
+        hi = self._starts[min(len(query) + max_distance + 1, longest + 1)]
+        grams = self._grams(query)
+        threshold = len(grams) - max_distance * self.q
+        if threshold > 0:
+            counts: Counter = Counter()
+            for g in grams:
+                postings = self._postings.get(g)
+                if postings:
+                    counts.update(postings[bisect_left(postings, lo) : bisect_left(postings, hi)])
+            candidates: Iterable[int] = [i for i, c in counts.items() if c >= threshold]
+        else:
+            candidates = range(lo, hi)
+
+        scored: List[Tuple[int, str]] = []
+        for i in candidates:
+            cand = self._names[i]
+            d = bounded_levenshtein(query, cand, max_distance)
+            if d is not None:
+                scored.append((d, cand))
+        scored.sort()
+        return [cand for _, cand in scored[:limit]]
+
+    def _grams(self, name: str) -> set:
+        pad = "\x00" * (self.q - 1)
+        padded = f"{pad}{name}{pad}"
+        return {padded[k : k + self.q] for k in range(len(padded) - self.q + 1)}
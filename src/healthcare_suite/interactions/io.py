@@ -3,10 +3,9 @@ from __future__ import annotations
 from pathlib import Path
 from typing import List
 
-import pandas as pd
-
 
 def load_med_list_from_csv(path: str | Path, column: str = "medication") -> List[str]:
+    import pandas as pd
     df = pd.read_csv(path)
     if column not in df.columns:
         raise ValueError(f"CSV must contain a '{column}' column")
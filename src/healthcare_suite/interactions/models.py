@@ -1,6 +1,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Iterable, List, Tuple
+
+SEVERITY_ORDER = {"major": 0, "moderate": 1, "minor": 2}
 
 
 def normalize_drug_name(name: str) -> str:
@@ -8,6 +11,11 @@ def normalize_drug_name(name: str) -> str:
     return name.strip().lower()
 
 
+def severity_rank(severity: str) -> int:
+    """Sort rank of a severity label; unknown labels sort last."""
+    return SEVERITY_ORDER.get(severity.lower(), 99)
+
+
 @dataclass(frozen=True)
 class DrugInteraction:
     drug_a: str
@@ -30,3 +38,27 @@ class InteractionHit:
 
     def pair_key(self) -> tuple[str, str]:
         return tuple(sorted((normalize_drug_name(self.a), normalize_drug_name(self.b))))
+
+    def sort_key(self) -> tuple[int, tuple[str, str]]:
+        return severity_rank(self.severity), self.pair_key()
+
+
+@dataclass(frozen=True)
+class UnresolvedDrug:
+    name: str
+    suggestions: Tuple[str, ...] = ()
+
+
+class CheckResult(List[InteractionHit]):
+    """Sorted interaction hits, plus the medications that matched nothing in the DB.
+
+    It is a plain list of hits for existing callers; ``unresolved`` lists the
+    unknown names (with spelling suggestions) so a typo is never mistaken for
+    "no interactions".
+    """
+
+    def __init__(
+        self, hits: Iterable[InteractionHit] = (), unresolved: Iterable[UnresolvedDrug] = ()
+    ):
+        super().__init__(hits)
+        self.unresolved: List[UnresolvedDrug] = list(unresolved)
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Tuple, Union
+
+from .db import InteractionDB
+from .models import InteractionHit, normalize_drug_name
+from .snapshot import InteractionSnapshot
+
+SortKey = Tuple[int, Tuple[str, str]]
+
+
+class MedProfile:
+    """A patient's active medication list with incremental interaction checks.
+
+    ``add`` and ``remove`` only touch the changed drug's neighbours, and the sorted
+    hit list is maintained in place, so ``hits()`` always equals
+    ``db.check_list(profile.meds)`` without recomputing it.
+    """
+
+    def __init__(self, db: Union[InteractionDB, InteractionSnapshot], meds: Iterable[str] = ()):
+        self.db = db
+        self._active: Dict[int, str] = {}
+        self._unresolved: Dict[str, str] = {}
+        # drug ID -> [(partner drug ID, hit)] for every active hit involving that drug
+        self._by_drug: Dict[int, List[Tuple[int, InteractionHit]]] = {}
+        self._hits: List[InteractionHit] = []
+        self._keys: List[SortKey] = []
+        for m in meds:
+            self.add(m)
+
+    def __len__(self) -> int:
+        return len(self._active) + len(self._unresolved)
+
+    def __contains__(self, drug: str) -> bool:
+        norm = normalize_drug_name(drug)
+        i = self.db._lookup(norm)
+        return i in self._active if i is not None else norm in self._unresolved
+
+    @property
+    def meds(self) -> List[str]:
+        """Active medications with interaction data, in the order they were added."""
+        return list(self._active.values())
+
+    @property
+    def unresolved(self) -> List[str]:
+        """Active medications the database does not know about."""
+        return list(self._unresolved.values())
+
+    def hits(self) -> List[InteractionHit]:
+        return list(self._hits)
+
+    def add(self, drug: str) -> List[InteractionHit]:
+        """Add a drug and return only the hits it introduces (already sorted)."""
+        if not drug or not drug.strip():
+            return []
+        norm = normalize_drug_name(drug)
+        i = self.db._lookup(norm)
+        if i is None:
+            self._unresolved.setdefault(norm, drug)
+            return []
+        if i in self._active:
+            return []
+
+        new: List[InteractionHit] = []
+        for j, handle in self.db._partners(i, self._active):
+            severity, description = self.db._describe(handle)
+            hit = InteractionHit(
+                a=self._active[j], b=drug, severity=severity, description=description
+            )
+            self._insert(hit)
+            self._by_drug.setdefault(i, []).append((j, hit))
+            self._by_drug.setdefault(j, []).append((i, hit))
+            new.append(hit)
+        self._active[i] = drug
+        new.sort(key=InteractionHit.sort_key)
+        return new
+
+    def remove(self, drug: str) -> List[InteractionHit]:
+        """Discontinue a drug and return the hits that went away with it."""
+        norm = normalize_drug_name(drug)
+        i = self.db._lookup(norm)
+        if i is None or i not in self._active:
+            self._unresolved.pop(norm, None)
+            return []
+        del self._active[i]
+        removed: List[InteractionHit] = []
+        for j, hit in self._by_drug.pop(i, []):
+            self._discard(hit)
+            partner = self._by_drug[j]
+            partner.remove((i, hit))
+            if not partner:
+                del self._by_drug[j]
+            removed.append(hit)
+        removed.sort(key=InteractionHit.sort_key)
+        return removed
+
+    def _insert(self, hit: InteractionHit) -> None:
+        key = hit.sort_key()
+        pos = bisect_left(self._keys, key)
+        self._keys.insert(pos, key)
+        self._hits.insert(pos, hit)
+
+    def _discard(self, hit: InteractionHit) -> None:
+        pos = bisect_left(self._keys, hit.sort_key())
+        while self._hits[pos] is not hit:
+            pos += 1
+        del self._keys[pos]
+        del self._hits[pos]
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, Optional, Tuple, Union
+
+from .db import InteractionDB
+from .models import CheckResult, InteractionHit, UnresolvedDrug, normalize_drug_name
+from .snapshot import InteractionSnapshot
+
+# (mtime_ns, size) of each file a database was loaded from.
+FileSignature = Tuple[Tuple[int, int], ...]
+# (interactions path, alias table path or None), both resolved.
+RegistryKey = Tuple[str, Optional[str]]
+AnyInteractionDB = Union[InteractionDB, InteractionSnapshot]
+
+
+def _signature(key: RegistryKey) -> FileSignature:
+    stats = [Path(p).stat() for p in key if p is not None]
+    return tuple((st.st_mtime_ns, st.st_size) for st in stats)
+
+
+def _key(path: str | Path, aliases: Optional[str | Path]) -> RegistryKey:
+    return str(Path(path).resolve()), None if aliases is None else str(Path(aliases).resolve())
+
+
+@dataclass
+class RegistryStats:
+    hits: int = 0
+    misses: int = 0
+    stale_hits: int = 0
+    reloads: int = 0
+    reload_errors: int = 0
+    evictions: int = 0
+    memo_hits: int = 0
+    memo_misses: int = 0
+
+
+@dataclass
+class _Entry:
+    db: AnyInteractionDB
+    signature: FileSignature
+    memo: "OrderedDict[Tuple[str, ...], CheckResult]" = field(default_factory=OrderedDict)
+    reloading: bool = False
+
+
+class InteractionRegistry:
+    """Process-wide cache of loaded InteractionDBs keyed by path, mtime and size.
+
+    When a file changes on disk, callers keep getting the previous database while a
+    background thread reloads it; the new database (with an empty result memo) is
+    swapped in under the lock once parsing succeeds. Paths may point at interaction
+    CSVs or compiled snapshots (see ``InteractionDB.load``); an alias table path, when
+    given, is part of the key and is watched for changes too.
+    """
+
+    def __init__(
+        self,
+        max_databases: int = 4,
+        max_memo: int = 4096,
+        background: bool = True,
+        loader: Callable[[str, Optional[str]], AnyInteractionDB] = InteractionDB.load,
+    ):
+        if max_databases <= 0:
+            raise ValueError("max_databases must be positive")
+        if max_memo < 0:
+            raise ValueError("max_memo must be non-negative")
+        self.max_databases = max_databases
+        self.max_memo = max_memo
+        self.background = background
+        self._loader = loader
+        self._entries: "OrderedDict[RegistryKey, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = RegistryStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, path: str | Path, aliases: Optional[str | Path] = None) -> AnyInteractionDB:
+        return self._entry(_key(path, aliases)).db
+
+    def check(
+        self, path: str | Path, meds: Iterable[str], aliases: Optional[str | Path] = None
+    ) -> CheckResult:
+        """Like ``InteractionDB.check_list`` but memoized on the normalized med list.
+
+        The memo key keeps the input order: each hit names the drug listed first as ``a``.
+        """
+        meds = [m for m in meds if m and m.strip()]
+        entry = self._entry(_key(path, aliases))
+        original_map = {normalize_drug_name(m): m for m in meds}
+        key = tuple(normalize_drug_name(m) for m in meds)
+
+        with self._lock:
+            cached = entry.memo.get(key)
+            if cached is not None:
+                entry.memo.move_to_end(key)
+                self.stats.memo_hits += 1
+            else:
+                self.stats.memo_misses += 1
+        if cached is not None:
+            # Results carry the caller's spelling of each drug, so relabel the memoized ones.
+            def spelled(name: str) -> str:
+                return original_map.get(normalize_drug_name(name), name)
+
+            return CheckResult(
+                (
+                    InteractionHit(
+                        a=spelled(h.a),
+                        b=spelled(h.b),
+                        severity=h.severity,
+                        description=h.description,
+                    )
+                    for h in cached
+                ),
+                (UnresolvedDrug(spelled(u.name), u.suggestions) for u in cached.unresolved),
+            )
+
+        result = entry.db.check_list(meds)
+        if self.max_memo:
+            with self._lock:
+                entry.memo[key] = result
+                while len(entry.memo) > self.max_memo:
+                    entry.memo.popitem(last=False)
+        return CheckResult(result, result.unresolved)
+
+    def invalidate(
+        self, path: Optional[str | Path] = None, aliases: Optional[str | Path] = None
+    ) -> None:
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(_key(path, aliases), None)
+
+    def _entry(self, key: RegistryKey) -> _Entry:
+        sig = _signature(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if entry.signature == sig:
+                    self.stats.hits += 1
+                    return entry
+                if self.background:
+                    self.stats.stale_hits += 1
+                    if not entry.reloading:
+                        entry.reloading = True
+                        threading.Thread(
+                            target=self._reload,
+                            args=(key,),
+                            name=f"interaction-reload:{key[0]}",
+                            daemon=True,
+                        ).start()
+                    return entry
+
+        with self._lock:
+            if entry is None:
+                self.stats.misses += 1
+            else:
+                self.stats.reloads += 1
+        db = self._loader(*key)
+        return self._store(key, db, sig)
+
+    def _reload(self, key: RegistryKey) -> None:
+        try:
+            sig = _signature(key)
+            db = self._loader(*key)
+        except Exception:
+            with self._lock:
+                self.stats.reload_errors += 1
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.reloading = False
+            return
+        with self._lock:
+            self.stats.reloads += 1
+        self._store(key, db, sig, only_if_present=True)
+
+    def _store(
+        self,
+        key: RegistryKey,
+        db: AnyInteractionDB,
+        sig: FileSignature,
+        only_if_present: bool = False,
+    ) -> _Entry:
+        entry = _Entry(db=db, signature=sig)
+        with self._lock:
+            if only_if_present and key not in self._entries:
+                return entry
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_databases:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+        return entry
+
+
+_default_registry: Optional[InteractionRegistry] = None
+_default_lock = threading.Lock()
+
+
+def default_registry() -> InteractionRegistry:
+    """Return the registry shared by everything in this process."""
+    global _default_registry
+    with _default_lock:
+        if _default_registry is None:
+            _default_registry = InteractionRegistry()
+        return _default_registry
@@ -0,0 +1,276 @@
+"""Compiled, memory-mapped interaction snapshots.
+
+Layout (little-endian, every section 8-byte aligned)::
+
+    header      magic, n_drugs, n_pairs, n_strings, n_aliases
+    str_offsets uint64[n_strings + 1]   offsets into str_blob
+    str_blob    utf-8 bytes             strings 0..n_drugs-1 are the sorted normalized drug names
+    row_ptr     uint32[n_drugs + 1]     CSR rows into nbr/nbr_pair
+    nbr         uint32[2 * n_pairs]     neighbour drug IDs, sorted within each row
+    nbr_pair    uint32[2 * n_pairs]     pair index for each neighbour entry
+    pair_a      uint32[n_pairs]         sorted pair array (pair_a < pair_b)
+    pair_b      uint32[n_pairs]
+    severity    uint32[n_pairs]         string IDs
+    description uint32[n_pairs]
+    drug_a      uint32[n_pairs]         original spelling of each side, as written in the CSV
+    drug_b      uint32[n_pairs]
+    alias_name  uint32[n_aliases]       string IDs of synonym/brand names, sorted by their bytes
+    alias_target uint32[n_aliases]      drug ID each alias resolves to
+
+Opening a snapshot only parses the header; the arrays are views over a shared
+read-only mapping, and ``DrugInteraction`` objects are built only for hits.
+"""
+from __future__ import annotations
+
+import itertools
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Callable, Collection, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .db import InteractionDB, check_meds
+from .fuzzy import FuzzyResolver
+from .models import CheckResult, DrugInteraction, normalize_drug_name
+
+MAGIC = b"HSIDB\x00\x00\x01"
+_HEADER = struct.Struct("<8sIIII")
+_U32_SECTIONS = (
+    "nbr",
+    "nbr_pair",
+    "pair_a",
+    "pair_b",
+    "severity",
+    "description",
+    "drug_a",
+    "drug_b",
+)
+_ALIAS_SECTIONS = ("alias_name", "alias_target")
+
+
+def _pad(n: int) -> int:
+    return (-n) % 8
+
+
+def is_snapshot(path: str | Path) -> bool:
+    with Path(path).open("rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def compile_snapshot(db: InteractionDB, out: str | Path) -> Path:
+    """Write ``db`` to ``out`` in the snapshot format and return the path."""
+    if sys.byteorder != "little":
+        raise RuntimeError("snapshots can only be written on little-endian hosts")
+    out = Path(out)
+
+    names = sorted(db.drugs, key=lambda s: s.encode("utf-8"))
+    ids = {name: i for i, name in enumerate(names)}
+    strings: List[str] = list(names)
+    string_ids: Dict[str, int] = {}
+
+    def sid(s: str) -> int:
+        i = string_ids.get(s)
+        if i is None:
+            i = string_ids[s] = len(strings)
+            strings.append(s)
+        return i
+
+    pairs: List[Tuple[int, int, DrugInteraction]] = []
+    for name_a, name_b, di in db.pairs():
+        a, b = ids[name_a], ids[name_b]
+        pairs.append((min(a, b), max(a, b), di))
+    pairs.sort(key=lambda p: (p[0], p[1]))
+
+    cols = {name: array("I") for name in _U32_SECTIONS + _ALIAS_SECTIONS}
+    rows: List[List[Tuple[int, int]]] = [[] for _ in names]
+    for k, (a, b, di) in enumerate(pairs):
+        cols["pair_a"].append(a)
+        cols["pair_b"].append(b)
+        cols["severity"].append(sid(di.severity))
+        cols["description"].append(sid(di.description))
+        cols["drug_a"].append(sid(di.drug_a))
+        cols["drug_b"].append(sid(di.drug_b))
+        rows[a].append((b, k))
+        if a != b:
+            rows[b].append((a, k))
+
+    synonyms = db.aliases.synonyms
+    aliases = sorted(
+        (
+            (alias, ids[target])
+            for alias, target in synonyms.items()
+            if target in ids and alias not in ids
+        ),
+        key=lambda p: p[0].encode("utf-8"),
+    )
+    for alias, target in aliases:
+        cols["alias_name"].append(sid(alias))
+        cols["alias_target"].append(target)
+
+    row_ptr = array("I", [0])
+    for row in rows:
+        row.sort()
+        for j, k in row:
+            cols["nbr"].append(j)
+            cols["nbr_pair"].append(k)
+        row_ptr.append(len(cols["nbr"]))
+
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = array("Q", [0])
+    for e in encoded:
+        offsets.append(offsets[-1] + len(e))
+
+    sections = [offsets.tobytes(), b"".join(encoded), row_ptr.tobytes()]
+    sections += [cols[name].tobytes() for name in _U32_SECTIONS + _ALIAS_SECTIONS]
+
+    tmp = out.with_name(out.name + ".tmp")
+    with tmp.open("wb") as f:
+        header = _HEADER.pack(MAGIC, len(names), len(pairs), len(strings), len(aliases))
+        f.write(header + b"\x00" * _pad(len(header)))
+        for data in sections:
+            f.write(data)
+            f.write(b"\x00" * _pad(len(data)))
+    tmp.replace(out)
+    return out
+
+
+class InteractionSnapshot:
+    """Read-only interaction DB backed by a memory-mapped snapshot file.
+
+    Offers the same query API as ``InteractionDB`` (``check_list``, ``check_many``,
+    ``get``); pages are shared between every process that maps the same file.
+    """
+
+    def __init__(self, path: str | Path):
+        if sys.byteorder != "little":
+            raise RuntimeError("snapshots can only be read on little-endian hosts")
+        self.path = Path(path)
+        self._fuzzy: Optional[FuzzyResolver] = None
+        with self.path.open("rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buf = memoryview(self._mm)
+        if len(buf) < _HEADER.size or buf[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"{self.path} is not an interaction snapshot")
+        _, self._n_drugs, self._n_pairs, n_strings, self._n_aliases = _HEADER.unpack_from(buf)
+
+        pos = _HEADER.size + _pad(_HEADER.size)
+
+        def take(nbytes: int) -> memoryview:
+            nonlocal pos
+            view = buf[pos : pos + nbytes]
+            if len(view) != nbytes:
+                raise ValueError(f"{self.path} is truncated")
+            pos += nbytes + _pad(nbytes)
+            return view
+
+        self._str_offsets = take(8 * (n_strings + 1)).cast("Q")
+        self._str_blob = take(self._str_offsets[-1])
+        self._row_ptr = take(4 * (self._n_drugs + 1)).cast("I")
+        for name in _U32_SECTIONS:
+            count = 2 * self._n_pairs if name.startswith("nbr") else self._n_pairs
+            setattr(self, f"_{name}", take(4 * count).cast("I"))
+        for name in _ALIAS_SECTIONS:
+            setattr(self, f"_{name}", take(4 * self._n_aliases).cast("I"))
+
+    def close(self) -> None:
+        for name in ("str_offsets", "str_blob", "row_ptr") + _U32_SECTIONS + _ALIAS_SECTIONS:
+            getattr(self, f"_{name}").release()
+        self._mm.close()
+
+    def __enter__(self) -> "InteractionSnapshot":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._n_pairs
+
+    def __contains__(self, name: str) -> bool:
+        return self._lookup(normalize_drug_name(name)) is not None
+
+    @property
+    def drugs(self) -> List[str]:
+        return [self._string(i) for i in range(self._n_drugs)]
+
+    def get(self, a: str, b: str) -> Optional[DrugInteraction]:
+        ia = self._lookup(normalize_drug_name(a))
+        ib = self._lookup(normalize_drug_name(b))
+        if ia is None or ib is None:
+            return None
+        k = self._pair_index(ia, ib)
+        return None if k is None else self._interaction(k)
+
+    def pairs(self) -> Iterator[Tuple[str, str, DrugInteraction]]:
+        """Every indexed pair as ``(drug, drug, interaction)`` with normalized drug names."""
+        for k in range(self._n_pairs):
+            yield self._string(self._pair_a[k]), self._string(self._pair_b[k]), self._interaction(k)
+
+    def check_list(self, meds: Iterable[str], suggest: bool = True) -> CheckResult:
+        return check_meds(self, meds, {}, suggest)
+
+    def check_many(
+        self, med_lists: Iterable[Iterable[str]], suggest: bool = False
+    ) -> List[CheckResult]:
+        resolved: Dict[str, Optional[int]] = {}
+        return [check_meds(self, meds, resolved, suggest) for meds in med_lists]
+
+    def suggest(self, name: str, max_distance: Optional[int] = None, limit: int = 5) -> List[str]:
+        if self._fuzzy is None:
+            aliases = (self._string(self._alias_name[k]) for k in range(self._n_aliases))
+            self._fuzzy = FuzzyResolver(itertools.chain(self.drugs, aliases))
+        return self._fuzzy.suggest(name, max_distance=max_distance, limit=limit)
+
+    def _string(self, i: int) -> str:
+        return str(self._str_blob[self._str_offsets[i] : self._str_offsets[i + 1]], "utf-8")
+
+    def _lookup(self, name: str) -> Optional[int]:
+        key = name.encode("utf-8")
+        if self._n_aliases:
+            k = self._bsearch(key, self._n_aliases, self._alias_name.__getitem__)
+            if k is not None:
+                return self._alias_target[k]
+        return self._bsearch(key, self._n_drugs, int)
+
+    def _bsearch(self, key: bytes, count: int, string_id: Callable[[int], int]) -> Optional[int]:
+        offsets, blob = self._str_offsets, self._str_blob
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            s = string_id(mid)
+            probe = blob[offsets[s] : offsets[s + 1]]
+            if probe == key:
+                return mid
+            if probe.tobytes() < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+    def _pair_index(self, i: int, j: int) -> Optional[int]:
+        lo, hi = self._row_ptr[i], self._row_ptr[i + 1]
+        pos = bisect_left(self._nbr, j, lo, hi)
+        if pos < hi and self._nbr[pos] == j:
+            return self._nbr_pair[pos]
+        return None
+
+    def _interaction(self, k: int) -> DrugInteraction:
+        return DrugInteraction(
+            drug_a=self._string(self._drug_a[k]),
+            drug_b=self._string(self._drug_b[k]),
+            severity=self._string(self._severity[k]),
+            description=self._string(self._description[k]),
+        )
+
+    def _partners(self, i: int, among: Collection[int]) -> List[Tuple[int, int]]:
+        """``(drug ID, pair index)`` for drugs in ``among`` that interact with drug ``i``."""
+        lo, hi = self._row_ptr[i], self._row_ptr[i + 1]
+        if hi - lo < len(among):
+            nbr = self._nbr
+            return [(nbr[p], self._nbr_pair[p]) for p in range(lo, hi) if nbr[p] in among]
+        return [(j, k) for j in among if (k := self._pair_index(i, j)) is not None]
+
+    def _describe(self, k: int) -> Tuple[str, str]:
+        return self._string(self._severity[k]), self._string(self._description[k])
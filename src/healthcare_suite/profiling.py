@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from types import CodeType
+from typing import Dict, Optional
+
+
+class SamplingProfiler:
+    """Sample one thread's Python stack every ``interval`` seconds from a helper thread.
+
+    Stacks are aggregated in the "collapsed" format (``outer;inner;leaf count``)
+    read by flame graph tools such as ``flamegraph.pl`` and speedscope. Sampling
+    from outside means the profiled code runs untraced; the cost is one stack walk
+    per interval, paid mostly by the helper thread.
+    """
+
+    def __init__(self, interval: float = 0.001, thread_id: Optional[int] = None):
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        self.interval = interval
+        self.thread_id = thread_id
+        self.stacks: Counter[str] = Counter()
+        self._labels: Dict[CodeType, str] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "SamplingProfiler":
+        """Start sampling the calling thread (or ``thread_id`` if one was given)."""
+        if self._thread is not None:
+            raise RuntimeError("profiler already started")
+        if self.thread_id is None:
+            self.thread_id = threading.get_ident()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter[str]:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+        return self.stacks
+
+    def __enter__(self) -> "SamplingProfiler":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    @property
+    def samples(self) -> int:
+        return sum(self.stacks.values())
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {n}\n" for stack, n in self.stacks.most_common())
+
+    def dump(self, path: str | Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.collapsed(), encoding="utf-8")
+        return path
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                label = self._labels.get(code)
+                if label is None:
+                    label = self._labels[code] = (
+                        f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+                    )
+                stack.append(label)
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+
+def profile_path(directory: str | Path, name: str, elapsed: float) -> Path:
+    """``<directory>/<timestamp>-<name>-<ms>ms.collapsed``, with ``name`` made filename-safe."""
+    stamp = time.strftime("%Y%m%dT%H%M%S")
+    safe = re.sub(r"[^A-Za-z0-9_.-]+", "_", name).strip("_") or "request"
+    return Path(directory) / f"{stamp}-{safe}-{elapsed * 1e3:.0f}ms.collapsed"
@@ -1,3 +1,8 @@
 from .models import AppointmentRequest, ConfirmedAppointment, Priority
-from .calendar import DoctorCalendar
+from .calendar import CalendarBackend, DoctorCalendar
+from .slotgrid import SlotGridCalendar
+from .rebook import RebookOutcome, rebook_appointments
 from .algo import schedule_requests, SchedulingResult
+from .clinic import ClinicScheduler, Provider, working_days
+from .optimize import OptimizationReport, OptimizationResult, optimize_schedule
+from .store import BookingConflict, SQLiteCalendarStore
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import timedelta
-from typing import Iterable, List
+from typing import Iterable, List, Optional, Tuple
 
-from .calendar import DoctorCalendar
+from .calendar import CalendarBackend
 from .models import AppointmentRequest, ConfirmedAppointment, Priority
+from .rebook import rebook_appointments
 
 
 @dataclass
@@ -13,9 +14,53 @@ class SchedulingResult:
     confirmed: List[ConfirmedAppointment]
     rejected: List[AppointmentRequest]
     preempted: List[ConfirmedAppointment]
+    # (old, new) for preempted appointments moved to a new slot by the rebooking pass.
+    rebooked: List[Tuple[ConfirmedAppointment, ConfirmedAppointment]] = field(
+        default_factory=list, kw_only=True
+    )
 
 
-def schedule_requests(calendar: DoctorCalendar, requests: Iterable[AppointmentRequest]) -> SchedulingResult:
+def _book_with_preemption(
+    calendar: CalendarBackend,
+    req: AppointmentRequest,
+    duration: timedelta,
+    provider_id: Optional[str] = None,
+) -> Optional[Tuple[ConfirmedAppointment, List[ConfirmedAppointment]]]:
+    """Book an emergency at its requested start, bumping lower-priority appointments.
+
+    Returns ``(appointment, preempted)``, or ``None`` (with the calendar unchanged)
+    when the slot is outside hours or the requested window, or still blocked after
+    preemption.
+    """
+    start = max(req.requested_start, calendar.open_time).replace(second=0, microsecond=0)
+    end = start + duration
+    if end > req.requested_end or not calendar.is_within_hours(start, end):
+        return None
+    removed = calendar.preempt_if_needed(start, end, req.priority)
+    if calendar.overlaps_existing(start, end) is None:
+        appt = ConfirmedAppointment(req.patient_id, start, end, req.priority, req.note, provider_id)
+        calendar.add_appointment(appt)
+        return appt, removed
+    for a in removed:
+        calendar.add_appointment(a)
+    return None
+
+
+def schedule_requests(
+    calendar: CalendarBackend,
+    requests: Iterable[AppointmentRequest],
+    rebook: bool = False,
+    max_cascade_depth: int = 2,
+    max_work: int = 1000,
+) -> SchedulingResult:
+    """Book requests in order, first fit; emergencies that do not fit preempt.
+
+    With ``rebook``, appointments bumped by an emergency are immediately moved to
+    the least disruptive free slot by ``rebook_appointments`` (which may in turn
+    bump lower-priority ones, up to ``max_cascade_depth`` levels). Everything
+    bumped is listed in ``preempted``; those that found a new slot also appear in
+    ``rebooked``. ``max_work`` caps the slot searches over the whole call.
+    """
     reqs = list(requests)
     for r in reqs:
         r.validate()
@@ -23,6 +68,8 @@ def schedule_requests(calendar: DoctorCalendar, requests: Iterable[AppointmentRe
     confirmed: List[ConfirmedAppointment] = []
     rejected: List[AppointmentRequest] = []
     preempted: List[ConfirmedAppointment] = []
+    rebooked: List[Tuple[ConfirmedAppointment, ConfirmedAppointment]] = []
+    work_left = max_work
 
     for req in reqs:
         duration = timedelta(minutes=req.duration_minutes)
@@ -35,19 +82,19 @@ def schedule_requests(calendar: DoctorCalendar, requests: Iterable[AppointmentRe
             continue
 
         if req.priority == Priority.EMERGENCY:
-            start = max(req.requested_start, calendar.open_time).replace(second=0, microsecond=0)
-            end = start + duration
-            if calendar.is_within_hours(start, end):
-                removed = calendar.preempt_if_needed(start, end, req.priority)
-                if calendar.overlaps_existing(start, end) is None:
-                    appt = ConfirmedAppointment(req.patient_id, start, end, req.priority, req.note)
-                    calendar.add_appointment(appt)
-                    confirmed.append(appt)
-                    preempted.extend(removed)
-                    continue
-                for a in removed:
-                    calendar.add_appointment(a)
+            booked = _book_with_preemption(calendar, req, duration)
+            if booked:
+                confirmed.append(booked[0])
+                preempted.extend(booked[1])
+                if rebook and booked[1]:
+                    outcome = rebook_appointments(calendar, booked[1], max_cascade_depth, work_left)
+                    work_left -= outcome.work
+                    preempted.extend(outcome.displaced)
+                    rebooked.extend(outcome.rebooked)
+                continue
 
         rejected.append(req)
 
-    return SchedulingResult(confirmed=confirmed, rejected=rejected, preempted=preempted)
+    return SchedulingResult(
+        confirmed=confirmed, rejected=rejected, preempted=preempted, rebooked=rebooked
+    )
@@ -2,10 +2,22 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import List, Optional, Tuple
+from typing import List, Optional, Protocol, Tuple
 
+import numpy as np
+
+from .. import metrics
 from .models import ConfirmedAppointment, Priority
 
+FIRST_FIT_SECONDS = metrics.histogram(
+    "healthcare_scheduler_first_fit_seconds", "Time spent in find_first_fit.", ["backend"]
+)
+SLOTS_PROBED = metrics.counter(
+    "healthcare_scheduler_slots_probed_total",
+    "Candidate start times tested by slot searches.",
+    ["backend"],
+)
+
 
 def _ceil_to(minutes: int, dt: datetime) -> datetime:
     epoch = datetime(dt.year, dt.month, dt.day)
@@ -14,8 +26,52 @@ def _ceil_to(minutes: int, dt: datetime) -> datetime:
     return epoch + timedelta(minutes=rounded)
 
 
+class CalendarBackend(Protocol):
+    """What ``schedule_requests`` needs from a ``DoctorCalendar`` or ``SlotGridCalendar``."""
+    open_time: datetime
+    close_time: datetime
+    slot_minutes: int
+
+    @property
+    def appointments(self) -> List[ConfirmedAppointment]: ...
+
+    def is_within_hours(self, start: datetime, end: datetime) -> bool: ...
+
+    def overlaps_existing(
+        self, start: datetime, end: datetime
+    ) -> Optional[ConfirmedAppointment]: ...
+
+    def add_appointment(self, appt: ConfirmedAppointment) -> None: ...
+
+    def remove_appointment(self, appt: ConfirmedAppointment) -> None: ...
+
+    def find_first_fit(
+        self,
+        window_start: datetime,
+        window_end: datetime,
+        duration: timedelta,
+        step_minutes: Optional[int] = None,
+    ) -> Optional[Tuple[datetime, datetime]]: ...
+
+    def preempt_if_needed(
+        self, start: datetime, end: datetime, incoming_priority: Priority
+    ) -> List[ConfirmedAppointment]: ...
+
+    def booked_intervals(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]: ...
+
+
+_US = timedelta(microseconds=1)
+
+
 @dataclass
 class DoctorCalendar:
+    """A doctor's day as non-overlapping appointments kept sorted by start time.
+
+    Because appointments never overlap, sorting by start also sorts them by end.
+    Starts and ends are mirrored in integer arrays (microseconds after opening), so
+    overlap queries are a binary search and the free gaps are simply the spaces
+    between neighbours, scanned in bulk when looking for one long enough.
+    """
     open_time: datetime
     close_time: datetime
     slot_minutes: int = 5
@@ -26,6 +82,9 @@ class DoctorCalendar:
         if self.slot_minutes <= 0:
             raise ValueError("slot_minutes must be positive")
         self._appts: List[ConfirmedAppointment] = []
+        self._starts = np.empty(0, dtype=np.int64)
+        self._ends = np.empty(0, dtype=np.int64)
+        self._priorities = np.empty(0, dtype=np.int8)
 
     @property
     def appointments(self) -> List[ConfirmedAppointment]:
@@ -35,22 +94,55 @@ class DoctorCalendar:
         return self.open_time <= start and end <= self.close_time
 
     def overlaps_existing(self, start: datetime, end: datetime) -> Optional[ConfirmedAppointment]:
-        for appt in self._appts:
-            if not (end <= appt.start or start >= appt.end):
-                return appt
+        """The earliest appointment overlapping ``[start, end)``, if any."""
+        i = int(self._ends.searchsorted(self._key(start), side="right"))
+        if i < len(self._appts) and self._starts[i] < self._key(end):
+            return self._appts[i]
         return None
 
     def add_appointment(self, appt: ConfirmedAppointment) -> None:
         if not self.is_within_hours(appt.start, appt.end):
             raise ValueError("appointment outside working hours")
+        if appt.end <= appt.start:
+            raise ValueError("appointment must have a positive duration")
         if self.overlaps_existing(appt.start, appt.end):
             raise ValueError("appointment overlaps existing")
-        self._appts.append(appt)
-        self._appts.sort(key=lambda a: a.start)
+        start = self._key(appt.start)
+        i = int(self._starts.searchsorted(start))
+        self._appts.insert(i, appt)
+        self._starts = np.concatenate((self._starts[:i], [start], self._starts[i:]))
+        self._ends = np.concatenate((self._ends[:i], [self._key(appt.end)], self._ends[i:]))
+        self._priorities = np.concatenate(
+            (self._priorities[:i], [appt.priority], self._priorities[i:])
+        )
 
     def remove_appointment(self, appt: ConfirmedAppointment) -> None:
-        self._appts = [a for a in self._appts if a != appt]
+        i = int(self._starts.searchsorted(self._key(appt.start)))
+        if i < len(self._appts) and self._appts[i] == appt:
+            del self._appts[i]
+            self._starts = np.concatenate((self._starts[:i], self._starts[i + 1 :]))
+            self._ends = np.concatenate((self._ends[:i], self._ends[i + 1 :]))
+            self._priorities = np.concatenate((self._priorities[:i], self._priorities[i + 1 :]))
+
+    def free_gaps(
+        self, start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> List[Tuple[datetime, datetime]]:
+        """Free ``(start, end)`` intervals within opening hours, clipped to ``[start, end]``."""
+        lo = max(start or self.open_time, self.open_time)
+        hi = min(end or self.close_time, self.close_time)
+        gaps: List[Tuple[datetime, datetime]] = []
+        cursor = lo
+        for appt in self._appts[int(self._ends.searchsorted(self._key(lo), side="right")) :]:
+            if appt.start >= hi:
+                break
+            if appt.start > cursor:
+                gaps.append((cursor, appt.start))
+            cursor = max(cursor, appt.end)
+        if cursor < hi:
+            gaps.append((cursor, hi))
+        return gaps
 
+    @metrics.timed(FIRST_FIT_SECONDS, "interval")
     def find_first_fit(
         self,
         window_start: datetime,
@@ -58,21 +150,55 @@ class DoctorCalendar:
         duration: timedelta,
         step_minutes: Optional[int] = None,
     ) -> Optional[Tuple[datetime, datetime]]:
-        step = step_minutes or self.slot_minutes
-        cursor = _ceil_to(step, max(window_start, self.open_time))
+        """Earliest start on the ``step_minutes`` grid where ``duration`` fits in the window.
+
+        When the candidate runs into an appointment, the search jumps past every
+        following gap shorter than ``duration`` to the first grid point after the
+        end of the last appointment before a long-enough gap.
+        """
+        step = timedelta(minutes=step_minutes or self.slot_minutes)
+        cursor = _ceil_to(int(step.total_seconds() // 60), max(window_start, self.open_time))
         latest_start = min(window_end, self.close_time) - duration
+        n = len(self._appts)
+        i = int(self._ends.searchsorted(self._key(cursor), side="right"))
+        probes = 0
         while cursor <= latest_start:
-            end = cursor + duration
-            if end <= self.close_time and self.overlaps_existing(cursor, end) is None:
-                return cursor, end
-            cursor += timedelta(minutes=step)
+            probes += 1
+            if i == n or cursor + duration <= self._appts[i].start:
+                SLOTS_PROBED.inc(probes, "interval")
+                return cursor, cursor + duration
+            i = self._next_gap(i, duration)
+            blocker_end = self._appts[i].end
+            if blocker_end > cursor:
+                cursor += -((cursor - blocker_end) // step) * step
+            i += 1
+        SLOTS_PROBED.inc(probes, "interval")
         return None
 
+    def booked_intervals(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Starts and ends (microseconds after opening) and priorities, sorted by start.
+
+        These are the calendar's own arrays; do not modify them.
+        """
+        return self._starts, self._ends, self._priorities
+
     def preempt_if_needed(self, start: datetime, end: datetime, incoming_priority: Priority) -> List[ConfirmedAppointment]:
         removed: List[ConfirmedAppointment] = []
-        for appt in list(self._appts):
-            if not (end <= appt.start or start >= appt.end):
-                if incoming_priority < appt.priority:
-                    self.remove_appointment(appt)
-                    removed.append(appt)
+        lo = int(self._ends.searchsorted(self._key(start), side="right"))
+        hi = max(lo, int(self._starts.searchsorted(self._key(end))))
+        for appt in self._appts[lo:hi]:
+            if incoming_priority < appt.priority:
+                self.remove_appointment(appt)
+                removed.append(appt)
         return removed
+
+    def _key(self, dt: datetime) -> int:
+        return (dt - self.open_time) // _US
+
+    def _next_gap(self, i: int, duration: timedelta) -> int:
+        """First ``j >= i`` whose gap to the next start (or to closing) fits ``duration``."""
+        need = duration // _US
+        if i + 1 < len(self._appts) and self._starts[i + 1] - self._ends[i] >= need:
+            return i
+        long_enough = np.flatnonzero(self._starts[i + 1 :] - self._ends[i:-1] >= need)
+        return i + int(long_enough[0]) if len(long_enough) else len(self._appts) - 1
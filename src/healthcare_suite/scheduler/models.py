@@ -3,6 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import IntEnum
+from typing import Optional
 
 
 class Priority(IntEnum):
@@ -19,6 +20,7 @@ class AppointmentRequest:
     duration_minutes: int = 15
     priority: Priority = Priority.ROUTINE
     note: str = ""
+    specialty: Optional[str] = None
 
     def validate(self) -> None:
         if self.requested_end <= self.requested_start:
@@ -34,6 +36,7 @@ class ConfirmedAppointment:
     end: datetime
     priority: Priority
     note: str = ""
+    provider_id: Optional[str] = None
 
     @property
     def duration(self) -> timedelta:
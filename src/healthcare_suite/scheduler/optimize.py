@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+import numpy as np
+
+from .algo import SchedulingResult, _book_with_preemption
+from .calendar import CalendarBackend
+from .models import AppointmentRequest, ConfirmedAppointment, Priority
+
+DEFAULT_WEIGHTS: Dict[Priority, float] = {
+    Priority.EMERGENCY: 100.0,
+    Priority.URGENT: 10.0,
+    Priority.ROUTINE: 1.0,
+}
+
+
+@dataclass
+class OptimizationReport:
+    """How the batch went: scores are summed priority weights of confirmed requests."""
+    greedy_score: float
+    score: float
+    max_score: float
+    iterations: int
+    moves: int
+    elapsed: float
+    timed_out: bool
+
+
+@dataclass
+class OptimizationResult(SchedulingResult):
+    report: OptimizationReport
+
+
+def _slack(req: AppointmentRequest) -> timedelta:
+    return req.requested_end - req.requested_start - timedelta(minutes=req.duration_minutes)
+
+
+class _Batch:
+    """The batch's requests, which of them are on the calendar, and which are waiting.
+
+    Request windows and durations are mirrored in integer arrays (seconds) so
+    candidates for freed space can be filtered in bulk.
+    """
+
+    def __init__(
+        self,
+        calendar: CalendarBackend,
+        reqs: List[AppointmentRequest],
+        weight: Mapping[Priority, float],
+    ):
+        self.calendar = calendar
+        self.reqs = reqs
+        self.weight = weight
+        self.placed: Dict[ConfirmedAppointment, int] = {}
+        self.waiting = np.zeros(len(reqs), dtype=bool)
+        self._origin = calendar.open_time
+        self._starts = np.array([self._seconds(r.requested_start) for r in reqs], dtype=np.int64)
+        self._ends = np.array([self._seconds(r.requested_end) for r in reqs], dtype=np.int64)
+        self._durations = np.array([r.duration_minutes * 60 for r in reqs], dtype=np.int64)
+
+    def score(self) -> float:
+        return sum(self.weight[self.reqs[i].priority] for i in self.placed.values())
+
+    def place(self, i: int) -> Optional[ConfirmedAppointment]:
+        req = self.reqs[i]
+        fit = self.calendar.find_first_fit(
+            req.requested_start, req.requested_end, timedelta(minutes=req.duration_minutes)
+        )
+        if fit is None:
+            return None
+        appt = ConfirmedAppointment(req.patient_id, fit[0], fit[1], req.priority, req.note)
+        self.restore(appt, i)
+        return appt
+
+    def restore(self, appt: ConfirmedAppointment, i: int) -> None:
+        self.calendar.add_appointment(appt)
+        self.placed[appt] = i
+        self.waiting[i] = False
+
+    def unplace(self, appt: ConfirmedAppointment) -> int:
+        self.calendar.remove_appointment(appt)
+        i = self.placed.pop(appt)
+        self.waiting[i] = True
+        return i
+
+    def improve(self, i: int, order: np.ndarray) -> bool:
+        """Try to get waiting request ``i`` onto the calendar without lowering the score.
+
+        For each batch appointment blocking the window, cheapest first: take its
+        place, then move it elsewhere (shift); failing that, refill the space left
+        around it with waiting requests (in ``order``) and keep the change if the
+        weight gained beats the blocker's (swap / ejection).
+        """
+        req = self.reqs[i]
+        if self.place(i):
+            return True
+        appts = self.calendar.appointments
+        blockers = [
+            n
+            for n, a in enumerate(appts)
+            if a in self.placed and a.start < req.requested_end and a.end > req.requested_start
+        ]
+        blockers.sort(key=lambda n: self.weight[appts[n].priority])
+        for n in blockers:
+            blocker = appts[n]
+            j = self.unplace(blocker)
+            appt = self.place(i)
+            if appt is None:
+                self.restore(blocker, j)
+                continue
+            if self.place(j):
+                return True
+            lo = appts[n - 1].end if n > 0 else self.calendar.open_time
+            hi = appts[n + 1].start if n + 1 < len(appts) else self.calendar.close_time
+            free = [(lo, appt.start), (appt.end, hi)] if lo <= appt.start < hi else [(lo, hi)]
+            gain = self.weight[req.priority]
+            extra: List[ConfirmedAppointment] = []
+            for k in self._candidates(free, order):
+                filled = self.place(int(k))
+                if filled:
+                    extra.append(filled)
+                    gain += self.weight[filled.priority]
+            if gain > self.weight[self.reqs[j].priority]:
+                return True
+            for filled in extra:
+                self.unplace(filled)
+            self.unplace(appt)
+            self.restore(blocker, j)
+        return False
+
+    def _candidates(self, free: List[Tuple[datetime, datetime]], order: np.ndarray) -> np.ndarray:
+        """Waiting requests, in ``order``, that fit in one of the ``free`` intervals.
+
+        A request fits when its window overlaps the interval by at least its duration.
+        """
+        fits = np.zeros(len(self.reqs), dtype=bool)
+        for start, end in free:
+            lo = np.maximum(self._starts, self._seconds(start))
+            overlap = np.minimum(self._ends, self._seconds(end)) - lo
+            fits |= overlap >= self._durations
+        fits &= self.waiting
+        return order[fits[order]]
+
+    def _seconds(self, t: datetime) -> int:
+        return int((t - self._origin).total_seconds())
+
+
+def optimize_schedule(
+    calendar: CalendarBackend,
+    requests: Iterable[AppointmentRequest],
+    time_budget: float = 1.0,
+    weights: Optional[Mapping[Priority, float]] = None,
+) -> OptimizationResult:
+    """Schedule a batch to maximise the priority-weighted number of confirmed requests.
+
+    Requests are first placed greedily by priority, then by tightness (least slack
+    in the window first), then by requested start. Local search then revisits the
+    rejected requests, most valuable first, trying shift and swap moves against
+    the batch appointments blocking each one (see ``_Batch.improve``). Passes
+    repeat until one makes no progress or ``time_budget`` seconds have elapsed.
+    Appointments already on the calendar are never moved by the search;
+    emergencies still unplaced then preempt as in ``schedule_requests``.
+    """
+    started = time.perf_counter()
+    deadline = started + time_budget
+    weight = dict(DEFAULT_WEIGHTS if weights is None else weights)
+    reqs = list(requests)
+    for r in reqs:
+        r.validate()
+
+    order = sorted(
+        range(len(reqs)),
+        key=lambda i: (reqs[i].priority, _slack(reqs[i]), reqs[i].requested_start, i),
+    )
+    rank = {i: n for n, i in enumerate(order)}
+    batch = _Batch(calendar, reqs, weight)
+    for i in order:
+        if batch.place(i) is None:
+            batch.waiting[i] = True
+    greedy_score = batch.score()
+
+    iterations = moves = 0
+    timed_out = False
+    progress = True
+    while progress and batch.waiting.any() and not timed_out:
+        progress = False
+        waiting = np.flatnonzero(batch.waiting)
+        ranked = sorted(waiting, key=lambda i: (-weight[reqs[i].priority], rank[i]))
+        candidates = np.array(ranked, dtype=np.intp)
+        # A request identical to one that just failed fails too, until something moves.
+        failed: Set[Tuple] = set()
+        for i in candidates.tolist():
+            if time.perf_counter() > deadline:
+                timed_out = True
+                break
+            req = reqs[i]
+            signature = (req.requested_start, req.requested_end, req.duration_minutes, req.priority)
+            if not batch.waiting[i] or signature in failed:
+                continue
+            iterations += 1
+            if batch.improve(i, candidates):
+                moves += 1
+                progress = True
+                failed.clear()
+            else:
+                failed.add(signature)
+
+    preempted: List[ConfirmedAppointment] = []
+    for i in np.flatnonzero(batch.waiting).tolist():
+        req = reqs[i]
+        if req.priority == Priority.EMERGENCY:
+            booked = _book_with_preemption(calendar, req, timedelta(minutes=req.duration_minutes))
+            if booked:
+                batch.placed[booked[0]] = i
+                batch.waiting[i] = False
+                for appt in booked[1]:
+                    if appt in batch.placed:
+                        batch.waiting[batch.placed.pop(appt)] = True
+                    else:
+                        preempted.append(appt)
+
+    score = batch.score()
+    confirmed = sorted(batch.placed, key=lambda a: a.start)
+    rejected = [reqs[i] for i in np.flatnonzero(batch.waiting).tolist()]
+
+    report = OptimizationReport(
+        greedy_score=greedy_score,
+        score=score,
+        max_score=sum(weight[r.priority] for r in reqs),
+        iterations=iterations,
+        moves=moves,
+        elapsed=time.perf_counter() - started,
+        timed_out=timed_out,
+    )
+    return OptimizationResult(
+        confirmed=confirmed, rejected=rejected, preempted=preempted, report=report
+    )
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .calendar import _US, CalendarBackend, _ceil_to
+from .models import ConfirmedAppointment
+
+
+@dataclass
+class RebookOutcome:
+    """``rebooked`` pairs each moved appointment with its new slot; ``displaced`` lists
+    the appointments the cascade bumped, ``unplaced`` those left without a slot and
+    ``work`` the slot searches made."""
+    rebooked: List[Tuple[ConfirmedAppointment, ConfirmedAppointment]]
+    displaced: List[ConfirmedAppointment]
+    unplaced: List[ConfirmedAppointment]
+    work: int = 0
+
+
+def _best_slot(
+    calendar: CalendarBackend, appt: ConfirmedAppointment, displace: bool
+) -> Optional[datetime]:
+    """The least disruptive start for ``appt`` on ``calendar``.
+
+    Candidates are the slot-grid starts within opening hours. A start bumping
+    fewer appointments always wins, then the one closest to ``appt.start``, then
+    the earlier one. Only appointments of strictly lower priority may be bumped,
+    and none unless ``displace``. Every candidate is scored at once: the
+    appointments overlapping ``[s, s + duration)`` are an index range of the
+    calendar's sorted ``booked_intervals``, found by binary search.
+    """
+    duration = appt.end - appt.start
+    step = timedelta(minutes=calendar.slot_minutes)
+    first = _ceil_to(calendar.slot_minutes, calendar.open_time)
+    if first + duration > calendar.close_time:
+        return None
+    n = (calendar.close_time - duration - first) // step + 1
+    starts = (first - calendar.open_time) // _US + np.arange(n, dtype=np.int64) * (step // _US)
+    length = duration // _US
+
+    booked_starts, booked_ends, priorities = calendar.booked_intervals()
+    lo = np.searchsorted(booked_ends, starts, side="right")
+    hi = np.searchsorted(booked_starts, starts + length, side="left")
+    bumped = hi - lo
+    if displace:
+        fixed = np.concatenate([[0], np.cumsum(priorities <= appt.priority)])
+        ok = fixed[hi] == fixed[lo]
+    else:
+        ok = bumped == 0
+    if not ok.any():
+        return None
+    candidates = np.flatnonzero(ok)
+    distance = np.abs(starts[candidates] - (appt.start - calendar.open_time) // _US)
+    best = candidates[np.lexsort((starts[candidates], distance, bumped[candidates]))[0]]
+    return calendar.open_time + timedelta(microseconds=int(starts[best]))
+
+
+def rebook_appointments(
+    calendar: CalendarBackend,
+    appointments: Iterable[ConfirmedAppointment],
+    max_cascade_depth: int = 2,
+    max_work: int = 1000,
+) -> RebookOutcome:
+    """Find new slots on ``calendar`` for appointments that lost theirs.
+
+    Each appointment gets the free slot closest to its old start or, while its
+    cascade depth is below ``max_cascade_depth``, a slot bumping fewer
+    lower-priority appointments, which are then rebooked in turn one level
+    deeper. Appointments are handled first come, first served (the cascade is
+    breadth-first), so the outcome is deterministic. ``max_work`` caps the number
+    of slot searches; whatever is still queued when it runs out is unplaced.
+
+    An appointment moved by the cascade can be bumped again later in it; its
+    ``rebooked`` entry then follows it to its final slot, or is dropped (and the
+    original appointment reported ``unplaced``) if it finds none.
+    """
+    if max_cascade_depth < 0:
+        raise ValueError("max_cascade_depth must be non-negative")
+    # (appointment, cascade depth, the appointment as it was before the cascade moved it)
+    queue: Deque[Tuple[ConfirmedAppointment, int, ConfirmedAppointment]] = deque(
+        (a, 0, a) for a in appointments
+    )
+    outcome = RebookOutcome(rebooked=[], displaced=[], unplaced=[])
+    placed: Dict[ConfirmedAppointment, ConfirmedAppointment] = {}  # original -> current slot
+    origin: Dict[ConfirmedAppointment, ConfirmedAppointment] = {}  # current slot -> original
+    while queue:
+        appt, depth, original = queue.popleft()
+        if outcome.work >= max_work:
+            outcome.unplaced.append(original)
+            continue
+        outcome.work += 1
+        start = _best_slot(calendar, appt, depth < max_cascade_depth)
+        if start is None:
+            outcome.unplaced.append(original)
+            continue
+        end = start + (appt.end - appt.start)
+        for other in calendar.preempt_if_needed(start, end, appt.priority):
+            outcome.displaced.append(other)
+            first = origin.pop(other, other)
+            placed.pop(first, None)
+            queue.append((other, depth + 1, first))
+        moved = replace(appt, start=start, end=end)
+        calendar.add_appointment(moved)
+        placed[original] = moved
+        origin[moved] = original
+    outcome.rebooked = list(placed.items())
+    return outcome
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .. import metrics
+from .calendar import _US, FIRST_FIT_SECONDS, SLOTS_PROBED, _ceil_to
+from .models import ConfirmedAppointment, Priority
+
+
+@dataclass
+class SlotGridCalendar:
+    """A ``DoctorCalendar`` stored as fixed ``slot_minutes`` slots from ``open_time``.
+
+    Occupancy is a boolean array with the occupant's priority (and first slot)
+    alongside, so searches are cumulative sums over the grid rather than walks over
+    appointments: a run of ``k`` free slots starts at ``i`` exactly when the number
+    of busy slots before ``i + k`` equals the number before ``i``. Suited to long
+    horizons of small fixed slots; appointments off the grid occupy every slot they
+    touch. ``open_time`` must fall on a slot boundary.
+    """
+    open_time: datetime
+    close_time: datetime
+    slot_minutes: int = 5
+
+    def __post_init__(self) -> None:
+        if self.close_time <= self.open_time:
+            raise ValueError("close_time must be after open_time")
+        if self.slot_minutes <= 0:
+            raise ValueError("slot_minutes must be positive")
+        if _ceil_to(self.slot_minutes, self.open_time) != self.open_time:
+            raise ValueError("open_time must fall on a slot boundary")
+        self._slot = timedelta(minutes=self.slot_minutes)
+        n = -(-(self.close_time - self.open_time) // self._slot)
+        self._busy = np.zeros(n, dtype=bool)
+        self._priority = np.zeros(n, dtype=np.int8)
+        self._head = np.zeros(n, dtype=np.int64)
+        self._appts: Dict[int, ConfirmedAppointment] = {}
+
+    @property
+    def appointments(self) -> List[ConfirmedAppointment]:
+        return [self._appts[k] for k in sorted(self._appts)]
+
+    def is_within_hours(self, start: datetime, end: datetime) -> bool:
+        return self.open_time <= start and end <= self.close_time
+
+    def overlaps_existing(self, start: datetime, end: datetime) -> Optional[ConfirmedAppointment]:
+        """The earliest appointment sharing a slot with ``[start, end)``, if any."""
+        lo, hi = self._slot_range(start, end)
+        busy = np.flatnonzero(self._busy[lo:hi])
+        if len(busy):
+            return self._appts[int(self._head[lo + busy[0]])]
+        return None
+
+    def add_appointment(self, appt: ConfirmedAppointment) -> None:
+        if not self.is_within_hours(appt.start, appt.end):
+            raise ValueError("appointment outside working hours")
+        if appt.end <= appt.start:
+            raise ValueError("appointment must have a positive duration")
+        if self.overlaps_existing(appt.start, appt.end):
+            raise ValueError("appointment overlaps existing")
+        lo, hi = self._slot_range(appt.start, appt.end)
+        self._busy[lo:hi] = True
+        self._priority[lo:hi] = appt.priority
+        self._head[lo:hi] = lo
+        self._appts[lo] = appt
+
+    def remove_appointment(self, appt: ConfirmedAppointment) -> None:
+        lo, hi = self._slot_range(appt.start, appt.end)
+        if self._appts.get(lo) == appt:
+            del self._appts[lo]
+            self._busy[lo:hi] = False
+
+    @metrics.timed(FIRST_FIT_SECONDS, "slotgrid")
+    def find_first_fit(
+        self,
+        window_start: datetime,
+        window_end: datetime,
+        duration: timedelta,
+        step_minutes: Optional[int] = None,
+    ) -> Optional[Tuple[datetime, datetime]]:
+        """Earliest start on the ``step_minutes`` grid where ``duration`` fits in the window."""
+        starts = self._fitting_starts(window_start, window_end, duration, step_minutes)
+        if not len(starts):
+            return None
+        start = self.open_time + int(starts[0]) * self._slot
+        return start, start + duration
+
+    def available_slots(
+        self,
+        window_start: datetime,
+        window_end: datetime,
+        duration: timedelta,
+        step_minutes: Optional[int] = None,
+    ) -> List[Tuple[datetime, datetime]]:
+        """Every ``(start, end)`` on the ``step_minutes`` grid where ``duration`` fits."""
+        starts = self._fitting_starts(window_start, window_end, duration, step_minutes)
+        return [(s, s + duration) for s in (self.open_time + int(k) * self._slot for k in starts)]
+
+    def preempt_if_needed(
+        self, start: datetime, end: datetime, incoming_priority: Priority
+    ) -> List[ConfirmedAppointment]:
+        lo, hi = self._slot_range(start, end)
+        lower = self._busy[lo:hi] & (self._priority[lo:hi] > incoming_priority)
+        removed = [self._appts[int(h)] for h in np.unique(self._head[lo:hi][lower])]
+        for appt in removed:
+            self.remove_appointment(appt)
+        return removed
+
+    def booked_intervals(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Occupied slot runs as starts and ends (microseconds after opening) and
+        priorities, sorted by start."""
+        owner = np.where(self._busy, self._head, -1)
+        heads = np.flatnonzero(owner == np.arange(len(owner)))
+        run_ends = np.flatnonzero(np.diff(owner, append=-1) != 0) + 1
+        ends = run_ends[np.searchsorted(run_ends, heads, side="right")]
+        slot = self._slot // _US
+        return heads * slot, ends * slot, self._priority[heads]
+
+    def _slot_range(self, start: datetime, end: datetime) -> Tuple[int, int]:
+        """Slots touched by ``[start, end)``, clipped to the grid."""
+        n = len(self._busy)
+        lo = (start - self.open_time) // self._slot
+        hi = -(-(end - self.open_time) // self._slot)
+        return min(max(lo, 0), n), min(max(hi, 0), n)
+
+    def _fitting_starts(
+        self,
+        window_start: datetime,
+        window_end: datetime,
+        duration: timedelta,
+        step_minutes: Optional[int],
+    ) -> np.ndarray:
+        """Slot indices on the step grid where ``duration`` fits inside the window."""
+        step = step_minutes or self.slot_minutes
+        if step % self.slot_minutes:
+            raise ValueError("step_minutes must be a multiple of slot_minutes")
+        first = _ceil_to(step, max(window_start, self.open_time))
+        latest = min(window_end, self.close_time) - duration
+        if first > latest:
+            return np.empty(0, dtype=np.int64)
+        k = -(-duration // self._slot)
+        lo = (first - self.open_time) // self._slot
+        hi = (latest - self.open_time) // self._slot
+        candidates = np.arange(0, hi - lo + 1, step // self.slot_minutes)
+        SLOTS_PROBED.inc(len(candidates), "slotgrid")
+        busy_before = np.zeros(hi - lo + k + 1, dtype=np.int64)
+        np.cumsum(self._busy[lo : hi + k], out=busy_before[1:])
+        return lo + candidates[busy_before[candidates + k] == busy_before[candidates]]
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from .calendar import DoctorCalendar
+from .models import AppointmentRequest, ConfirmedAppointment, Priority
+
+_EPOCH = datetime(1970, 1, 1)
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS appointments (
+    id INTEGER PRIMARY KEY,
+    provider_id TEXT NOT NULL,
+    patient_id TEXT NOT NULL,
+    start INTEGER NOT NULL,
+    end INTEGER NOT NULL,
+    priority INTEGER NOT NULL,
+    note TEXT NOT NULL DEFAULT ''
+);
+CREATE UNIQUE INDEX IF NOT EXISTS appointments_provider_start
+    ON appointments (provider_id, start, end);
+"""
+_COLUMNS = "provider_id, patient_id, start, end, priority, note"
+
+
+class BookingConflict(ValueError):
+    """The slot overlaps an appointment already in the store."""
+
+
+def _seconds(t: datetime) -> int:
+    return int((t - _EPOCH).total_seconds())
+
+
+def _row_to_appt(row: Tuple) -> ConfirmedAppointment:
+    provider_id, patient_id, start, end, priority, note = row
+    return ConfirmedAppointment(
+        patient_id,
+        _EPOCH + timedelta(seconds=start),
+        _EPOCH + timedelta(seconds=end),
+        Priority(priority),
+        note,
+        provider_id,
+    )
+
+
+class SQLiteCalendarStore:
+    """Appointments for many providers in one SQLite database, safe to share across processes.
+
+    The database runs in WAL mode, so readers never block the writer. Every
+    booking is a single ``BEGIN IMMEDIATE`` transaction: the write lock is taken
+    before the overlap check, so two workers can never both see a slot as free.
+    A provider's appointments never overlap, so the only one that can overlap
+    ``[start, end)`` from before ``start`` is the latest one starting before it;
+    with the ``(provider_id, start, end)`` index every query is a short range
+    scan, independent of how many appointments are stored. Times are naive
+    datetimes stored as whole seconds.
+    """
+
+    def __init__(self, path: str, timeout: float = 30.0):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connection().executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def add(self, appt: ConfirmedAppointment) -> None:
+        """Store ``appt`` (``provider_id`` is required), raising ``BookingConflict`` on overlap."""
+        self.add_many([appt])
+
+    def add_many(self, appts: Iterable[ConfirmedAppointment]) -> None:
+        """Store several appointments in one transaction; all or none are added."""
+        with self._transaction() as conn:
+            for appt in appts:
+                self._insert(conn, appt)
+
+    def book(
+        self, provider_id: str, req: AppointmentRequest, slot_minutes: int = 5
+    ) -> Optional[ConfirmedAppointment]:
+        """Atomically book the first fit for ``req`` with ``provider_id`` (``None`` if full)."""
+        req.validate()
+        duration = timedelta(minutes=req.duration_minutes)
+        with self._transaction() as conn:
+            cal = self._window(
+                conn, provider_id, req.requested_start, req.requested_end, slot_minutes
+            )
+            fit = cal.find_first_fit(req.requested_start, req.requested_end, duration)
+            if fit is None:
+                return None
+            appt = ConfirmedAppointment(
+                req.patient_id, fit[0], fit[1], req.priority, req.note, provider_id
+            )
+            self._insert(conn, appt)
+        return appt
+
+    def cancel(self, appt: ConfirmedAppointment) -> bool:
+        with self._transaction() as conn:
+            cur = conn.execute(
+                "DELETE FROM appointments "
+                "WHERE provider_id = ? AND start = ? AND end = ? AND patient_id = ?",
+                (appt.provider_id, _seconds(appt.start), _seconds(appt.end), appt.patient_id),
+            )
+        return cur.rowcount > 0
+
+    def appointments(
+        self, provider_id: str, start: datetime, end: datetime
+    ) -> List[ConfirmedAppointment]:
+        """A provider's appointments overlapping ``[start, end)``, sorted by start."""
+        return [
+            _row_to_appt(r) for r in self._overlapping(self._connection(), provider_id, start, end)
+        ]
+
+    def calendar(
+        self, provider_id: str, open_time: datetime, close_time: datetime, slot_minutes: int = 5
+    ) -> DoctorCalendar:
+        """An in-memory ``DoctorCalendar`` of the stored bookings, clipped to opening hours."""
+        return self._window(self._connection(), provider_id, open_time, close_time, slot_minutes)
+
+    def availability(
+        self,
+        provider_id: str,
+        start: datetime,
+        end: datetime,
+        duration: timedelta,
+        step_minutes: int = 5,
+    ) -> List[Tuple[datetime, datetime]]:
+        """Every ``(start, end)`` on the ``step_minutes`` grid in the window that is free."""
+        step = timedelta(minutes=step_minutes)
+        slots: List[Tuple[datetime, datetime]] = []
+        for gap_start, gap_end in self.calendar(provider_id, start, end, step_minutes).free_gaps():
+            epoch = datetime(gap_start.year, gap_start.month, gap_start.day)
+            s = epoch + -((epoch - gap_start) // step) * step
+            while s + duration <= gap_end:
+                slots.append((s, s + duration))
+                s += step
+        return slots
+
+    def count(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM appointments").fetchone()[0]
+
+    def _overlapping(
+        self, conn: sqlite3.Connection, provider_id: str, start: datetime, end: datetime
+    ) -> List[Tuple]:
+        lo, hi = _seconds(start), _seconds(end)
+        before = conn.execute(
+            f"SELECT {_COLUMNS} FROM appointments WHERE provider_id = ? AND start < ? "
+            "ORDER BY start DESC LIMIT 1",
+            (provider_id, lo),
+        ).fetchall()
+        inside = conn.execute(
+            f"SELECT {_COLUMNS} FROM appointments "
+            "WHERE provider_id = ? AND start >= ? AND start < ? ORDER BY start",
+            (provider_id, lo, hi),
+        ).fetchall()
+        return [r for r in before if r[3] > lo] + inside
+
+    def _window(
+        self,
+        conn: sqlite3.Connection,
+        provider_id: str,
+        start: datetime,
+        end: datetime,
+        slot_minutes: int,
+    ) -> DoctorCalendar:
+        cal = DoctorCalendar(start, end, slot_minutes)
+        for row in self._overlapping(conn, provider_id, start, end):
+            appt = _row_to_appt(row)
+            cal.add_appointment(
+                ConfirmedAppointment(
+                    appt.patient_id,
+                    max(appt.start, start),
+                    min(appt.end, end),
+                    appt.priority,
+                    appt.note,
+                    provider_id,
+                )
+            )
+        return cal
+
+    def _insert(self, conn: sqlite3.Connection, appt: ConfirmedAppointment) -> None:
+        if appt.provider_id is None:
+            raise ValueError("appointment needs a provider_id")
+        if appt.end <= appt.start:
+            raise ValueError("appointment must have a positive duration")
+        if self._overlapping(conn, appt.provider_id, appt.start, appt.end):
+            raise BookingConflict("appointment overlaps existing")
+        conn.execute(
+            f"INSERT INTO appointments ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                appt.provider_id,
+                appt.patient_id,
+                _seconds(appt.start),
+                _seconds(appt.end),
+                int(appt.priority),
+                appt.note,
+            ),
+        )
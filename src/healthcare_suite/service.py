@@ -0,0 +1,340 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+import numpy as np
+
+from . import metrics
+from .interactions import default_registry
+from .interactions.models import CheckResult
+from .scheduler import (
+    AppointmentRequest,
+    BookingConflict,
+    ConfirmedAppointment,
+    Priority,
+    SQLiteCalendarStore,
+)
+from .sir import SIRModel, SIRParams
+from .sir.cache import simulate_cached
+from .sir.downsample import downsample
+from .sir.integrate import METHODS
+
+DEFAULT_INTERACTIONS = "data/sample_interactions.csv"
+DEFAULT_ALIASES = "data/sample_aliases.csv"
+SIR_COLUMNS = ("t", "S", "I", "R")
+SIR_FORMATS = ("records", "columns", "binary")
+MAX_BATCH = 1000
+SCHEDULER_DB = os.environ.get("HEALTHCARE_SCHEDULER_DB", "data/scheduler.db")
+# Aliases for any table other than the sample one; server config only, never the request.
+ALIASES = os.environ.get("HEALTHCARE_ALIASES")
+
+T = TypeVar("T")
+# A JSON-ready dict, or a raw body with its response headers.
+SIRResponse = Tuple[Union[Dict[str, Any], bytes], Dict[str, str]]
+
+_SERIALIZE_SECONDS = metrics.histogram(
+    "healthcare_sir_serialize_seconds",
+    "Time to turn a simulated frame into a response body.",
+    ["format"],
+)
+
+
+class RequestError(ValueError):
+    """A request payload that cannot be served (HTTP 400)."""
+
+
+class Overloaded(RuntimeError):
+    """An endpoint is at its concurrency limit (HTTP 429)."""
+
+    def __init__(self, retry_after: float):
+        super().__init__("too many requests in flight")
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+def _hits_json(result: CheckResult) -> Dict[str, Any]:
+    return {
+        "count": len(result),
+        "hits": [h.__dict__ for h in result],
+        "unresolved": [
+            {"name": u.name, "suggestions": list(u.suggestions)} for u in result.unresolved
+        ],
+    }
+
+
+def _database_paths(payload: Mapping[str, Any]) -> Tuple[str, Optional[str]]:
+    """``db_path`` and the aliases file for it: the sample aliases for the sample table,
+    otherwise ``ALIASES``. Clients cannot name an aliases file themselves.
+    """
+    if "aliases_path" in payload:
+        raise RequestError("aliases_path is set by the server, not the request")
+    db_path = payload.get("db_path", DEFAULT_INTERACTIONS)
+    return db_path, DEFAULT_ALIASES if db_path == DEFAULT_INTERACTIONS else ALIASES
+
+
+def check_interactions(payload: Mapping[str, Any]) -> Dict[str, Any]:
+    """``/interactions/check``: one medication list through the process-wide registry."""
+    meds = payload.get("medications", [])
+    db_path, aliases_path = _database_paths(payload)
+    return _hits_json(default_registry().check(db_path, meds, aliases=aliases_path))
+
+
+def check_interactions_batch(payload: Mapping[str, Any]) -> Dict[str, Any]:
+    """``/interactions/check-batch``: many lists against one database in a single call.
+
+    ``lists`` holds up to ``MAX_BATCH`` medication lists; name resolution is shared
+    across them (``check_many``) and results come back in the same order.
+    """
+    lists = payload.get("lists")
+    if not isinstance(lists, list) or not all(
+        isinstance(meds, list) and all(isinstance(m, str) for m in meds) for meds in lists
+    ):
+        raise RequestError("lists must be a list of lists of medication names")
+    if len(lists) > MAX_BATCH:
+        raise RequestError(f"at most {MAX_BATCH} lists per batch")
+    db_path, aliases_path = _database_paths(payload)
+    db = default_registry().get(db_path, aliases_path)
+    results = db.check_many(lists, suggest=bool(payload.get("suggest", False)))
+    return {"count": len(results), "results": [_hits_json(r) for r in results]}
+
+
+@dataclass(frozen=True)
+class SIRQuery:
+    """A validated ``/sir/simulate`` request; hashable, so identical ones can be coalesced."""
+    params: SIRParams
+    days: int
+    dt: float
+    method: str
+    fmt: str
+    max_points: Optional[int]
+
+
+def sir_query(payload: Mapping[str, Any]) -> SIRQuery:
+    try:
+        params = SIRParams(
+            population=int(payload["population"]),
+            beta=float(payload["beta"]),
+            gamma=float(payload["gamma"]),
+            initial_infected=int(payload.get("initial_infected", 1)),
+            initial_recovered=int(payload.get("initial_recovered", 0)),
+        )
+        SIRModel(params)
+        max_points = payload.get("max_points")
+        query = SIRQuery(
+            params=params,
+            days=int(payload.get("days", 160)),
+            dt=float(payload.get("dt", 0.2)),
+            method=str(payload.get("method", "euler")),
+            fmt=payload.get("format", "records"),
+            max_points=None if max_points is None else int(max_points),
+        )
+    except KeyError as exc:
+        raise RequestError(f"missing field: {exc.args[0]}") from None
+    except (TypeError, ValueError) as exc:
+        raise RequestError(str(exc)) from None
+    if query.fmt not in SIR_FORMATS:
+        raise RequestError(f"format must be one of {list(SIR_FORMATS)}")
+    if query.method not in METHODS:
+        raise RequestError(f"method must be one of {list(METHODS)}")
+    if query.days <= 0:
+        raise RequestError("days must be positive")
+    if not (math.isfinite(query.dt) and query.dt > 0):
+        raise RequestError("dt must be a positive number")
+    if query.max_points is not None and query.max_points < 2:
+        raise RequestError("max_points must be at least 2")
+    return query
+
+
+def run_sir(query: SIRQuery) -> SIRResponse:
+    """Simulate ``query``; picklable in and out, so it can run in a worker process."""
+    df = simulate_cached(query.params, query.days, query.dt, query.method)
+    if query.max_points is not None:
+        df = downsample(df, query.max_points)
+    with _SERIALIZE_SECONDS.time(query.fmt):
+        if query.fmt == "binary":
+            body = np.ascontiguousarray(df[list(SIR_COLUMNS)].to_numpy(dtype="<f8").T).tobytes()
+            return body, {"X-SIR-Columns": ",".join(SIR_COLUMNS), "X-SIR-Rows": str(len(df))}
+        if query.fmt == "columns":
+            return {c: df[c].tolist() for c in SIR_COLUMNS}, {}
+        return {"rows": df.to_dict(orient="records")}, {}
+
+
+_stores: Dict[str, SQLiteCalendarStore] = {}
+_stores_lock = threading.Lock()
+
+
+def scheduler_store(path: str = SCHEDULER_DB) -> SQLiteCalendarStore:
+    """One store per database path per process; each thread gets its own connection."""
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = SQLiteCalendarStore(path)
+        return _stores[path]
+
+
+def _appointment_json(appt: ConfirmedAppointment) -> Dict[str, Any]:
+    return {
+        "provider_id": appt.provider_id,
+        "patient_id": appt.patient_id,
+        "start": appt.start.isoformat(),
+        "end": appt.end.isoformat(),
+        "priority": appt.priority.name,
+        "note": appt.note,
+    }
+
+
+def _local_time(text: Any) -> datetime:
+    """Parse an ISO timestamp; schedules are kept in naive clinic-local time."""
+    t = datetime.fromisoformat(text)
+    if t.tzinfo is not None:
+        raise ValueError(f"{text!r} has a UTC offset; send clinic-local time without one")
+    return t
+
+
+def _provider_id(value: Any) -> str:
+    if not isinstance(value, str) or not value:
+        raise ValueError("provider_id must be a non-empty string")
+    return value
+
+
+def book_appointment(store: SQLiteCalendarStore, payload: Mapping[str, Any]) -> Dict[str, Any]:
+    """``/scheduler/book``: the first free slot in the requested window, booked atomically.
+
+    Raises ``BookingConflict`` (409) when nothing fits and ``RequestError`` (400)
+    for a malformed payload.
+    """
+    try:
+        priority = payload.get("priority", "ROUTINE")
+        if isinstance(priority, str):
+            priority = Priority[priority.upper()]
+        req = AppointmentRequest(
+            patient_id=str(payload["patient_id"]),
+            requested_start=_local_time(payload["requested_start"]),
+            requested_end=_local_time(payload["requested_end"]),
+            duration_minutes=int(payload.get("duration_minutes", 15)),
+            priority=Priority(priority),
+            note=str(payload.get("note", "")),
+        )
+        req.validate()
+        provider_id = _provider_id(payload["provider_id"])
+    except (KeyError, TypeError, ValueError) as exc:
+        raise RequestError(f"invalid booking: {exc}") from None
+    appt = store.book(provider_id, req)
+    if appt is None:
+        raise BookingConflict("no free slot in the requested window")
+    return _appointment_json(appt)
+
+
+def availability(store: SQLiteCalendarStore, args: Mapping[str, str]) -> Dict[str, Any]:
+    """``/scheduler/availability``: free ``duration_minutes`` slots from ``start`` to ``end``."""
+    try:
+        provider_id = _provider_id(args["provider_id"])
+        start = _local_time(args["start"])
+        end = _local_time(args["end"])
+        duration = timedelta(minutes=int(args.get("duration_minutes", 15)))
+        step = int(args.get("step_minutes", 5))
+    except (KeyError, TypeError, ValueError) as exc:
+        raise RequestError(f"invalid query: {exc}") from None
+    if end <= start or duration <= timedelta(0) or step <= 0:
+        raise RequestError("invalid query: need start < end and positive durations")
+    slots = store.availability(provider_id, start, end, duration, step)
+    return {
+        "provider_id": provider_id,
+        "slots": [{"start": s.isoformat(), "end": e.isoformat()} for s, e in slots],
+    }
+
+
+class ConcurrencyLimit:
+    """At most ``limit`` computations in flight; further ones are turned away at once.
+
+    Rejecting instead of queueing keeps latency bounded under overload: callers
+    get ``Overloaded`` (429 with ``Retry-After``) and back off. Meant for a
+    single event loop, so a plain counter is enough.
+    """
+
+    def __init__(self, limit: int, retry_after: float = 1.0):
+        if limit <= 0:
+            raise ValueError("limit must be positive")
+        self.limit = limit
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self.rejected = 0
+
+    def acquire(self) -> None:
+        if self.in_flight >= self.limit:
+            self.rejected += 1
+            raise Overloaded(self.retry_after)
+        self.in_flight += 1
+
+    def release(self) -> None:
+        self.in_flight -= 1
+
+
+class Coalescer:
+    """Shares one computation between identical requests that are in flight together.
+
+    The first request for a key starts the work (after passing ``limit``, if
+    given); later ones with the same key await the same result without counting
+    against the limit. A caller that goes away does not cancel the shared work.
+    Nothing is kept once the computation finishes; caching is left to callers.
+    """
+
+    def __init__(self) -> None:
+        self._in_flight: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self.started = 0
+        self.joined = 0
+
+    def __len__(self) -> int:
+        return len(self._in_flight)
+
+    async def run(
+        self,
+        key: Hashable,
+        work: Callable[[], Awaitable[T]],
+        limit: Optional[ConcurrencyLimit] = None,
+    ) -> T:
+        future = self._in_flight.get(key)
+        if future is None:
+            if limit is not None:
+                limit.acquire()
+            future = asyncio.ensure_future(work())
+            self._in_flight[key] = future
+            self.started += 1
+
+            def done(_: "asyncio.Future[Any]") -> None:
+                del self._in_flight[key]
+                if limit is not None:
+                    limit.release()
+
+            future.add_done_callback(done)
+        else:
+            self.joined += 1
+        return await asyncio.shield(future)
+
+
+def med_key(payload: Mapping[str, Any]) -> Tuple[Any, ...]:
+    """Coalescing key for an interaction check: the database and the exact med list."""
+    meds: List[Any] = payload.get("medications", [])
+    if not isinstance(meds, list) or not all(isinstance(m, str) for m in meds):
+        raise RequestError("medications must be a list of names")
+    return (*_database_paths(payload), tuple(meds))
@@ -1 +1,6 @@
+from .ensemble import simulate_ensemble
+from .fit import FitResult, fit_sir
 from .model import SIRModel, SIRParams
+from .stochastic import StochasticSummary, run_replicates, simulate_stochastic
+from .structured import StructuredSIRModel
+from .summary import SIRSummary, summarize
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional
+
+from .model import SIRModel, SIRParams
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+@lru_cache(maxsize=16)
+def simulate_cached(
+    params: SIRParams,
+    days: int,
+    dt: float = 0.1,
+    method: str = "euler",
+    output_dt: Optional[float] = None,
+) -> pd.DataFrame:
+    """``SIRModel(params).simulate(...)`` memoized on its arguments.
+
+    The most recent results are kept in an LRU cache (invalid parameters raise and
+    are never cached), so repeated requests for the same scenario skip the
+    integration. The frame is shared between callers and must not be modified.
+    """
+    return SIRModel(params).simulate(days, dt, method=method, output_dt=output_dt)
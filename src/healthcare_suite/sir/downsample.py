@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Sequence
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def downsample(df: pd.DataFrame, max_points: int) -> pd.DataFrame:
+    """At most ``max_points`` evenly spaced rows of ``df``, always keeping the first and last."""
+    if max_points < 2:
+        raise ValueError("max_points must be at least 2")
+    n = len(df)
+    if n <= max_points:
+        return df
+    keep = np.unique(np.linspace(0, n - 1, max_points).round().astype(np.intp))
+    return df.iloc[keep].reset_index(drop=True)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices of ``n_out`` points chosen by Largest-Triangle-Three-Buckets.
+
+    The first and last points are kept; the rest are split into ``n_out - 2``
+    buckets and each bucket contributes the point forming the largest triangle
+    with the previously chosen point and the mean of the next bucket, which keeps
+    peaks and turns that uniform thinning would skip.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n_out < 3:
+        raise ValueError("n_out must be at least 3")
+    if n <= n_out:
+        return np.arange(n)
+    edges = (np.linspace(1, n - 1, n_out - 1)).astype(np.intp)
+    # Means of every bucket, plus the last point as the "next bucket" of the final one.
+    counts = np.diff(edges)
+    mean_x = np.append(np.add.reduceat(x[1 : n - 1], edges[:-1] - 1) / counts, x[-1])
+    mean_y = np.append(np.add.reduceat(y[1 : n - 1], edges[:-1] - 1) / counts, y[-1])
+    out = np.empty(n_out, dtype=np.intp)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        cx, cy = mean_x[b + 1], mean_y[b + 1]
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        out[b + 1] = a
+    return out
+
+
+def downsample_lttb(
+    df: pd.DataFrame, max_points: int, x: str = "t", columns: Sequence[str] = ("S", "I", "R")
+) -> pd.DataFrame:
+    """At most ``max_points`` rows of ``df``, shape-preserving for every column in ``columns``.
+
+    Each column gets an equal share of the budget and the rows LTTB keeps for any
+    of them are kept for all, so every curve can still be drawn from one frame.
+    """
+    if max_points < 3 * len(columns):
+        raise ValueError("max_points must allow at least 3 points per column")
+    if len(df) <= max_points:
+        return df
+    t = df[x].to_numpy()
+    share = max_points // len(columns)
+    keep = np.unique(np.concatenate([lttb_indices(t, df[c].to_numpy(), share) for c in columns]))
+    return df.iloc[keep].reset_index(drop=True)
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .integrate import iter_sir, n_outputs
+from .model import SIRParams
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Either a sequence of SIRParams or SIRParams field names mapped to equal-length columns.
+ParamsGrid = Union[Sequence[SIRParams], Mapping[str, Iterable[float]]]
+Grid = Dict[str, np.ndarray]
+
+OUTPUTS = ("long", "array", "summary")
+_FIELDS = ("population", "beta", "gamma", "initial_infected", "initial_recovered")
+_DEFAULTS = {"initial_infected": 1.0, "initial_recovered": 0.0}
+
+
+def _as_grid(params_grid: ParamsGrid) -> Grid:
+    if isinstance(params_grid, Mapping):
+        unknown = set(params_grid) - set(_FIELDS)
+        if unknown:
+            raise ValueError(f"unknown parameter columns: {sorted(unknown)}")
+        missing = {"population", "beta", "gamma"} - set(params_grid)
+        if missing:
+            raise ValueError(f"params_grid must contain columns: {sorted(missing)}")
+        cols = {name: np.asarray(params_grid[name], dtype=float) for name in params_grid}
+        n = np.broadcast_shapes(*(c.shape for c in cols.values()))
+        grid = {
+            name: np.broadcast_to(cols.get(name, _DEFAULTS.get(name)), n).ravel()
+            for name in _FIELDS
+        }
+    else:
+        params = list(params_grid)
+        grid = {name: np.array([getattr(p, name) for p in params], dtype=float) for name in _FIELDS}
+    _check_grid(grid)
+    return grid
+
+
+def _check_grid(grid: Grid) -> None:
+    """The checks of ``SIRModel.__init__``, naming the first offending scenario."""
+    checks = (
+        (grid["population"] <= 0, "population must be positive"),
+        (
+            (grid["initial_infected"] < 0) | (grid["initial_recovered"] < 0),
+            "initial values must be non-negative",
+        ),
+        (
+            grid["initial_infected"] + grid["initial_recovered"] > grid["population"],
+            "initial states exceed population",
+        ),
+        ((grid["beta"] < 0) | (grid["gamma"] < 0), "beta and gamma must be non-negative"),
+    )
+    for bad, message in checks:
+        if bad.any():
+            raise ValueError(f"scenario {int(np.argmax(bad))}: {message}")
+
+
+def _chunk(grid: Grid, lo: int, hi: int) -> Grid:
+    return {name: col[lo:hi] for name, col in grid.items()}
+
+
+def _integrate(grid: Grid, days: float, dt: float, method: str, output_dt: Optional[float]):
+    N = grid["population"]
+    state = (
+        N - grid["initial_infected"] - grid["initial_recovered"],
+        grid["initial_infected"],
+        grid["initial_recovered"],
+    )
+    return iter_sir(
+        state, grid["beta"], grid["gamma"], N, days, dt, method=method, output_dt=output_dt
+    )
+
+
+def _run_chunk(
+    grid: Grid, days: float, dt: float, method: str, output_dt: Optional[float], output: str
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Integrate one chunk; returns ``(t, y)`` or, for summaries, ``(t_peak, stats)``."""
+    n_scen = len(grid["beta"])
+    samples = _integrate(grid, days, dt, method, output_dt)
+    if output == "summary":
+        peak_I = np.full(n_scen, -np.inf)
+        peak_t = np.zeros(n_scen)
+        R = grid["initial_recovered"]
+        for t, _, I, R in samples:
+            higher = I > peak_I
+            peak_I = np.where(higher, I, peak_I)
+            peak_t = np.where(higher, t, peak_t)
+        return peak_t, np.stack([peak_I, R], axis=1)
+
+    n = n_outputs(days, dt, method, output_dt)
+    t = np.empty(n)
+    y = np.empty((n_scen, n, 3))
+    for k, (tk, S, I, R) in enumerate(samples):
+        t[k] = tk
+        y[:, k, 0] = S
+        y[:, k, 1] = I
+        y[:, k, 2] = R
+    return t, y
+
+
+def simulate_ensemble(
+    params_grid: ParamsGrid,
+    days: int,
+    dt: float = 0.1,
+    method: str = "euler",
+    output_dt: Optional[float] = None,
+    output: str = "long",
+    chunk_size: int = 10_000,
+    workers: Optional[int] = 1,
+) -> Union[pd.DataFrame, Tuple[np.ndarray, np.ndarray]]:
+    """Integrate every scenario of a parameter grid at once.
+
+    All scenarios advance in lockstep as NumPy arrays of shape ``(scenarios,)``
+    with the same integrator as ``SIRModel.simulate``. ``output`` selects the result:
+
+    * ``"long"``: a tidy frame with ``scenario, t, S, I, R``;
+    * ``"array"``: ``(t, y)`` with ``y`` of shape ``(scenarios, len(t), 3)``;
+    * ``"summary"``: one row per scenario with ``peak_infected``, ``peak_day`` and
+      ``final_recovered``, reduced on the fly without storing any trajectory.
+
+    The grid is split into chunks of ``chunk_size`` scenarios; with ``workers > 1``
+    (``None`` for one per CPU) the chunks run in a process pool.
+    """
+    import pandas as pd
+    if output not in OUTPUTS:
+        raise ValueError(f"output must be one of {OUTPUTS}")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    n_outputs(days, dt, method, output_dt)
+    grid = _as_grid(params_grid)
+    n_scen = len(grid["beta"])
+    bounds = [(lo, min(lo + chunk_size, n_scen)) for lo in range(0, n_scen, chunk_size)] or [(0, 0)]
+    workers = (os.cpu_count() or 1) if workers is None else workers
+
+    chunks = [_chunk(grid, lo, hi) for lo, hi in bounds]
+    args = (days, dt, method, output_dt, output)
+    if workers <= 1 or len(chunks) == 1:
+        results: List[Tuple[np.ndarray, np.ndarray]] = [_run_chunk(c, *args) for c in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+            futures = [pool.submit(_run_chunk, c, *args) for c in chunks]
+            results = [f.result() for f in futures]
+
+    if output == "summary":
+        peak_t = np.concatenate([r[0] for r in results])
+        stats = np.concatenate([r[1] for r in results])
+        return pd.DataFrame(
+            {
+                "scenario": np.arange(n_scen),
+                "peak_infected": stats[:, 0],
+                "peak_day": peak_t,
+                "final_recovered": stats[:, 1],
+            }
+        )
+
+    t = results[0][0]
+    y = np.concatenate([r[1] for r in results])
+    if output == "array":
+        return t, y
+    return pd.DataFrame(
+        {
+            "scenario": np.repeat(np.arange(n_scen), len(t)),
+            "t": np.tile(t, n_scen),
+            "S": y[:, :, 0].ravel(),
+            "I": y[:, :, 1].ravel(),
+            "R": y[:, :, 2].ravel(),
+        }
+    )
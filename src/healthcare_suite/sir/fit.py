@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .model import SIRModel, SIRParams
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+FIT_COLUMNS = ("I", "R", "cases")
+# beta and gamma are fitted as logs, kept inside [1e-6, 50].
+_LOG_BOUNDS = (np.log(1e-6), np.log(50.0))
+
+
+@dataclass
+class FitResult:
+    """Best fit over all starts; intervals come from the Gauss-Newton covariance.
+
+    ``iterations`` and ``converged`` describe the winning start. ``covariance`` is
+    for ``(beta, gamma)``; the intervals are computed on the log scale and
+    exponentiated, so they are asymmetric and never include zero.
+    """
+    params: SIRParams
+    beta_ci: Tuple[float, float]
+    gamma_ci: Tuple[float, float]
+    covariance: np.ndarray
+    sse: float
+    iterations: int
+    converged: bool
+
+    @property
+    def r0(self) -> float:
+        return self.params.beta / self.params.gamma if self.params.gamma > 0 else float("inf")
+
+
+def _observation_steps(t: np.ndarray, dt: float) -> np.ndarray:
+    steps = np.rint(t / dt).astype(int)
+    if (t < 0).any() or np.abs(steps * dt - t).max() > 1e-9 * max(1.0, float(t.max())):
+        raise ValueError("observation times must be non-negative multiples of dt")
+    if (np.diff(steps) <= 0).any():
+        raise ValueError("observation times must be strictly increasing")
+    return steps
+
+
+@dataclass(frozen=True)
+class _Problem:
+    observed: np.ndarray
+    column: str
+    S0: float
+    I0: float
+    N: float
+    dt: float
+    steps: Tuple[int, ...]
+
+
+def _trajectory(beta: float, gamma: float, p: _Problem) -> np.ndarray:
+    """RK4 for ``(S, I)`` and their sensitivities to ``log beta`` and ``log gamma``.
+
+    Returns ``(len(steps), 6)`` with columns ``S, I, dS/dlog(beta), dI/dlog(beta),
+    dS/dlog(gamma), dI/dlog(gamma)`` at each observation step. Plain floats with
+    the stages inlined: for one short series this is far cheaper than NumPy calls.
+    """
+    dt, steps = p.dt, p.steps
+    h2, h6 = 0.5 * dt, dt / 6
+    bN = beta / p.N
+    S, I, a, b, c, d = p.S0, p.I0, 0.0, 0.0, 0.0, 0.0
+    rows: List[Tuple[float, ...]] = []
+    k, nxt = 0, steps[0]
+    for step in range(steps[-1] + 1):
+        if step == nxt:
+            rows.append((S, I, a, b, c, d))
+            k += 1
+            if k == len(steps):
+                break
+            nxt = steps[k]
+        # f(S, I, a, b, c, d): the SIR terms plus d/dt of the sensitivities, J @ s + df/dlog(p),
+        # where the state Jacobian rows are dS' = (-beta I / N, -beta S / N) and
+        # dI' = -dS' - (0, gamma).
+        inc = bN * S * I
+        u = -bN * (I * a + S * b)
+        v = -bN * (I * c + S * d)
+        k1 = (-inc, inc - gamma * I, u - inc, inc - u - gamma * b, v, -v - gamma * (d + I))
+        S2, I2 = S + h2 * k1[0], I + h2 * k1[1]
+        a2, b2, c2, d2 = a + h2 * k1[2], b + h2 * k1[3], c + h2 * k1[4], d + h2 * k1[5]
+        inc = bN * S2 * I2
+        u = -bN * (I2 * a2 + S2 * b2)
+        v = -bN * (I2 * c2 + S2 * d2)
+        k2 = (-inc, inc - gamma * I2, u - inc, inc - u - gamma * b2, v, -v - gamma * (d2 + I2))
+        S3, I3 = S + h2 * k2[0], I + h2 * k2[1]
+        a3, b3, c3, d3 = a + h2 * k2[2], b + h2 * k2[3], c + h2 * k2[4], d + h2 * k2[5]
+        inc = bN * S3 * I3
+        u = -bN * (I3 * a3 + S3 * b3)
+        v = -bN * (I3 * c3 + S3 * d3)
+        k3 = (-inc, inc - gamma * I3, u - inc, inc - u - gamma * b3, v, -v - gamma * (d3 + I3))
+        S4, I4 = S + dt * k3[0], I + dt * k3[1]
+        a4, b4, c4, d4 = a + dt * k3[2], b + dt * k3[3], c + dt * k3[4], d + dt * k3[5]
+        inc = bN * S4 * I4
+        u = -bN * (I4 * a4 + S4 * b4)
+        v = -bN * (I4 * c4 + S4 * d4)
+        k4 = (-inc, inc - gamma * I4, u - inc, inc - u - gamma * b4, v, -v - gamma * (d4 + I4))
+        S += h6 * (k1[0] + 2 * (k2[0] + k3[0]) + k4[0])
+        I += h6 * (k1[1] + 2 * (k2[1] + k3[1]) + k4[1])
+        a += h6 * (k1[2] + 2 * (k2[2] + k3[2]) + k4[2])
+        b += h6 * (k1[3] + 2 * (k2[3] + k3[3]) + k4[3])
+        c += h6 * (k1[4] + 2 * (k2[4] + k3[4]) + k4[4])
+        d += h6 * (k1[5] + 2 * (k2[5] + k3[5]) + k4[5])
+    return np.array(rows)
+
+
+def _residuals(theta: np.ndarray, p: _Problem) -> Tuple[np.ndarray, np.ndarray, float]:
+    """Residuals, their ``(obs, 2)`` Jacobian in log-parameter space, and the SSE."""
+    with np.errstate(all="ignore"):
+        Y = _trajectory(float(np.exp(theta[0])), float(np.exp(theta[1])), p)
+        S, I = Y[:, 0], Y[:, 1]
+        dS, dI = Y[:, 2::2], Y[:, 3::2]
+        if p.column == "I":
+            model, jac = I, dI
+        elif p.column == "R":
+            model, jac = p.N - S - I, -dS - dI
+        else:
+            # New infections since the previous observation (since t=0 for the first one).
+            model = np.concatenate([[p.S0], S[:-1]]) - S
+            jac = np.concatenate([np.zeros((1, 2)), dS[:-1]]) - dS
+        r = model - p.observed
+        sse = float(r @ r)
+    return r, jac, sse if np.isfinite(sse) else np.inf
+
+
+def _fit_start(
+    theta: np.ndarray, p: _Problem, max_iter: int, tol: float
+) -> Tuple[np.ndarray, float, np.ndarray, int, bool]:
+    """Levenberg-Marquardt from one start: ``(theta, sse, jacobian, iterations, converged)``."""
+    r, J, sse = _residuals(theta, p)
+    damping = 1e-3
+    for iteration in range(1, max_iter + 1):
+        A = J.T @ J
+        g = J.T @ r
+        try:
+            step = np.linalg.solve(A + damping * np.diag(np.diag(A)) + 1e-12 * np.eye(2), -g)
+        except np.linalg.LinAlgError:
+            return theta, sse, J, iteration, False
+        if not np.isfinite(step).all():
+            return theta, sse, J, iteration, False
+        candidate = np.clip(theta + step, *_LOG_BOUNDS)
+        r_new, J_new, sse_new = _residuals(candidate, p)
+        if sse_new < sse:
+            gain = sse - sse_new
+            theta, r, J, sse = candidate, r_new, J_new, sse_new
+            damping = max(damping / 3, 1e-12)
+            if gain <= tol * sse or np.abs(step).max() <= tol:
+                return theta, sse, J, iteration, True
+        else:
+            damping *= 4
+            if damping > 1e12:
+                return theta, sse, J, iteration, np.abs(step).max() <= 1e-6
+    return theta, sse, J, max_iter, False
+
+
+def fit_sir(
+    observed: pd.DataFrame,
+    population: int,
+    column: str = "I",
+    initial_infected: Optional[int] = None,
+    initial_recovered: int = 0,
+    starts: Union[int, Sequence[Tuple[float, float]]] = 8,
+    dt: float = 1.0,
+    seed: Optional[int] = 0,
+    max_iter: int = 100,
+    tol: float = 1e-10,
+    level: float = 0.95,
+    workers: Optional[int] = 1,
+) -> FitResult:
+    """Least-squares fit of ``beta`` and ``gamma`` to an observed series.
+
+    ``observed`` has a ``t`` column (days, multiples of ``dt``) and ``column``: ``I``
+    (prevalence), ``R`` or ``cases`` (new infections since the previous row). The
+    model is integrated with RK4 together with its forward sensitivity equations,
+    so each Levenberg-Marquardt iteration costs one pass over the series and needs
+    no finite differences. Starts (``starts`` random log-uniform guesses, or explicit
+    ``(beta, gamma)`` pairs) are fitted independently, in a process pool when
+    ``workers > 1`` (``None`` for one per CPU), and the best fit wins.
+    ``initial_infected`` defaults to the first observed ``I`` (or 1 for other columns).
+    """
+    if column not in FIT_COLUMNS:
+        raise ValueError(f"column must be one of {FIT_COLUMNS}")
+    if not {"t", column}.issubset(observed.columns):
+        raise ValueError(f"observed must contain columns: ['t', '{column}']")
+    if len(observed) < 3:
+        raise ValueError("need at least three observations")
+    if dt <= 0:
+        raise ValueError("dt must be positive")
+    if not 0 < level < 1:
+        raise ValueError("level must lie in (0, 1)")
+    t = observed["t"].to_numpy(dtype=float)
+    y = observed[column].to_numpy(dtype=float)
+    steps = _observation_steps(t, dt)
+    if initial_infected is None:
+        initial_infected = max(int(round(y[0])), 1) if column == "I" else 1
+    template = SIRParams(population, 0.0, 0.0, initial_infected, initial_recovered)
+    SIRModel(template)
+    N = float(population)
+    I0 = float(initial_infected)
+    S0 = N - I0 - initial_recovered
+
+    problem = _Problem(y, column, S0, I0, N, dt, tuple(int(k) for k in steps))
+
+    if isinstance(starts, int):
+        if starts <= 0:
+            raise ValueError("starts must be positive")
+        rng = np.random.default_rng(seed)
+        thetas = np.stack(
+            [
+                rng.uniform(np.log(0.05), np.log(2.0), starts),
+                rng.uniform(np.log(0.02), np.log(1.0), starts),
+            ],
+            axis=1,
+        )
+    else:
+        guesses = np.asarray(starts, dtype=float)
+        if guesses.ndim != 2 or guesses.shape[1] != 2 or (guesses <= 0).any():
+            raise ValueError("starts must be positive (beta, gamma) pairs")
+        thetas = np.log(guesses)
+    workers = (os.cpu_count() or 1) if workers is None else workers
+
+    if workers <= 1 or len(thetas) == 1:
+        fits = [_fit_start(theta, problem, max_iter, tol) for theta in thetas]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(thetas))) as pool:
+            futures = [pool.submit(_fit_start, theta, problem, max_iter, tol) for theta in thetas]
+            fits = [f.result() for f in futures]
+
+    theta, sse, J, iterations, converged = min(fits, key=lambda fit: fit[1])
+    dof = max(len(y) - 2, 1)
+    with np.errstate(all="ignore"):
+        cov_log = np.linalg.pinv(J.T @ J) * (sse / dof)
+    beta, gamma = np.exp(theta)
+    se = np.sqrt(np.maximum(np.diag(cov_log), 0.0))
+    z = NormalDist().inv_cdf(0.5 + level / 2)
+    scale = np.array([beta, gamma])
+    return FitResult(
+        params=SIRParams(
+            population, float(beta), float(gamma), initial_infected, initial_recovered
+        ),
+        beta_ci=(float(beta * np.exp(-z * se[0])), float(beta * np.exp(z * se[0]))),
+        gamma_ci=(float(gamma * np.exp(-z * se[1])), float(gamma * np.exp(z * se[1]))),
+        covariance=cov_log * np.outer(scale, scale),
+        sse=sse,
+        iterations=iterations,
+        converged=converged,
+    )
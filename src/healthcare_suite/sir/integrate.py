@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+from typing import Callable, Iterator, Optional, Tuple, Union
+
+import numpy as np
+
+# S, I, R as Python floats (one scenario) or equally shaped NumPy arrays (a batch).
+Value = Union[float, np.ndarray]
+State = Tuple[Value, Value, Value]
+
+METHODS = ("euler", "rk4", "rk45")
+
+# Dormand-Prince 5(4) tableau.
+_DP_A = (
+    (),
+    (1 / 5,),
+    (3 / 40, 9 / 40),
+    (44 / 45, -56 / 15, 32 / 9),
+    (19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729),
+    (9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656),
+    (35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84),
+)
+_DP_E = (71 / 57600, 0.0, -71 / 16695, 71 / 1920, -17253 / 339200, 22 / 525, -1 / 40)
+
+
+def _rhs(beta: Value, gamma: Value, population: Value) -> Callable[[Value, Value, Value], State]:
+    def f(S: Value, I: Value, R: Value) -> State:
+        dS = -beta * S * I / population
+        dI = beta * S * I / population - gamma * I
+        dR = gamma * I
+        return dS, dI, dR
+
+    return f
+
+
+def projector(population: Value, batched: bool) -> Callable[[Value, Value, Value], State]:
+    """Clip negative compartments and rescale so S + I + R == population."""
+    if batched:
+        def project(S: Value, I: Value, R: Value) -> State:
+            S, I, R = np.maximum(S, 0.0), np.maximum(I, 0.0), np.maximum(R, 0.0)
+            total = S + I + R
+            positive = total > 0
+            scale = np.where(positive, population / np.where(positive, total, 1.0), 1.0)
+            return S * scale, I * scale, R * scale
+    else:
+        def project(S: Value, I: Value, R: Value) -> State:
+            S = S if S > 0.0 else 0.0
+            I = I if I > 0.0 else 0.0
+            R = R if R > 0.0 else 0.0
+            total = S + I + R
+            if total > 0:
+                scale = population / total
+                S *= scale
+                I *= scale
+                R *= scale
+            return S, I, R
+
+    return project
+
+
+def _validate(days: float, dt: float, method: str) -> None:
+    if days <= 0:
+        raise ValueError("days must be positive")
+    if dt <= 0:
+        raise ValueError("dt must be positive")
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {METHODS}")
+
+
+def n_outputs(
+    days: float, dt: float, method: str = "euler", output_dt: Optional[float] = None
+) -> int:
+    """Number of samples ``iter_sir`` yields for these settings."""
+    _validate(days, dt, method)
+    if method == "rk45":
+        if output_dt is not None and output_dt <= 0:
+            raise ValueError("output_dt must be positive")
+        return int(days / (output_dt or dt)) + 1
+    return len(range(0, int(days / dt) + 1, output_stride(dt, output_dt)))
+
+
+def output_stride(dt: float, output_dt: Optional[float]) -> int:
+    if output_dt is None:
+        return 1
+    if output_dt <= 0:
+        raise ValueError("output_dt must be positive")
+    stride = round(output_dt / dt)
+    if stride < 1 or abs(stride * dt - output_dt) > 1e-9 * max(1.0, output_dt):
+        raise ValueError("output_dt must be a whole multiple of dt for fixed-step methods")
+    return stride
+
+
+def iter_sir(
+    state: State,
+    beta: Value,
+    gamma: Value,
+    population: Value,
+    days: float,
+    dt: float,
+    method: str = "euler",
+    output_dt: Optional[float] = None,
+    rtol: float = 1e-6,
+    atol: float = 1e-6,
+) -> Iterator[Tuple[float, Value, Value, Value]]:
+    """Integrate the SIR equations and yield ``(t, S, I, R)`` at each output time.
+
+    Fixed-step methods take ``int(days / dt) + 1`` samples spaced ``dt`` apart (the
+    historical ``simulate_euler`` grid) and yield every ``output_dt / dt``-th one.
+    ``rk45`` picks its own step sizes under ``rtol``/``atol`` (``dt`` is only the
+    first trial step) and yields cubic-Hermite interpolants on a grid spaced
+    ``output_dt`` (default ``dt``). After every step negative compartments are
+    clipped and the total rescaled to the population. Scalars run on plain floats;
+    arrays integrate a whole batch of scenarios in lockstep.
+    """
+    n_outputs(days, dt, method, output_dt)
+    batched = any(isinstance(v, np.ndarray) for v in (*state, beta, gamma, population))
+    if method == "euler" and not batched:
+        steps = int(days / dt) + 1
+        yield from _iter_euler_scalar(
+            state, beta, gamma, population, dt, steps, output_stride(dt, output_dt)
+        )
+        return
+    if batched:
+        state = tuple(np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in state)))
+    yield from iter_system(
+        state,
+        _rhs(beta, gamma, population),
+        projector(population, batched),
+        days,
+        dt,
+        method,
+        output_dt,
+        rtol,
+        atol,
+    )
+
+
+def iter_system(
+    state: State,
+    f: Callable[[Value, Value, Value], State],
+    project: Callable[[Value, Value, Value], State],
+    days: float,
+    dt: float,
+    method: str = "euler",
+    output_dt: Optional[float] = None,
+    rtol: float = 1e-6,
+    atol: float = 1e-6,
+) -> Iterator[Tuple[float, Value, Value, Value]]:
+    """``iter_sir`` for any three-compartment right-hand side ``f``.
+
+    ``project`` maps a raw step result back onto the feasible set (clipping and
+    conservation); compartments may be arrays of any shape.
+    """
+    if method == "rk45":
+        yield from _iter_rk45(state, f, project, days, dt, output_dt or dt, rtol, atol)
+        return
+
+    steps = int(days / dt) + 1
+    stride = output_stride(dt, output_dt)
+    S, I, R = state
+    for k in range(steps):
+        if k % stride == 0:
+            yield k * dt, S, I, R
+        if method == "euler":
+            dS, dI, dR = f(S, I, R)
+            S, I, R = project(S + dt * dS, I + dt * dI, R + dt * dR)
+        else:
+            k1 = f(S, I, R)
+            k2 = f(S + 0.5 * dt * k1[0], I + 0.5 * dt * k1[1], R + 0.5 * dt * k1[2])
+            k3 = f(S + 0.5 * dt * k2[0], I + 0.5 * dt * k2[1], R + 0.5 * dt * k2[2])
+            k4 = f(S + dt * k3[0], I + dt * k3[1], R + dt * k3[2])
+            S, I, R = project(
+                S + dt / 6 * (k1[0] + 2 * k2[0] + 2 * k3[0] + k4[0]),
+                I + dt / 6 * (k1[1] + 2 * k2[1] + 2 * k3[1] + k4[1]),
+                R + dt / 6 * (k1[2] + 2 * k2[2] + 2 * k3[2] + k4[2]),
+            )
+
+
+def _iter_euler_scalar(
+    state: State, beta: float, gamma: float, population: float, dt: float, steps: int, stride: int
+) -> Iterator[Tuple[float, Value, Value, Value]]:
+    """The plain-float Euler loop, inlined; the hot path of ``SIRModel.simulate_euler``."""
+    S, I, R = state
+    t = 0.0
+    for k in range(steps):
+        if k % stride == 0:
+            yield t, S, I, R
+        dS = -beta * S * I / population
+        dI = beta * S * I / population - gamma * I
+        dR = gamma * I
+        S = S + dt * dS
+        I = I + dt * dI
+        R = R + dt * dR
+        if S < 0.0:
+            S = 0.0
+        if I < 0.0:
+            I = 0.0
+        if R < 0.0:
+            R = 0.0
+        total = S + I + R
+        if total > 0:
+            scale = population / total
+            S *= scale
+            I *= scale
+            R *= scale
+        t += dt
+
+
+def _iter_rk45(
+    state: State,
+    f: Callable[[Value, Value, Value], State],
+    project: Callable[[Value, Value, Value], State],
+    days: float,
+    dt: float,
+    output_dt: float,
+    rtol: float,
+    atol: float,
+) -> Iterator[Tuple[float, Value, Value, Value]]:
+    n_out = int(days / output_dt) + 1
+    t_end = (n_out - 1) * output_dt
+    y = state
+    fy = f(*y)
+    t = 0.0
+    h = min(dt, t_end) if t_end > 0 else dt
+    next_out = 0
+    while True:
+        while next_out < n_out and next_out * output_dt <= t:
+            yield next_out * output_dt, y[0], y[1], y[2]
+            next_out += 1
+        if next_out >= n_out:
+            return
+
+        k = [fy]
+        for stage in range(1, 7):
+            a = _DP_A[stage]
+            ys = tuple(
+                y[c] + h * sum(a[j] * k[j][c] for j in range(stage) if a[j]) for c in range(3)
+            )
+            k.append(f(*ys))
+        # The last stage is evaluated at the 5th-order solution. It is not reused as the
+        # next step's first stage: projection may move the state, so f is re-evaluated below.
+        y_new = ys
+        err = 0.0
+        for c in range(3):
+            e = h * sum(_DP_E[j] * k[j][c] for j in range(7) if _DP_E[j])
+            scale = atol + rtol * np.maximum(np.abs(y[c]), np.abs(y_new[c]))
+            err = max(err, float(np.max(np.abs(e) / scale)))
+
+        if err <= 1.0:
+            t_new = t + h
+            y_proj = project(*y_new)
+            f_new = f(*y_proj)
+            # Cubic Hermite dense output between (t, y) and (t_new, y_proj).
+            while next_out < n_out and next_out * output_dt <= t_new:
+                s = (next_out * output_dt - t) / h
+                h00 = 2 * s**3 - 3 * s**2 + 1
+                h10 = s**3 - 2 * s**2 + s
+                h01 = -2 * s**3 + 3 * s**2
+                h11 = s**3 - s**2
+                yo = tuple(
+                    h00 * y[c] + h10 * h * fy[c] + h01 * y_proj[c] + h11 * h * f_new[c]
+                    for c in range(3)
+                )
+                yield (next_out * output_dt, *project(*yo))
+                next_out += 1
+            t, y, fy = t_new, y_proj, f_new
+        factor = 5.0 if err == 0.0 else min(5.0, max(0.2, 0.9 * err ** -0.2))
+        h = max(h * factor, 1e-12)
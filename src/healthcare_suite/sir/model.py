@@ -1,9 +1,17 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from itertools import chain
+from typing import TYPE_CHECKING, Optional, Tuple
 
-import pandas as pd
+import numpy as np
+
+from .. import metrics
+from .integrate import iter_sir, n_outputs
+from .summary import SIRSummary, summarize
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 @dataclass(frozen=True)
@@ -15,6 +23,14 @@ class SIRParams:
     initial_recovered: int = 0
 
 
+_SIMULATE_SECONDS = metrics.histogram(
+    "healthcare_sir_simulate_seconds", "Time to integrate one SIR scenario.", ["method"]
+)
+_STEPS = metrics.counter(
+    "healthcare_sir_steps_total", "Integration steps taken by fixed-step methods.", ["method"]
+)
+
+
 class SIRModel:
     """SIR model:
     dS/dt = -beta*S*I/N
@@ -48,32 +64,49 @@ class SIRModel:
         dR = gamma * I
         return dS, dI, dR
 
-    def simulate_euler(self, days: int, dt: float = 0.1) -> pd.DataFrame:
-        if days <= 0:
-            raise ValueError("days must be positive")
-        if dt <= 0:
-            raise ValueError("dt must be positive")
-
-        steps = int(days / dt) + 1
-        S, I, R = self.initial_state()
-        t = 0.0
-        rows: List[Dict[str, float]] = []
-
-        for _ in range(steps):
-            rows.append({"t": t, "S": S, "I": I, "R": R})
-            dS, dI, dR = self.derivatives(S, I, R)
-            S = max(0.0, S + dt * dS)
-            I = max(0.0, I + dt * dI)
-            R = max(0.0, R + dt * dR)
-
-            # enforce conservation
-            total = S + I + R
-            if total > 0:
-                scale = self.params.population / total
-                S *= scale
-                I *= scale
-                R *= scale
-
-            t += dt
-
-        return pd.DataFrame(rows)
+    def summary(self) -> SIRSummary:
+        """R0, peak size and day, and final size without simulating (see ``summarize``)."""
+        p = self.params
+        frame = summarize(p.population, p.beta, p.gamma, p.initial_infected, p.initial_recovered)
+        return SIRSummary(**{k: float(v) for k, v in frame.iloc[0].items()})
+
+    def simulate(
+        self,
+        days: int,
+        dt: float = 0.1,
+        method: str = "euler",
+        output_dt: Optional[float] = None,
+        rtol: float = 1e-6,
+        atol: float = 1e-6,
+    ) -> pd.DataFrame:
+        """Integrate with ``euler``, ``rk4`` or adaptive ``rk45`` (see ``iter_sir``).
+
+        ``output_dt`` decouples the sampling interval of the result from the internal
+        step, so a small ``dt`` does not mean a huge frame. The samples are flattened
+        into one array in a single ``np.fromiter`` pass (no per-row NumPy assignment)
+        and returned as a columnar frame with ``t, S, I, R``.
+        """
+        import pandas as pd
+        n = n_outputs(days, dt, method, output_dt)
+        samples = iter_sir(
+            self.initial_state(),
+            self.params.beta,
+            self.params.gamma,
+            float(self.params.population),
+            days,
+            dt,
+            method=method,
+            output_dt=output_dt,
+            rtol=rtol,
+            atol=atol,
+        )
+        with _SIMULATE_SECONDS.time(method):
+            y = np.fromiter(chain.from_iterable(samples), dtype=float, count=4 * n).reshape(n, 4)
+        if method != "rk45":
+            _STEPS.inc(int(days / dt), method)
+        return pd.DataFrame({"t": y[:, 0], "S": y[:, 1], "I": y[:, 2], "R": y[:, 3]})
+
+    def simulate_euler(
+        self, days: int, dt: float = 0.1, output_dt: Optional[float] = None
+    ) -> pd.DataFrame:
+        return self.simulate(days, dt, method="euler", output_dt=output_dt)
@@ -1,11 +1,33 @@
 from __future__ import annotations
 
-import matplotlib.pyplot as plt
-import pandas as pd
-import plotly.graph_objects as go
+from typing import TYPE_CHECKING, Optional, Sequence, Tuple
 
+from .downsample import downsample_lttb
 
-def plot_sir_matplotlib(df: pd.DataFrame, title: str = "SIR Simulation") -> plt.Figure:
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+    import pandas as pd
+    import plotly.graph_objects as go
+
+# Points per figure after downsampling; enough for any screen, small enough to stay responsive.
+DEFAULT_MAX_POINTS = 2000
+# Runs longer than this render with WebGL (Scattergl) instead of SVG, thinned or not.
+WEBGL_THRESHOLD = 5000
+
+
+def _thin(df: pd.DataFrame, max_points: Optional[int]) -> pd.DataFrame:
+    return df if max_points is None else downsample_lttb(df, max_points)
+
+
+def plot_sir_matplotlib(
+    df: pd.DataFrame, title: str = "SIR Simulation", max_points: Optional[int] = DEFAULT_MAX_POINTS
+) -> plt.Figure:
+    """Plot ``t, S, I, R``; longer series are LTTB-downsampled to ``max_points``.
+
+    ``max_points=None`` plots every row.
+    """
+    import matplotlib.pyplot as plt
+    df = _thin(df, max_points)
     fig = plt.figure()
     ax = fig.add_subplot(111)
     ax.plot(df["t"], df["S"], label="Susceptible")
@@ -19,10 +41,85 @@ def plot_sir_matplotlib(df: pd.DataFrame, title: str = "SIR Simulation") -> plt.
     return fig
 
 
-def plot_sir_plotly(df: pd.DataFrame, title: str = "SIR Simulation") -> go.Figure:
+def plot_sir_plotly(
+    df: pd.DataFrame,
+    title: str = "SIR Simulation",
+    max_points: Optional[int] = DEFAULT_MAX_POINTS,
+    webgl_threshold: int = WEBGL_THRESHOLD,
+) -> go.Figure:
+    """Like ``plot_sir_matplotlib``; runs over ``webgl_threshold`` rows use ``Scattergl``.
+
+    The threshold is checked against ``df`` before downsampling.
+    """
+    import plotly.graph_objects as go
+    scatter = go.Scattergl if len(df) > webgl_threshold else go.Scatter
+    df = _thin(df, max_points)
+    t = df["t"].to_numpy()
+    fig = go.Figure()
+    fig.add_trace(scatter(x=t, y=df["S"].to_numpy(), mode="lines", name="Susceptible"))
+    fig.add_trace(scatter(x=t, y=df["I"].to_numpy(), mode="lines", name="Infected"))
+    fig.add_trace(scatter(x=t, y=df["R"].to_numpy(), mode="lines", name="Recovered"))
+    fig.update_layout(title=title, xaxis_title="Time (days)", yaxis_title="People")
+    return fig
+
+_LABELS = {"S": "Susceptible", "I": "Infected", "R": "Recovered"}
+
+
+def _band_columns(bands: pd.DataFrame, compartment: str) -> Tuple[str, str, str]:
+    """``(lower, centre, upper)`` columns: outermost quantiles around the median (or mean)."""
+    prefix = f"{compartment}_q"
+    qs = sorted(c for c in bands.columns if c.startswith(prefix))
+    if len(qs) < 2:
+        raise ValueError(f"bands need at least two {compartment} quantile columns")
+    centre = f"{prefix}50" if f"{prefix}50" in bands.columns else f"{compartment}_mean"
+    return qs[0], centre, qs[-1]
+
+
+def plot_sir_bands_matplotlib(
+    bands: pd.DataFrame,
+    compartments: Sequence[str] = ("S", "I", "R"),
+    title: str = "Stochastic SIR",
+) -> plt.Figure:
+    """Shade the quantile band of each compartment from ``run_replicates(...).bands``."""
+    import matplotlib.pyplot as plt
+    fig = plt.figure()
+    ax = fig.add_subplot(111)
+    for c in compartments:
+        lower, centre, upper = _band_columns(bands, c)
+        (line,) = ax.plot(bands["t"], bands[centre], label=_LABELS.get(c, c))
+        ax.fill_between(bands["t"], bands[lower], bands[upper], color=line.get_color(), alpha=0.25)
+    ax.set_xlabel("Time (days)")
+    ax.set_ylabel("People")
+    ax.set_title(title)
+    ax.legend()
+    fig.tight_layout()
+    return fig
+
+
+def plot_sir_bands_plotly(
+    bands: pd.DataFrame,
+    compartments: Sequence[str] = ("S", "I", "R"),
+    title: str = "Stochastic SIR",
+) -> go.Figure:
+    import plotly.graph_objects as go
     fig = go.Figure()
-    fig.add_trace(go.Scatter(x=df["t"], y=df["S"], mode="lines", name="Susceptible"))
-    fig.add_trace(go.Scatter(x=df["t"], y=df["I"], mode="lines", name="Infected"))
-    fig.add_trace(go.Scatter(x=df["t"], y=df["R"], mode="lines", name="Recovered"))
+    for c in compartments:
+        lower, centre, upper = _band_columns(bands, c)
+        name = _LABELS.get(c, c)
+        fig.add_trace(
+            go.Scatter(
+                x=bands["t"], y=bands[upper], mode="lines", line_width=0,
+                showlegend=False, legendgroup=c,
+            )
+        )
+        fig.add_trace(
+            go.Scatter(
+                x=bands["t"], y=bands[lower], mode="lines", line_width=0, fill="tonexty",
+                opacity=0.25, showlegend=False, legendgroup=c, name=f"{name} ({lower}-{upper})",
+            )
+        )
+        fig.add_trace(
+            go.Scatter(x=bands["t"], y=bands[centre], mode="lines", name=name, legendgroup=c)
+        )
     fig.update_layout(title=title, xaxis_title="Time (days)", yaxis_title="People")
     return fig
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import math
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Deque, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .integrate import output_stride
+from .model import SIRModel, SIRParams
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+STOCHASTIC_METHODS = ("gillespie", "tau")
+COMPARTMENTS = ("S", "I", "R")
+_RANDOM_BLOCK = 4096
+
+
+def _output_grid(days: float, output_dt: float, method: str, tau: float) -> Tuple[int, int, int]:
+    """``(samples, steps, stride)``: tau-leaping steps of ``tau``, sampled every ``stride``."""
+    if days <= 0:
+        raise ValueError("days must be positive")
+    if method not in STOCHASTIC_METHODS:
+        raise ValueError(f"method must be one of {STOCHASTIC_METHODS}")
+    if output_dt <= 0:
+        raise ValueError("output_dt must be positive")
+    n_t = int(days / output_dt) + 1
+    if method == "gillespie":
+        return n_t, 0, 0
+    if tau <= 0:
+        raise ValueError("tau must be positive")
+    stride = output_stride(tau, output_dt)
+    return n_t, (n_t - 1) * stride + 1, stride
+
+
+def _gillespie(
+    params: SIRParams, n_t: int, output_dt: float, rng: np.random.Generator
+) -> np.ndarray:
+    """One exact (Gillespie direct method) trajectory, sampled every ``output_dt``."""
+    N = params.population
+    beta, gamma = params.beta, params.gamma
+    S = N - params.initial_infected - params.initial_recovered
+    I, R = params.initial_infected, params.initial_recovered
+    out = np.empty((n_t, 3), dtype=np.int64)
+    waits = rng.standard_exponential(_RANDOM_BLOCK)
+    draws = rng.random(_RANDOM_BLOCK)
+    used = 0
+    t = 0.0
+    k = 0
+    while k < n_t:
+        infection = beta * S * I / N
+        total = infection + gamma * I
+        if total <= 0.0:
+            break
+        if used == _RANDOM_BLOCK:
+            waits = rng.standard_exponential(_RANDOM_BLOCK)
+            draws = rng.random(_RANDOM_BLOCK)
+            used = 0
+        t += waits[used] / total
+        while k < n_t and k * output_dt < t:
+            out[k] = S, I, R
+            k += 1
+        if draws[used] * total < infection:
+            S -= 1
+            I += 1
+        else:
+            I -= 1
+            R += 1
+        used += 1
+    out[k:] = S, I, R
+    return out
+
+
+def _tau_leap(
+    params: SIRParams, n: int, steps: int, stride: int, tau: float, rng: np.random.Generator
+) -> np.ndarray:
+    """``n`` binomial tau-leaping trajectories advanced together, shape ``(n, samples, 3)``.
+
+    Each step draws ``Binomial(S, 1 - exp(-beta * I / N * tau))`` infections and
+    ``Binomial(I, 1 - exp(-gamma * tau))`` recoveries, so compartments never go negative.
+    """
+    N = params.population
+    S = np.full(n, N - params.initial_infected - params.initial_recovered, dtype=np.int64)
+    I = np.full(n, params.initial_infected, dtype=np.int64)
+    R = np.full(n, params.initial_recovered, dtype=np.int64)
+    p_recover = -math.expm1(-params.gamma * tau)
+    out = np.empty((n, (steps - 1) // stride + 1, 3), dtype=np.int64)
+    for k in range(steps):
+        if k % stride == 0:
+            out[:, k // stride] = np.stack([S, I, R], axis=1)
+            if not I.any():
+                out[:, k // stride + 1 :] = out[:, k // stride, None]
+                break
+        infections = rng.binomial(S, -np.expm1(-params.beta * tau / N * I))
+        recoveries = rng.binomial(I, p_recover)
+        S = S - infections
+        I = I + infections - recoveries
+        R = R + recoveries
+    return out
+
+
+def simulate_stochastic(
+    params: SIRParams,
+    days: int,
+    method: str = "gillespie",
+    tau: float = 0.1,
+    output_dt: float = 1.0,
+    seed: Optional[int] = None,
+) -> pd.DataFrame:
+    """One stochastic outbreak as a ``t, S, I, R`` frame of integer counts.
+
+    ``gillespie`` simulates every infection and recovery event exactly; ``tau``
+    takes binomial leaps of length ``tau`` (which must divide ``output_dt``).
+    """
+    import pandas as pd
+    SIRModel(params)
+    n_t, steps, stride = _output_grid(days, output_dt, method, tau)
+    rng = np.random.default_rng(seed)
+    if method == "gillespie":
+        y = _gillespie(params, n_t, output_dt, rng)
+    else:
+        y = _tau_leap(params, 1, steps, stride, tau, rng)[0]
+    return pd.DataFrame({"t": np.arange(n_t) * output_dt, "S": y[:, 0], "I": y[:, 1], "R": y[:, 2]})
+
+
+@dataclass
+class StochasticSummary:
+    """Quantile bands over replicates and the share of outbreaks that fizzled out.
+
+    ``bands`` has a ``t`` column and, per compartment, ``<C>_mean`` and one
+    ``<C>_q<percent>`` column per requested quantile (``I_q05``, ``I_q50``, ...).
+    """
+    bands: pd.DataFrame
+    replicates: int
+    extinctions: int
+
+    @property
+    def extinction_probability(self) -> float:
+        return self.extinctions / self.replicates if self.replicates else 0.0
+
+
+def _run_block(
+    params: SIRParams,
+    n: int,
+    seed: np.random.SeedSequence,
+    method: str,
+    tau: float,
+    output_dt: float,
+    n_t: int,
+    steps: int,
+    stride: int,
+    bins: int,
+    minor_outbreak: float,
+) -> Tuple[np.ndarray, np.ndarray, int]:
+    """Simulate ``n`` replicates and reduce them to ``(histograms, sums, extinctions)``."""
+    if method == "gillespie":
+        y = np.stack(
+            [_gillespie(params, n_t, output_dt, np.random.default_rng(s)) for s in seed.spawn(n)]
+        )
+    else:
+        y = _tau_leap(params, n, steps, stride, tau, np.random.default_rng(seed))
+    N = params.population
+    # Flat index (sample, compartment, bin) so one bincount fills every histogram.
+    cells = np.arange(n_t * 3).reshape(n_t, 3) * bins
+    index = cells + y * bins // (N + 1)
+    hist = np.bincount(index.ravel(), minlength=n_t * 3 * bins).reshape(n_t, 3, bins)
+    infected_ever = y[:, 0, 0] - y[:, -1, 0]
+    extinct = (y[:, -1, 1] == 0) & (infected_ever <= minor_outbreak * N)
+    return hist, y.sum(axis=0, dtype=float), int(extinct.sum())
+
+
+def _quantile(hist: np.ndarray, q: float, width: float) -> np.ndarray:
+    """Interpolated quantile per histogram row.
+
+    Bin ``b`` covers counts ``[b * width, (b + 1) * width)``.
+    """
+    cum = np.cumsum(hist, axis=-1)
+    # At least one replicate must fall at or below the quantile (so q=0 is the minimum).
+    target = np.maximum(q * cum[..., -1:], 1)
+    b = np.minimum((cum < target).sum(axis=-1), hist.shape[-1] - 1)
+    before = (
+        np.take_along_axis(cum, b[..., None], -1)[..., 0]
+        - np.take_along_axis(hist, b[..., None], -1)[..., 0]
+    )
+    inside = np.take_along_axis(hist, b[..., None], -1)[..., 0]
+    frac = np.where(inside > 0, (target[..., 0] - before) / np.maximum(inside, 1), 0.0)
+    return np.ceil(b * width) + frac * max(width - 1.0, 0.0)
+
+
+def run_replicates(
+    params: SIRParams,
+    days: int,
+    replicates: int = 1000,
+    method: str = "tau",
+    tau: float = 0.1,
+    output_dt: float = 1.0,
+    seed: Optional[int] = None,
+    quantiles: Sequence[float] = (0.05, 0.5, 0.95),
+    block_size: int = 256,
+    workers: Optional[int] = 1,
+    max_bins: int = 1024,
+    minor_outbreak: float = 0.1,
+) -> StochasticSummary:
+    """Run Monte Carlo replicates and stream them into quantile bands.
+
+    Replicates run in blocks of ``block_size``, fanned out to ``workers`` processes
+    (``None`` for one per CPU). Every block is reduced to per-sample histograms of
+    each compartment (exact counts when ``population < max_bins``, otherwise
+    ``max_bins`` equal-width bins) that are summed into the result, so memory does
+    not grow with ``replicates``. Block ``b`` is seeded by the ``b``-th child of
+    ``SeedSequence(seed)`` (and Gillespie replicates by children of that), so a given
+    ``seed`` and ``block_size`` reproduce the same bands on any number of workers.
+
+    An outbreak counts as extinct when no one is infected at ``days`` and at most
+    ``minor_outbreak`` of the population was ever infected.
+    """
+    import pandas as pd
+    SIRModel(params)
+    if replicates <= 0:
+        raise ValueError("replicates must be positive")
+    if block_size <= 0:
+        raise ValueError("block_size must be positive")
+    if any(not 0.0 <= q <= 1.0 for q in quantiles):
+        raise ValueError("quantiles must lie in [0, 1]")
+    n_t, steps, stride = _output_grid(days, output_dt, method, tau)
+    bins = min(params.population + 1, max_bins)
+    workers = (os.cpu_count() or 1) if workers is None else workers
+
+    sizes = [min(block_size, replicates - lo) for lo in range(0, replicates, block_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = (method, tau, output_dt, n_t, steps, stride, bins, minor_outbreak)
+    hist = np.zeros((n_t, 3, bins), dtype=np.int64)
+    sums = np.zeros((n_t, 3))
+    extinctions = 0
+
+    def merge(result: Tuple[np.ndarray, np.ndarray, int]) -> None:
+        nonlocal hist, sums, extinctions
+        hist += result[0]
+        sums += result[1]
+        extinctions += result[2]
+
+    if workers <= 1 or len(sizes) == 1:
+        for n, s in zip(sizes, seeds):
+            merge(_run_block(params, n, s, *args))
+    else:
+        pending: Deque[Future] = deque()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for n, s in zip(sizes, seeds):
+                pending.append(pool.submit(_run_block, params, n, s, *args))
+                if len(pending) >= 2 * workers:
+                    merge(pending.popleft().result())
+            while pending:
+                merge(pending.popleft().result())
+
+    width = (params.population + 1) / bins
+    bands = {"t": np.arange(n_t) * output_dt}
+    for c, name in enumerate(COMPARTMENTS):
+        bands[f"{name}_mean"] = sums[:, c] / replicates
+        for q in quantiles:
+            bands[f"{name}_q{round(q * 100):02d}"] = _quantile(hist[:, c], q, width)
+    return StochasticSummary(
+        bands=pd.DataFrame(bands), replicates=replicates, extinctions=extinctions
+    )
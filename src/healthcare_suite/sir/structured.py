@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .integrate import iter_system, n_outputs, projector
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# scipy.sparse matrices (anything with ``tocsr``), a ``(data, indices, indptr)`` CSR
+# triple, or a dense 2-D array.
+MobilityLike = Union[Any, Tuple[np.ndarray, np.ndarray, np.ndarray], np.ndarray]
+
+
+class CSRMatrix:
+    """Minimal square CSR matrix: the two products the structured model needs.
+
+    The transpose is stored as a second CSR (built once), so both products are a
+    gather plus a segmented ``np.add.reduceat`` over contiguous rows. Time and
+    memory are linear in ``nnz`` and SciPy is not required.
+    """
+
+    def __init__(self, data: np.ndarray, indices: np.ndarray, indptr: np.ndarray, n: int):
+        self.data = np.asarray(data, dtype=float)
+        self.indices = np.asarray(indices, dtype=np.intp)
+        self.indptr = np.asarray(indptr, dtype=np.intp)
+        self.n = n
+        if (
+            len(self.indptr) != n + 1
+            or self.indptr[-1] != len(self.data)
+            or len(self.indices) != len(self.data)
+        ):
+            raise ValueError("inconsistent CSR arrays")
+        if len(self.indices) and (self.indices.min() < 0 or self.indices.max() >= n):
+            raise ValueError("CSR column index out of range")
+        rows = np.repeat(np.arange(n), np.diff(self.indptr))
+        order = np.argsort(self.indices, kind="stable")
+        self._t_data = self.data[order]
+        self._t_indices = rows[order]
+        self._t_indptr = np.searchsorted(self.indices[order], np.arange(n + 1))
+
+    @classmethod
+    def from_any(cls, m: MobilityLike, n: int) -> "CSRMatrix":
+        if hasattr(m, "tocsr"):
+            m = m.tocsr()
+            if m.shape != (n, n):
+                raise ValueError(f"mobility must be {n}x{n}")
+            return cls(m.data, m.indices, m.indptr, n)
+        if isinstance(m, tuple):
+            return cls(*m, n)
+        dense = np.asarray(m, dtype=float)
+        if dense.shape != (n, n):
+            raise ValueError(f"mobility must be {n}x{n}")
+        rows, cols = np.nonzero(dense)
+        return cls(dense[rows, cols], cols, np.searchsorted(rows, np.arange(n + 1)), n)
+
+    def row_sums(self) -> np.ndarray:
+        return self._reduce(self.data[:, None], self.indptr)[:, 0]
+
+    def dot(self, x: np.ndarray) -> np.ndarray:
+        """``M @ x`` for ``x`` of shape ``(n, k)``."""
+        return self._reduce(self._gather(x, self.indices, self.data), self.indptr)
+
+    def tdot(self, x: np.ndarray) -> np.ndarray:
+        """``M.T @ x`` for ``x`` of shape ``(n, k)``."""
+        return self._reduce(self._gather(x, self._t_indices, self._t_data), self._t_indptr)
+
+    @staticmethod
+    def _gather(x: np.ndarray, index: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        values = x.take(index, axis=0)
+        values *= weights[:, None]
+        return values
+
+    def _reduce(self, values: np.ndarray, indptr: np.ndarray) -> np.ndarray:
+        out = np.zeros((self.n, values.shape[1]))
+        starts = indptr[:-1]
+        nonempty = starts < indptr[1:]
+        if nonempty.any():
+            out[nonempty] = np.add.reduceat(values, starts[nonempty], axis=0)
+        return out
+
+
+class StructuredSIRModel:
+    """SIR over regions and age groups (all compartments have shape ``(regions, groups)``):
+
+    dS/dt = -lambda * S
+    dI/dt =  lambda * S - gamma * I
+    dR/dt =  gamma * I
+
+    ``contact[g, h]`` is the daily contacts a member of group ``g`` has with group
+    ``h`` and ``beta`` the chance a contact with an infectious person transmits.
+    ``mobility[r, s]`` is the share of their time residents of region ``r`` spend in
+    region ``s``; whatever is left of each row is spent at home. Infection happens
+    where people mix, so with ``M`` the mobility matrix including time at home::
+
+        prevalence = (M.T @ I) / (M.T @ N)           # among those present in each region
+        lambda     = beta * M @ (prevalence @ contact.T)
+    """
+
+    def __init__(
+        self,
+        population: np.ndarray,
+        beta: float,
+        gamma: Union[float, np.ndarray],
+        contact: Optional[np.ndarray] = None,
+        mobility: Optional[MobilityLike] = None,
+        initial_infected: Union[float, np.ndarray] = 0.0,
+        initial_recovered: Union[float, np.ndarray] = 0.0,
+        regions: Optional[Sequence[Any]] = None,
+        groups: Optional[Sequence[Any]] = None,
+    ):
+        N = np.asarray(population, dtype=float)
+        if N.ndim == 1:
+            N = N[:, None]
+        if N.ndim != 2:
+            raise ValueError("population must have shape (regions,) or (regions, groups)")
+        n_regions, n_groups = N.shape
+        if (N <= 0).any():
+            raise ValueError("population must be positive")
+        I0 = np.broadcast_to(np.asarray(initial_infected, dtype=float), N.shape)
+        R0 = np.broadcast_to(np.asarray(initial_recovered, dtype=float), N.shape)
+        if (I0 < 0).any() or (R0 < 0).any():
+            raise ValueError("initial values must be non-negative")
+        if (I0 + R0 > N).any():
+            raise ValueError("initial states exceed population")
+        gamma = np.asarray(gamma, dtype=float)
+        if beta < 0 or (gamma < 0).any():
+            raise ValueError("beta and gamma must be non-negative")
+
+        C = np.ones((1, 1)) if contact is None else np.asarray(contact, dtype=float)
+        if C.shape != (n_groups, n_groups):
+            raise ValueError(f"contact must be {n_groups}x{n_groups}")
+        if (C < 0).any():
+            raise ValueError("contact rates must be non-negative")
+
+        self.mobility: Optional[CSRMatrix] = None
+        self._home = None
+        if mobility is not None:
+            self.mobility = CSRMatrix.from_any(mobility, n_regions)
+            if (self.mobility.data < 0).any():
+                raise ValueError("mobility must be non-negative")
+            away = self.mobility.row_sums()
+            if (away > 1 + 1e-9).any():
+                raise ValueError("mobility rows must sum to at most 1")
+            self._home = np.clip(1.0 - away, 0.0, None)[:, None]
+
+        self.population = N
+        self.beta = float(beta)
+        self.gamma = gamma
+        self.contact = C
+        self.initial_infected = I0
+        self.initial_recovered = R0
+        self.regions = list(range(n_regions)) if regions is None else list(regions)
+        self.groups = list(range(n_groups)) if groups is None else list(groups)
+        if len(self.regions) != n_regions or len(self.groups) != n_groups:
+            raise ValueError("regions/groups labels do not match the population shape")
+        self._present = self._mix_in(N)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.population.shape
+
+    def initial_state(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        S = self.population - self.initial_infected - self.initial_recovered
+        return S, self.initial_infected.copy(), self.initial_recovered.copy()
+
+    def force_of_infection(self, I: np.ndarray) -> np.ndarray:
+        present = self._present
+        prevalence = np.divide(
+            self._mix_in(I), present, out=np.zeros_like(present), where=present > 0
+        )
+        pressure = prevalence @ self.contact.T
+        if self.mobility is not None:
+            pressure = self.mobility.dot(pressure) + self._home * pressure
+        return self.beta * pressure
+
+    def derivatives(
+        self, S: np.ndarray, I: np.ndarray, R: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        infections = self.force_of_infection(I) * S
+        recoveries = self.gamma * I
+        return -infections, infections - recoveries, recoveries
+
+    def simulate(
+        self,
+        days: int,
+        dt: float = 0.1,
+        method: str = "euler",
+        output_dt: Optional[float] = None,
+        output: str = "long",
+    ) -> Union[pd.DataFrame, Tuple[np.ndarray, np.ndarray]]:
+        """Integrate like ``SIRModel.simulate``; each compartment is conserved per cell.
+
+        ``output="long"`` returns a columnar frame with ``region, group, t, S, I, R``
+        (sorted by region, group, then time); ``output="array"`` returns ``(t, y)``
+        with ``y`` of shape ``(len(t), 3, regions, groups)``.
+        """
+        import pandas as pd
+        if output not in ("long", "array"):
+            raise ValueError("output must be 'long' or 'array'")
+        n = n_outputs(days, dt, method, output_dt)
+        t = np.empty(n)
+        y = np.empty((n, 3) + self.shape)
+        samples = iter_system(
+            self.initial_state(),
+            self.derivatives,
+            projector(self.population, True),
+            days,
+            dt,
+            method,
+            output_dt,
+        )
+        for k, (tk, S, I, R) in enumerate(samples):
+            t[k] = tk
+            y[k, 0], y[k, 1], y[k, 2] = S, I, R
+        if output == "array":
+            return t, y
+
+        n_regions, n_groups = self.shape
+        # (t, compartment, region, group) -> (region, group, t) per compartment
+        cols = y.transpose(1, 2, 3, 0).reshape(3, -1)
+        return pd.DataFrame(
+            {
+                "region": np.repeat(np.asarray(self.regions), n_groups * n),
+                "group": np.tile(np.repeat(np.asarray(self.groups), n), n_regions),
+                "t": np.tile(t, n_regions * n_groups),
+                "S": cols[0],
+                "I": cols[1],
+                "R": cols[2],
+            }
+        )
+
+    def _mix_in(self, x: np.ndarray) -> np.ndarray:
+        """``M.T @ x``: how much of ``x`` is present in each region."""
+        if self.mobility is None:
+            return x
+        return self.mobility.tdot(x) + self._home * x
@@ -0,0 +1,32 @@
+from datetime import timedelta
+
+from benchmarks import generators
+from benchmarks.run import CASES, Result, compare, measure
+
+def test_generators_are_seeded(tmp_path):
+    first = generators.interaction_table(tmp_path / "a", 200, seed=3)
+    again = generators.interaction_table(tmp_path / "b", 200, seed=3)
+    assert first[0].read_text() == again[0].read_text()
+    assert first[2] == again[2] and len(set(first[2])) == 200
+    profiles = generators.polypharmacy_profiles(first[2], 20, seed=1)
+    assert profiles == generators.polypharmacy_profiles(first[2], 20, seed=1)
+    assert all(5 <= len(meds) <= 15 for meds in profiles)
+
+    reqs = generators.clinic_requests(300, seed=5)
+    assert reqs == generators.clinic_requests(300, seed=5)
+    for r in reqs:
+        r.validate()
+        assert r.requested_end - r.requested_start >= timedelta(minutes=r.duration_minutes)
+
+def test_measure_and_compare_flag_regressions(tmp_path):
+    case = next(c for c in CASES if c.name == "scheduler.interval")
+    result = measure(case, 50, 0, 2, tmp_path)
+    assert result.runs >= 2 and 0 < result.min_s <= result.median_s
+    base = {"case": case.name, "size": 50, "min_s": result.min_s, "peak_mib": result.peak_mib}
+    assert compare([result], [base]) == []
+    slow = Result(
+        case.name, 50, "requests", 5, result.median_s * 3, result.min_s * 3, result.peak_mib
+    )
+    assert len(compare([slow], [base])) == 1
+    assert compare([slow], [base], per_case={"scheduler.*": 5.0}) == []
+    assert compare([slow], []) == []
@@ -0,0 +1,39 @@
+import csv
+import json
+
+import pytest
+
+from healthcare_suite.interactions import InteractionDB, screen_extract
+
+def _db(tmp_path):
+    p = tmp_path / "i.csv"
+    p.write_text("drug_a,drug_b,severity,description\nAspirin,Warfarin,major,Bleeding\nb,c,minor,x\n")
+    return p
+
+def test_screen_extract_streams_hits(tmp_path):
+    extract = tmp_path / "extract.csv"
+    extract.write_text(
+        "patient_id,medication\nP1,warfarin\nP1,aspirin\nP2,b\nP3,b\nP3,c\nP3,aspirin\n"
+    )
+    out = tmp_path / "hits.jsonl"
+    report = screen_extract(
+        extract, InteractionDB.from_csv(_db(tmp_path)), out, batch_rows=2, workers=1
+    )
+    assert (report.rows, report.patients, report.patients_with_hits, report.hits) == (6, 3, 2, 2)
+    lines = [json.loads(line) for line in out.read_text().splitlines()]
+    assert [(r["patient_id"], r["severity"]) for r in lines] == [("P1", "major"), ("P3", "minor")]
+
+    out_csv = tmp_path / "hits.csv"
+    screen_extract(extract, _db(tmp_path), out_csv, workers=2)
+    with out_csv.open() as f:
+        assert [r["patient_id"] for r in csv.DictReader(f)] == ["P1", "P3"]
+
+def test_screen_extract_rejects_split_patient(tmp_path):
+    extract = tmp_path / "extract.csv"
+    extract.write_text("patient_id,medication\nP1,a\nP2,b\nP1,c\n")
+    with pytest.raises(ValueError):
+        screen_extract(extract, _db(tmp_path), tmp_path / "hits.jsonl", workers=1)
+    report = screen_extract(
+        extract, _db(tmp_path), tmp_path / "hits.jsonl", workers=1, check_contiguous=False
+    )
+    assert report.patients == 3
@@ -0,0 +1,90 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from healthcare_suite.cli import main
+
+HEADER = "drug_a,drug_b,severity,description\n"
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+def test_check_streams_hits_per_line(tmp_path, capsys):
+    db = tmp_path / "i.csv"
+    db.write_text(HEADER + "Aspirin,Warfarin,major,Bleeding\n")
+    lists = tmp_path / "lists.txt"
+    lists.write_text("warfarin, aspirin\n\nibuprofen\naspirin,warfarn\n")
+    assert main(["check", str(lists), "--db", str(db)]) == 0
+    out, err = capsys.readouterr()
+    assert [json.loads(line) for line in out.splitlines()] == [
+        {
+            "patient_id": "1", "a": "warfarin", "b": "aspirin", "severity": "major",
+            "description": "Bleeding",
+        }
+    ]
+    assert "line 3: unknown medication 'ibuprofen'" in err and "'warfarn'" in err
+
+    extract = tmp_path / "extract.csv"
+    extract.write_text("patient_id,medication\nA,aspirin\nA,warfarin\nB,aspirin\n")
+    assert main(["check", str(extract), "--db", str(db), "--extract", "--format", "csv"]) == 0
+    assert capsys.readouterr().out.splitlines() == [
+        "patient_id,a,b,severity,description",
+        "A,aspirin,warfarin,major,Bleeding",
+    ]
+
+def test_check_takes_the_database_from_the_environment(tmp_path, capsys, monkeypatch):
+    import pytest
+
+    monkeypatch.delenv("HEALTHCARE_INTERACTIONS_DB", raising=False)
+    lists = tmp_path / "lists.txt"
+    lists.write_text("warfarin, aspirin\n")
+    with pytest.raises(SystemExit) as exc:
+        main(["check", str(lists)])
+    assert exc.value.code == 2 and "HEALTHCARE_INTERACTIONS_DB" in capsys.readouterr().err
+
+    db = tmp_path / "i.csv"
+    db.write_text(HEADER + "Aspirin,Warfarin,major,Bleeding\n")
+    monkeypatch.setenv("HEALTHCARE_INTERACTIONS_DB", str(db))
+    assert main(["check", str(lists), "--format", "csv"]) == 0
+    assert capsys.readouterr().out.splitlines()[1] == "1,warfarin,aspirin,major,Bleeding"
+
+def test_check_does_not_import_numpy_or_pandas(tmp_path):
+    db = tmp_path / "i.csv"
+    db.write_text(HEADER + "Aspirin,Warfarin,major,Bleeding\n")
+    code = (
+        "import sys; from healthcare_suite.cli import main; "
+        f"main(['check', '--db', {str(db)!r}]); "
+        "sys.stdout.write(str(sorted({'numpy', 'pandas'} & set(sys.modules))))"
+    )
+    env = {**os.environ, "PYTHONPATH": str(SRC)}
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        input="aspirin, warfarin\n",
+        capture_output=True,
+        text=True,
+        env=env,
+        check=False,
+    )
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.endswith("[]")
+
+def test_simulate_and_schedule_write_csv(tmp_path, capsys):
+    args = "--population 1000 --beta 0.3 --gamma 0.1 --days 2 --dt 0.5".split()
+    assert main(["simulate", *args]) == 0
+    rows = capsys.readouterr().out.splitlines()
+    assert rows[0] == "t,S,I,R" and len(rows) == 6 and rows[1] == "0,999.000000,1.000000,0.000000"
+
+    requests = tmp_path / "requests.csv"
+    requests.write_text(
+        "patient_id,requested_start,requested_end,duration_minutes,priority\n"
+        "P1,2026-01-12T09:00,2026-01-12T09:30,30,routine\n"
+        "P2,2026-01-12T09:00,2026-01-12T09:30,30,ROUTINE\n"
+        "P3,2026-01-12T09:00,2026-01-12T09:30,30,\n"
+    )
+    assert main(["schedule", str(requests), "--provider", "D1", "--provider", "D2"]) == 0
+    assert capsys.readouterr().out.splitlines() == [
+        "patient_id,provider_id,start,end,priority,status",
+        "P1,D1,2026-01-12T09:00:00,2026-01-12T09:30:00,ROUTINE,booked",
+        "P2,D2,2026-01-12T09:00:00,2026-01-12T09:30:00,ROUTINE,booked",
+        "P3,,,,ROUTINE,rejected",
+    ]
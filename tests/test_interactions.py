@@ -1,4 +1,4 @@
-from healthcare_suite.interactions import InteractionDB
+from healthcare_suite.interactions import InteractionDB, MedProfile
 
 def test_interaction_found(tmp_path):
     csv = tmp_path / "i.csv"
@@ -14,3 +14,113 @@ def test_interaction_none(tmp_path):
     db = InteractionDB.from_csv(csv)
     hits = db.check_list(["c", "d"])
     assert hits == []
+
+def test_check_many_matches_check_list(tmp_path):
+    csv = tmp_path / "i.csv"
+    csv.write_text(
+        "drug_a,drug_b,severity,description\n"
+        "Aspirin,Warfarin,major,Bleeding\n"
+        "warfarin,amiodarone,moderate,INR\n"
+        "b,c,minor,x\n"
+    )
+    db = InteractionDB.from_csv(csv)
+    profiles = [["Warfarin", "aspirin", "Amiodarone", "b"], ["c", "b", "b"], []]
+    batched = db.check_many(profiles)
+    assert batched == [db.check_list(p) for p in profiles]
+    assert [(h.a, h.b, h.severity) for h in batched[0]] == [
+        ("Warfarin", "aspirin", "major"),
+        ("Warfarin", "Amiodarone", "moderate"),
+    ]
+    assert [(h.a, h.b) for h in batched[1]] == [("c", "b")]
+
+def test_snapshot_round_trip(tmp_path):
+    csv = tmp_path / "i.csv"
+    csv.write_text(
+        "drug_a,drug_b,severity,description\n"
+        "Aspirin,Warfarin,major,Bleeding\n"
+        "warfarin,amiodarone,moderate,INR\n"
+        "Ibuprofen,aspirin,minor,GI upset\n"
+    )
+    out = InteractionDB.compile(csv, tmp_path / "i.idb")
+    db = InteractionDB.from_csv(csv)
+    with InteractionDB.open_snapshot(out) as snap:
+        assert len(snap) == len(db) == 3
+        meds = ["warfarin", "ASPIRIN", "amiodarone", "ibuprofen", "unknown"]
+        assert snap.check_list(meds) == db.check_list(meds)
+        assert snap.get("warfarin", "aspirin") == db.get("aspirin", "warfarin")
+    assert type(InteractionDB.load(out)).__name__ == "InteractionSnapshot"
+    assert isinstance(InteractionDB.load(csv), InteractionDB)
+
+def test_aliases_and_class_expansion(tmp_path):
+    csv = tmp_path / "i.csv"
+    csv.write_text(
+        "drug_a,drug_b,severity,description\n"
+        "simvastatin,clarithromycin,major,specific\n"
+        "macrolides,statins,moderate,class-level\n"
+    )
+    aliases = tmp_path / "a.csv"
+    aliases.write_text(
+        "name,target,kind\n"
+        "Zocor,simvastatin,brand\n"
+        "biaxin,clarithromycin,brand\n"
+        "macrolides,clarithromycin,class\n"
+        "macrolides,erythromycin,class\n"
+        "statins,simvastatin,class\n"
+        "statins,atorvastatin,class\n"
+    )
+    db = InteractionDB.from_csv(csv, aliases=aliases)
+    assert len(db) == 4
+    hits = db.check_list(["Zocor", "Biaxin", "erythromycin"])
+    assert [(h.a, h.b, h.description) for h in hits] == [
+        ("Zocor", "Biaxin", "specific"),
+        ("Zocor", "erythromycin", "class-level"),
+    ]
+    snap = InteractionDB.open_snapshot(
+        InteractionDB.compile(csv, tmp_path / "i.idb", aliases=aliases)
+    )
+    assert snap.check_list(["Zocor", "Biaxin", "erythromycin"]) == hits
+
+def test_med_profile_returns_delta_hits(tmp_path):
+    csv = tmp_path / "i.csv"
+    csv.write_text(
+        "drug_a,drug_b,severity,description\n"
+        "Aspirin,Warfarin,major,Bleeding\n"
+        "warfarin,amiodarone,moderate,INR\n"
+        "aspirin,ibuprofen,minor,GI\n"
+    )
+    db = InteractionDB.from_csv(csv)
+    profile = MedProfile(db, ["warfarin", "metformin"])
+    assert profile.hits() == [] and profile.unresolved == ["metformin"]
+
+    added = profile.add("Aspirin")
+    assert [(h.a, h.b) for h in added] == [("warfarin", "Aspirin")]
+    assert [h.severity for h in profile.add("amiodarone")] == ["moderate"]
+    assert profile.add("aspirin") == []
+    assert profile.hits() == db.check_list(profile.meds)
+
+    removed = profile.remove("WARFARIN")
+    assert [h.severity for h in removed] == ["major", "moderate"]
+    assert profile.hits() == []
+    assert [h.severity for h in profile.add("ibuprofen")] == ["minor"]
+
+def test_unresolved_names_get_suggestions(tmp_path):
+    csv = tmp_path / "i.csv"
+    csv.write_text("drug_a,drug_b,severity,description\nAspirin,Warfarin,major,Bleeding\n")
+    db = InteractionDB.from_csv(csv)
+    result = db.check_list(["Warfarine", "aspirin", "zzz"])
+    assert result == []
+    assert [(u.name, u.suggestions) for u in result.unresolved] == [
+        ("Warfarine", ("warfarin",)),
+        ("zzz", ()),
+    ]
+    assert db.check_many([["warfarine"]])[0].unresolved[0].suggestions == ()
+
+def test_fuzzy_resolver_ranks_by_edit_distance():
+    from healthcare_suite.interactions.fuzzy import FuzzyResolver, bounded_levenshtein
+
+    assert bounded_levenshtein("kitten", "sitting", 3) == 3
+    assert bounded_levenshtein("kitten", "sitting", 2) is None
+    fr = FuzzyResolver(["warfarin", "warfarinx", "amiodarone", "war"])
+    assert fr.suggest("warfarine") == ["warfarin", "warfarinx"]
+    assert fr.suggest("warfarine", max_distance=1, limit=1) == ["warfarin"]
+    assert fr.suggest("wa") == []
@@ -20,3 +20,31 @@ def test_plot_helpers_return_figures():
     assert hasattr(fig1, "savefig")
     fig2 = plot_sir_plotly(df, title="x")
     assert fig2.to_dict()["layout"]["title"]["text"] == "x"
+
+def test_band_plot_helpers_return_figures():
+    from healthcare_suite.sir.plots import plot_sir_bands_matplotlib, plot_sir_bands_plotly
+
+    bands = pd.DataFrame(
+        {"t": [0, 1], "I_mean": [1, 2], "I_q05": [1, 1], "I_q50": [1, 2], "I_q95": [1, 4]}
+    )
+    assert hasattr(plot_sir_bands_matplotlib(bands, compartments=("I",)), "savefig")
+    fig = plot_sir_bands_plotly(bands, compartments=("I",), title="x")
+    assert len(fig.data) == 3 and fig.to_dict()["layout"]["title"]["text"] == "x"
+
+def test_plot_helpers_downsample_long_series():
+    import numpy as np
+
+    from healthcare_suite.sir.downsample import lttb_indices
+
+    t = np.arange(20001) * 0.01
+    df = pd.DataFrame({"t": t, "S": 100 - t, "I": np.exp(-(((t - 123.45) / 0.05) ** 2)), "R": t})
+    fig = plot_sir_plotly(df, max_points=600)
+    assert all(len(trace.x) <= 600 for trace in fig.data)
+    # A spike far narrower than the thinned spacing survives downsampling.
+    assert max(fig.data[1].y) > 0.5
+    assert plot_sir_plotly(df, max_points=None).data[0].type == "scattergl"
+    default = plot_sir_plotly(df)
+    assert len(default.data[0].x) <= 2000 and default.data[0].type == "scattergl"
+    assert plot_sir_plotly(df.iloc[:5000]).data[0].type == "scatter"
+    keep = lttb_indices(t, df["I"].to_numpy(), 50)
+    assert len(keep) == 50 and keep[0] == 0 and keep[-1] == len(t) - 1
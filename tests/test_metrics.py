@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from healthcare_suite import metrics
+
+HEADER = "drug_a,drug_b,severity,description\n"
+
+@pytest.fixture
+def collecting():
+    metrics.enable()
+    metrics.REGISTRY.clear()
+    try:
+        yield metrics.REGISTRY
+    finally:
+        metrics.enable(False)
+        metrics.REGISTRY.clear()
+
+def test_registry_renders_prometheus_text(collecting):
+    registry = metrics.MetricsRegistry()
+    hits = registry.counter("demo_hits_total", "Hits.", ["kind"])
+    latency = registry.histogram("demo_seconds", "Latency.", buckets=(0.1, 1.0))
+    hits.inc(2, 'a"b')
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(5)
+    assert registry.render().splitlines() == [
+        "# HELP demo_hits_total Hits.",
+        "# TYPE demo_hits_total counter",
+        'demo_hits_total{kind="a\\"b"} 2',
+        "# HELP demo_seconds Latency.",
+        "# TYPE demo_seconds histogram",
+        'demo_seconds_bucket{le="0.1"} 1',
+        'demo_seconds_bucket{le="1"} 2',
+        'demo_seconds_bucket{le="+Inf"} 3',
+        "demo_seconds_sum 5.55",
+        "demo_seconds_count 3",
+    ]
+    assert registry.counter("demo_hits_total", "Hits.", ["kind"]) is hits
+    with pytest.raises(ValueError):
+        registry.histogram("demo_hits_total", "Hits.", ["kind"])
+    total = registry.histogram("demo_total_seconds", "Total.", buckets=(1.0,))
+    total.observe(float("-inf"))
+    assert "demo_total_seconds_sum -Inf" in registry.render()
+    total.observe(float("inf"))
+    assert "demo_total_seconds_sum NaN" in registry.render()
+
+def test_disabled_metrics_record_nothing():
+    registry = metrics.MetricsRegistry()
+    hits = registry.counter("demo_total", "Hits.")
+    latency = registry.histogram("demo_seconds", "Latency.")
+    assert not metrics.enabled()
+    hits.inc()
+    with latency.time():
+        pass
+    assert hits.value() == 0 and latency.count() == 0
+
+def test_hot_paths_are_instrumented(collecting, tmp_path):
+    from healthcare_suite.interactions import InteractionDB
+    from healthcare_suite.scheduler import DoctorCalendar, SlotGridCalendar
+    from healthcare_suite.sir import SIRModel, SIRParams
+
+    csv = tmp_path / "i.csv"
+    csv.write_text(HEADER + "Aspirin,Warfarin,major,Bleeding\n")
+    db = InteractionDB.from_csv(csv)
+    db.check_many([["aspirin", "warfarin", "ibuprofen"], ["aspirin"]])
+    SIRModel(SIRParams(1000, 0.3, 0.1)).simulate(10, dt=0.5, method="rk4")
+    day = datetime(2026, 1, 12, 8)
+    for cls in (DoctorCalendar, SlotGridCalendar):
+        cls(day, day + timedelta(hours=8), 5).find_first_fit(
+            day, day + timedelta(hours=1), timedelta(minutes=30)
+        )
+
+    assert collecting.get("healthcare_interactions_load_seconds").count() == 1
+    assert collecting.get("healthcare_interactions_pairs_checked_total").value() == 1
+    assert collecting.get("healthcare_interactions_hits_total").value() == 1
+    assert collecting.get("healthcare_sir_steps_total").value("rk4") == 20
+    assert collecting.get("healthcare_scheduler_slots_probed_total").value("interval") == 1
+    assert collecting.get("healthcare_scheduler_slots_probed_total").value("slotgrid") == 7
+    assert collecting.get("healthcare_scheduler_first_fit_seconds").count("slotgrid") == 1
+    assert "healthcare_sir_simulate_seconds_count{method=\"rk4\"} 1" in metrics.render()
+
+def test_sampling_profiler_writes_collapsed_stacks(tmp_path):
+    import time
+
+    from healthcare_suite.profiling import SamplingProfiler, profile_path
+
+    def busy(seconds):
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            pass
+
+    with SamplingProfiler(interval=0.001) as profiler:
+        busy(0.05)
+    assert profiler.samples > 0
+    assert any("busy (test_metrics.py" in stack for stack in profiler.stacks)
+    path = profiler.dump(profile_path(tmp_path / "profiles", "sir/simulate", 0.25))
+    assert path.name.endswith("-sir_simulate-250ms.collapsed")
+    assert path.read_text().splitlines()[0].rsplit(" ", 1)[1].isdigit()
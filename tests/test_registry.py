@@ -0,0 +1,38 @@
+import os
+
+from healthcare_suite.interactions import InteractionRegistry
+
+HEADER = "drug_a,drug_b,severity,description\n"
+
+def test_registry_caches_and_memoizes(tmp_path):
+    csv = tmp_path / "i.csv"
+    csv.write_text(HEADER + "Aspirin,Warfarin,major,Bleeding\n")
+    reg = InteractionRegistry()
+    assert reg.get(csv) is reg.get(csv)
+    assert (reg.stats.misses, reg.stats.hits) == (1, 1)
+
+    first = reg.check(csv, ["warfarin", "aspirin"])
+    again = reg.check(csv, ["Warfarin", " ASPIRIN"])
+    assert reg.stats.memo_hits == 1
+    assert first[0].severity == again[0].severity == "major"
+    assert (again[0].a, again[0].b) == ("Warfarin", " ASPIRIN")
+    # The memo must not leak the first caller's order into the hits.
+    swapped = reg.check(csv, ["aspirin", "warfarin"])
+    assert (swapped[0].a, swapped[0].b) == ("aspirin", "warfarin")
+    assert swapped == reg.get(csv).check_list(["aspirin", "warfarin"])
+
+def test_registry_reloads_changed_file_and_evicts(tmp_path):
+    csv = tmp_path / "i.csv"
+    csv.write_text(HEADER + "a,b,minor,x\n")
+    reg = InteractionRegistry(max_databases=1, background=False)
+    assert reg.check(csv, ["a", "b"])[0].severity == "minor"
+
+    csv.write_text(HEADER + "a,b,major,changed\n")
+    os.utime(csv, ns=(0, os.stat(csv).st_mtime_ns + 1_000_000))
+    assert reg.check(csv, ["a", "b"])[0].severity == "major"
+    assert reg.stats.reloads == 1
+
+    other = tmp_path / "j.csv"
+    other.write_text(HEADER + "c,d,minor,y\n")
+    reg.get(other)
+    assert len(reg) == 1 and reg.stats.evictions == 1
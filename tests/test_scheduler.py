@@ -21,3 +21,254 @@ def test_emergency_can_preempt():
     res = schedule_requests(cal, [routine, emergency])
     assert any(a.patient_id == "pE" for a in res.confirmed)
     assert len(res.preempted) == 1
+
+def test_calendar_index_gaps_and_first_fit():
+    from datetime import timedelta
+
+    from healthcare_suite.scheduler import ConfirmedAppointment
+
+    cal = DoctorCalendar(open_time=dt(9,0), close_time=dt(12,0), slot_minutes=5)
+    booked = [(dt(10,0), dt(10,30)), (dt(9,0), dt(9,20)), (dt(9,30), dt(9,50))]
+    for i, (s, e) in enumerate(booked):
+        cal.add_appointment(ConfirmedAppointment(f"p{i}", s, e, Priority.ROUTINE))
+    assert [a.start for a in cal.appointments] == [dt(9,0), dt(9,30), dt(10,0)]
+    assert cal.overlaps_existing(dt(9,10), dt(10,5)).patient_id == "p1"
+    assert cal.overlaps_existing(dt(9,20), dt(9,30)) is None
+    assert cal.free_gaps() == [(dt(9,20), dt(9,30)), (dt(9,50), dt(10,0)), (dt(10,30), dt(12,0))]
+    assert cal.free_gaps(dt(9,25), dt(11,0)) == [
+        (dt(9,25), dt(9,30)), (dt(9,50), dt(10,0)), (dt(10,30), dt(11,0))
+    ]
+    assert cal.find_first_fit(dt(9,0), dt(12,0), timedelta(minutes=10)) == (dt(9,20), dt(9,30))
+    assert cal.find_first_fit(dt(9,0), dt(12,0), timedelta(minutes=15)) == (dt(10,30), dt(10,45))
+    fit = cal.find_first_fit(dt(9,0), dt(12,0), timedelta(minutes=15), step_minutes=20)
+    assert fit == (dt(10,40), dt(10,55))
+    assert cal.find_first_fit(dt(9,0), dt(10,40), timedelta(minutes=15)) is None
+    cal.remove_appointment(cal.appointments[1])
+    assert cal.find_first_fit(dt(9,0), dt(12,0), timedelta(minutes=15)) == (dt(9,20), dt(9,35))
+
+def test_slot_grid_calendar_matches_interval_calendar():
+    from datetime import timedelta
+
+    from healthcare_suite.scheduler import ConfirmedAppointment, SlotGridCalendar
+
+    reqs = [
+        AppointmentRequest("p1", dt(9,0), dt(12,0), duration_minutes=30, priority=Priority.ROUTINE),
+        AppointmentRequest("p2", dt(9,10), dt(12,0), duration_minutes=20, priority=Priority.URGENT),
+        AppointmentRequest("p3", dt(9,0), dt(9,45), duration_minutes=30, priority=Priority.ROUTINE),
+        AppointmentRequest(
+            "pE", dt(9,0), dt(9,30), duration_minutes=30, priority=Priority.EMERGENCY
+        ),
+    ]
+    grid = SlotGridCalendar(open_time=dt(9,0), close_time=dt(12,0), slot_minutes=5)
+    interval = DoctorCalendar(dt(9,0), dt(12,0), 5)
+    assert schedule_requests(grid, reqs) == schedule_requests(interval, reqs)
+    assert [a.patient_id for a in grid.appointments] == ["pE", "p2"]
+
+    grid.add_appointment(ConfirmedAppointment("p4", dt(10,30), dt(11,0), Priority.ROUTINE))
+    assert grid.overlaps_existing(dt(10,55), dt(11,30)).patient_id == "p4"
+    assert grid.available_slots(dt(9,0), dt(12,0), timedelta(minutes=30), step_minutes=15) == [
+        (dt(10,0), dt(10,30)), (dt(11,0), dt(11,30)), (dt(11,15), dt(11,45)), (dt(11,30), dt(12,0)),
+    ]
+    assert grid.find_first_fit(dt(9,0), dt(12,0), timedelta(minutes=45)) == (dt(11,0), dt(11,45))
+    assert grid.find_first_fit(dt(9,0), dt(11,30), timedelta(minutes=45)) is None
+    bumped = grid.preempt_if_needed(dt(10,0), dt(11,0), Priority.URGENT)
+    assert [a.patient_id for a in bumped] == ["p4"]
+    assert grid.find_first_fit(dt(9,0), dt(12,0), timedelta(minutes=45)) == (dt(9,50), dt(10,35))
+
+def test_clinic_scheduler_routes_to_earliest_provider():
+    from datetime import date, datetime as datetime_, time
+
+    from healthcare_suite.scheduler import ClinicScheduler, working_days
+
+    clinic = ClinicScheduler()
+    # Tuesday and Wednesday, 09:00-10:00
+    days = dict(first_day=date(2026, 1, 13), days=2, open_at=time(9, 0), close_at=time(10, 0))
+    clinic.add_provider("gp1", working_days(**days), specialty="gp")
+    clinic.add_provider("gp2", working_days(**days), specialty="gp", room="r2")
+    clinic.add_provider("cardio", working_days(**days), specialty="cardiology")
+    assert [p.provider_id for p in clinic.providers(specialty="gp")] == ["gp1", "gp2"]
+    assert [p.provider_id for p in clinic.providers(room="r2")] == ["gp2"]
+
+    def wed(h, m):
+        return datetime_(2026, 1, 14, h, m)
+
+    reqs = [
+        AppointmentRequest("a", dt(9,0), wed(10,0), duration_minutes=60, specialty="gp"),
+        AppointmentRequest("b", dt(9,0), wed(10,0), duration_minutes=30, specialty="gp"),
+        AppointmentRequest("c", dt(9,0), wed(10,0), duration_minutes=60, specialty="gp"),
+        AppointmentRequest("d", dt(9,45), wed(10,0), duration_minutes=30, specialty="cardiology"),
+        AppointmentRequest("e", dt(9,0), dt(10,0), duration_minutes=60, specialty="gp"),
+        AppointmentRequest("f", dt(9,0), dt(10,0), duration_minutes=15),
+        AppointmentRequest(
+            "g", dt(9,0), dt(9,30), duration_minutes=30, priority=Priority.EMERGENCY, specialty="gp"
+        ),
+    ]
+    res = clinic.schedule(reqs)
+    booked = {a.patient_id: (a.provider_id, a.start) for a in res.confirmed}
+    assert booked["a"] == ("gp1", dt(9,0))
+    assert booked["b"] == ("gp2", dt(9,0))
+    assert booked["c"] == ("gp1", wed(9,0))
+    assert booked["d"] == ("cardio", wed(9,0))
+    assert booked["f"] == ("cardio", dt(9,0))
+    assert booked["g"] == ("gp1", dt(9,0))
+    assert [r.patient_id for r in res.rejected] == ["e"]
+    assert [a.patient_id for a in res.preempted] == ["a"]
+
+    util = clinic.utilisation().set_index("provider_id")
+    assert util.loc["gp1", "appointments"] == 2
+    assert util.loc["gp1", "utilisation"] == 0.75
+    assert util.loc["cardio", "booked_minutes"] == 45
+    assert util.loc["gp2", "open_minutes"] == 120
+
+    # An after-hours emergency must not preempt the next morning, outside its window.
+    late = AppointmentRequest(
+        "h", dt(10,0), dt(11,0), duration_minutes=30, priority=Priority.EMERGENCY, specialty="gp"
+    )
+    res = clinic.schedule([late])
+    assert [r.patient_id for r in res.rejected] == ["h"] and res.preempted == []
+    assert clinic.provider("gp1").calendars[1].appointments[0].patient_id == "c"
+
+def test_optimize_schedule_beats_greedy_order():
+    from healthcare_suite.scheduler import ConfirmedAppointment, optimize_schedule
+
+    reqs = [
+        AppointmentRequest("flexible", dt(9,0), dt(10,0), duration_minutes=30),
+        AppointmentRequest("early", dt(9,0), dt(9,45), duration_minutes=30),
+        AppointmentRequest("tight", dt(9,15), dt(9,45), duration_minutes=30),
+    ]
+    greedy = schedule_requests(DoctorCalendar(dt(9,0), dt(10,0)), reqs)
+    assert len(greedy.confirmed) == 1
+
+    cal = DoctorCalendar(dt(9,0), dt(10,0))
+    res = optimize_schedule(cal, reqs)
+    assert [(a.patient_id, a.start) for a in res.confirmed] == [
+        ("early", dt(9,0)), ("flexible", dt(9,30))
+    ]
+    assert [r.patient_id for r in res.rejected] == ["tight"]
+    assert cal.appointments == res.confirmed
+    assert (res.report.greedy_score, res.report.score, res.report.max_score) == (1, 2, 3)
+    assert res.report.moves == 1 and not res.report.timed_out
+
+    cal = DoctorCalendar(dt(9,0), dt(10,0))
+    cal.add_appointment(ConfirmedAppointment("booked", dt(9,0), dt(10,0), Priority.ROUTINE))
+    emergency = AppointmentRequest(
+        "pE", dt(9,0), dt(9,30), duration_minutes=30, priority=Priority.EMERGENCY
+    )
+    res = optimize_schedule(cal, reqs + [emergency], time_budget=0)
+    assert res.report.timed_out and res.report.iterations == 0
+    assert [a.patient_id for a in res.confirmed] == ["pE"]
+    assert [a.patient_id for a in res.preempted] == ["booked"]
+    assert res.report.score == 100
+
+def test_emergency_preemption_rebooks_with_bounded_cascade():
+    from healthcare_suite.scheduler import ConfirmedAppointment, SlotGridCalendar
+
+    def booked_day(calendar_cls):
+        # Free: 09:45-10:00 and 11:00-11:15, too short for a 30 minute appointment.
+        cal = calendar_cls(open_time=dt(9,0), close_time=dt(11,15), slot_minutes=5)
+        for pid, start, end, priority in [
+            ("u1", dt(9,0), dt(9,30), Priority.URGENT),
+            ("r1", dt(9,30), dt(9,45), Priority.ROUTINE),
+            ("u2", dt(10,0), dt(10,30), Priority.URGENT),
+            ("r2", dt(10,30), dt(11,0), Priority.ROUTINE),
+        ]:
+            cal.add_appointment(ConfirmedAppointment(pid, start, end, priority))
+        return cal
+
+    emergency = AppointmentRequest(
+        "pE", dt(9,0), dt(9,30), duration_minutes=30, priority=Priority.EMERGENCY
+    )
+    for calendar_cls in (DoctorCalendar, SlotGridCalendar):
+        cal = booked_day(calendar_cls)
+        res = schedule_requests(cal, [emergency], rebook=True)
+        # u1 bumps r1 (closer than bumping r2), and r1 takes the free 11:00 slot.
+        assert [(old.patient_id, new.start) for old, new in res.rebooked] == [
+            ("u1", dt(9,30)), ("r1", dt(11,0))
+        ]
+        assert [a.patient_id for a in res.preempted] == ["u1", "r1"]
+        assert [a.patient_id for a in cal.appointments] == ["pE", "u1", "u2", "r2", "r1"]
+
+    cal = booked_day(DoctorCalendar)
+    res = schedule_requests(cal, [emergency], rebook=True, max_cascade_depth=0)
+    assert res.rebooked == []
+    assert [a.patient_id for a in res.preempted] == ["u1"]
+
+    cal = booked_day(DoctorCalendar)
+    res = schedule_requests(cal, [emergency], rebook=True, max_work=1)
+    assert [(old.patient_id, new.start) for old, new in res.rebooked] == [("u1", dt(9,30))]
+    assert [a.patient_id for a in res.preempted] == ["u1", "r1"]
+    assert "r1" not in [a.patient_id for a in cal.appointments]
+
+    assert schedule_requests(booked_day(DoctorCalendar), [emergency]).rebooked == []
+
+def test_rebook_follows_an_appointment_bumped_twice():
+    from healthcare_suite.scheduler import (
+        ConfirmedAppointment,
+        SlotGridCalendar,
+        rebook_appointments,
+    )
+
+    for calendar_cls in (DoctorCalendar, SlotGridCalendar):
+        cal = calendar_cls(open_time=dt(9,0), close_time=dt(10,30), slot_minutes=15)
+        for pid, start, end, priority in [
+            ("r", dt(9,0), dt(9,30), Priority.ROUTINE),
+            ("e1", dt(9,30), dt(9,45), Priority.EMERGENCY),
+            ("e2", dt(9,45), dt(10,15), Priority.EMERGENCY),
+            ("e3", dt(10,15), dt(10,30), Priority.EMERGENCY),
+        ]:
+            cal.add_appointment(ConfirmedAppointment(pid, start, end, priority))
+        u = ConfirmedAppointment("u", dt(10,15), dt(10,30), Priority.URGENT)
+        e = ConfirmedAppointment("e", dt(9,45), dt(10,15), Priority.EMERGENCY)
+        # u moves to 09:15 (bumping r), then e takes 09:00-09:30 and bumps u again.
+        out = rebook_appointments(cal, [u, e], max_cascade_depth=2)
+        assert [(old.patient_id, new.start) for old, new in out.rebooked] == [("e", dt(9,0))]
+        assert [(a.patient_id, a.start) for a in out.displaced] == [("r", dt(9,0)), ("u", dt(9,15))]
+        assert out.unplaced == [ConfirmedAppointment("r", dt(9,0), dt(9,30), Priority.ROUTINE), u]
+        assert all(new in cal.appointments for _, new in out.rebooked)
+
+def test_sqlite_store_books_atomically_across_threads(tmp_path):
+    import threading
+    from datetime import timedelta
+
+    import pytest
+
+    from healthcare_suite.scheduler import (
+        BookingConflict,
+        ConfirmedAppointment,
+        SQLiteCalendarStore,
+    )
+
+    store = SQLiteCalendarStore(str(tmp_path / "calendar.db"))
+    store.add(ConfirmedAppointment("p0", dt(8,30), dt(9,15), Priority.ROUTINE, provider_id="d1"))
+    with pytest.raises(BookingConflict):
+        store.add(ConfirmedAppointment("p1", dt(9,0), dt(9,30), Priority.ROUTINE, provider_id="d1"))
+    store.add(ConfirmedAppointment("p1", dt(9,0), dt(9,30), Priority.ROUTINE, provider_id="d2"))
+
+    # The appointment straddling the window start is found and clipped.
+    assert [a.patient_id for a in store.appointments("d1", dt(9,0), dt(12,0))] == ["p0"]
+    assert store.calendar("d1", dt(9,0), dt(10,0)).appointments[0].start == dt(9,0)
+    assert store.availability("d1", dt(9,0), dt(10,0), timedelta(minutes=30), 15) == [
+        (dt(9,15), dt(9,45)),
+        (dt(9,30), dt(10,0)),
+    ]
+
+    # Eight workers race for two 30-minute slots: exactly two get one.
+    barrier = threading.Barrier(8)
+    booked = []
+
+    def worker(n):
+        barrier.wait()
+        req = AppointmentRequest(f"r{n}", dt(9,0), dt(10,15), 30)
+        appt = store.book("d1", req)
+        if appt is not None:
+            booked.append(appt)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(a.start for a in booked) == [dt(9,15), dt(9,45)]
+    assert store.count() == 4
+    assert store.cancel(booked[0])
+    assert store.count() == 3
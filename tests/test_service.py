@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+
+from healthcare_suite.service import (
+    Coalescer,
+    ConcurrencyLimit,
+    Overloaded,
+    RequestError,
+    check_interactions_batch,
+    run_sir,
+    sir_query,
+)
+
+HEADER = "drug_a,drug_b,severity,description\n"
+
+def test_coalescer_shares_in_flight_work_and_limit_rejects():
+    async def scenario():
+        coalescer = Coalescer()
+        limit = ConcurrencyLimit(1, retry_after=0.2)
+        calls = []
+        gate = asyncio.Event()
+
+        async def work(tag):
+            calls.append(tag)
+            await gate.wait()
+            return tag
+
+        first = asyncio.ensure_future(coalescer.run("a", lambda: work("a"), limit))
+        second = asyncio.ensure_future(coalescer.run("a", lambda: work("a again"), limit))
+        await asyncio.sleep(0)
+        with pytest.raises(Overloaded) as excinfo:
+            await coalescer.run("b", lambda: work("b"), limit)
+        assert excinfo.value.retry_after_header == "1"
+        gate.set()
+        assert await asyncio.gather(first, second) == ["a", "a"]
+        assert calls == ["a"]
+        counts = (coalescer.started, coalescer.joined, limit.in_flight, limit.rejected)
+        assert counts == (1, 1, 0, 1)
+        assert len(coalescer) == 0
+        assert await coalescer.run("b", lambda: work("b"), limit) == "b"
+
+    asyncio.run(scenario())
+
+def test_check_batch_keeps_order_and_validates(tmp_path):
+    csv = tmp_path / "i.csv"
+    csv.write_text(HEADER + "Aspirin,Warfarin,major,Bleeding\n")
+    out = check_interactions_batch(
+        {
+            "lists": [["warfarin", "aspirin"], ["aspirin"], ["warfarn"]],
+            "db_path": str(csv),
+        }
+    )
+    assert out["count"] == 3
+    assert [r["count"] for r in out["results"]] == [1, 0, 0]
+    assert out["results"][2]["unresolved"][0]["name"] == "warfarn"
+    with pytest.raises(RequestError):
+        check_interactions_batch({"lists": ["aspirin"], "db_path": str(csv)})
+    with pytest.raises(RequestError):
+        check_interactions_batch({"lists": [[1, "warfarin"]], "db_path": str(csv)})
+
+def test_sir_query_is_hashable_and_runs():
+    payload = {"population": 1000, "beta": 0.3, "gamma": 0.1, "days": 10, "format": "binary"}
+    query = sir_query(payload)
+    assert query == sir_query(dict(payload))
+    assert hash(query) == hash(sir_query(dict(payload)))
+    body, headers = run_sir(query)
+    assert len(body) == int(headers["X-SIR-Rows"]) * 4 * 8
+    for bad in ({"population": 1000, "beta": 0.3}, {"population": 0, "beta": 0.3, "gamma": 0.1}):
+        with pytest.raises(RequestError):
+            sir_query(bad)
+
+@pytest.mark.parametrize(
+    "field, value, message",
+    [
+        ("method", "midpoint", "method must be one of"),
+        ("max_points", 1, "max_points must be at least 2"),
+        ("days", 0, "days must be positive"),
+        ("dt", -0.1, "dt must be a positive number"),
+        ("dt", "nan", "dt must be a positive number"),
+    ],
+)
+def test_sir_query_rejects_bad_settings(field, value, message):
+    payload = {"population": 1000, "beta": 0.3, "gamma": 0.1, field: value}
+    with pytest.raises(RequestError, match=message):
+        sir_query(payload)
+
+def test_sample_aliases_only_apply_to_the_sample_table(tmp_path):
+    from healthcare_suite.service import check_interactions
+
+    csv = tmp_path / "i.csv"
+    csv.write_text(HEADER + "Aspirin,Warfarin,major,Bleeding\n")
+    out = check_interactions({"medications": ["coumadin", "aspirin"], "db_path": str(csv)})
+    assert out["count"] == 0 and [u["name"] for u in out["unresolved"]] == ["coumadin"]
+    sample = check_interactions({"medications": ["coumadin", "advil"]})
+    assert sample["count"] == 1
+    with pytest.raises(RequestError, match="aliases_path"):
+        check_interactions({"medications": ["aspirin"], "aliases_path": "/etc/passwd"})
+
+def test_booking_rejects_utc_offsets_and_missing_provider(tmp_path):
+    from healthcare_suite.scheduler import SQLiteCalendarStore
+    from healthcare_suite.service import availability, book_appointment
+
+    store = SQLiteCalendarStore(str(tmp_path / "calendar.db"))
+    booking = {
+        "provider_id": "d1",
+        "patient_id": "p1",
+        "requested_start": "2026-01-05T09:00:00+00:00",
+        "requested_end": "2026-01-05T10:00:00+00:00",
+    }
+    with pytest.raises(RequestError, match="UTC offset"):
+        book_appointment(store, booking)
+    with pytest.raises(RequestError, match="UTC offset"):
+        availability(
+            store, {"provider_id": "d1", "start": "2026-01-05T09:00Z", "end": "2026-01-05T10:00"}
+        )
+    booking.update(requested_start="2026-01-05T09:00:00", requested_end="2026-01-05T10:00:00")
+    for provider_id in (None, "", 7):
+        with pytest.raises(RequestError, match="provider_id"):
+            book_appointment(store, {**booking, "provider_id": provider_id})
+    assert book_appointment(store, booking)["start"] == "2026-01-05T09:00:00"
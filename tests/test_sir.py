@@ -10,3 +10,197 @@ def test_sir_non_negative():
     params = SIRParams(population=100, beta=1.0, gamma=0.5, initial_infected=1)
     df = SIRModel(params).simulate_euler(days=5, dt=0.1)
     assert (df[["S", "I", "R"]] >= 0).all().all()
+
+def test_sir_methods_conserve_and_sample_output():
+    params = SIRParams(population=1000, beta=0.3, gamma=0.1, initial_infected=10)
+    model = SIRModel(params)
+    fine = model.simulate(days=60, dt=0.01, method="rk4", output_dt=1.0)
+    assert len(fine) == 61 and fine["t"].iloc[-1] == 60
+    for method, dt in (("euler", 0.05), ("rk4", 0.5), ("rk45", 1.0)):
+        df = model.simulate(days=60, dt=dt, method=method, output_dt=1.0)
+        assert len(df) == 61
+        assert ((df["S"] + df["I"] + df["R"]).round(6) == params.population).all()
+        tol = 5.0 if method == "euler" else 0.05
+        assert (df["I"] - fine["I"]).abs().max() < tol
+
+def test_sir_rejects_misaligned_output_interval():
+    import pytest
+
+    model = SIRModel(SIRParams(population=100, beta=0.3, gamma=0.1))
+    with pytest.raises(ValueError):
+        model.simulate(days=10, dt=0.3, output_dt=1.0)
+
+def test_ensemble_matches_individual_runs():
+    from healthcare_suite.sir import simulate_ensemble
+
+    grid = [
+        SIRParams(population=1000, beta=0.3, gamma=0.1, initial_infected=10),
+        SIRParams(population=500, beta=0.5, gamma=0.2, initial_infected=1, initial_recovered=50),
+        SIRParams(population=2000, beta=0.1, gamma=0.2, initial_infected=5),
+    ]
+    long = simulate_ensemble(grid, days=30, dt=0.5, output_dt=1.0)
+    _, y = simulate_ensemble(grid, days=30, dt=0.5, output_dt=1.0, output="array")
+    summary = simulate_ensemble(grid, days=30, dt=0.5, output="summary", chunk_size=2)
+    assert y.shape == (3, 31, 3) and len(long) == 3 * 31
+    for k, params in enumerate(grid):
+        df = SIRModel(params).simulate_euler(days=30, dt=0.5)
+        sampled = df.iloc[::2].reset_index(drop=True)
+        assert abs(y[k, :, 1] - sampled["I"].to_numpy()).max() < 1e-9
+        rows = long[long["scenario"] == k]
+        assert abs(rows["R"].to_numpy() - sampled["R"].to_numpy()).max() < 1e-9
+        peak = df["I"].idxmax()
+        row = summary.iloc[k]
+        assert abs(row["peak_infected"] - df["I"][peak]) < 1e-9
+        assert abs(row["peak_day"] - df["t"][peak]) < 1e-9
+        assert abs(row["final_recovered"] - df["R"].iloc[-1]) < 1e-9
+
+def test_ensemble_accepts_columns_and_validates():
+    import pytest
+
+    from healthcare_suite.sir import simulate_ensemble
+
+    summary = simulate_ensemble(
+        {"population": 1000, "beta": [0.2, 0.3, 0.4], "gamma": 0.1},
+        days=20,
+        dt=1.0,
+        output="summary",
+    )
+    assert len(summary) == 3 and summary["peak_infected"].is_monotonic_increasing
+    with pytest.raises(ValueError, match="scenario 1"):
+        simulate_ensemble(
+            {"population": [10, 10], "beta": 0.3, "gamma": 0.1, "initial_infected": [1, 20]}, days=5
+        )
+
+def test_stochastic_replicates_are_seeded_and_banded():
+    from healthcare_suite.sir import run_replicates, simulate_stochastic
+
+    params = SIRParams(population=200, beta=0.4, gamma=0.1, initial_infected=1)
+    one = simulate_stochastic(params, days=100, seed=7)
+    assert one.equals(simulate_stochastic(params, days=100, seed=7))
+    assert ((one["S"] + one["I"] + one["R"]) == 200).all()
+    for method in ("gillespie", "tau"):
+        summary = run_replicates(
+            params, days=150, replicates=600, method=method, seed=1, block_size=100
+        )
+        bands = summary.bands
+        assert len(bands) == 151
+        assert (bands["I_q05"] <= bands["I_q50"]).all() and (bands["I_q50"] <= bands["I_q95"]).all()
+        # A single initial case dies out with probability about gamma / beta.
+        assert 0.15 < summary.extinction_probability < 0.35
+    again = run_replicates(params, days=150, replicates=600, seed=1, block_size=100)
+    assert again.bands.equals(summary.bands)
+
+def test_structured_model_reduces_to_well_mixed_sir():
+    import numpy as np
+
+    from healthcare_suite.sir import StructuredSIRModel
+
+    params = SIRParams(population=1000, beta=0.3, gamma=0.1, initial_infected=10)
+    ref = SIRModel(params).simulate_euler(days=30, dt=0.5)
+    # Two identical regions exchanging commuters behave like one well-mixed population.
+    mobility = (np.array([0.2, 0.2]), np.array([1, 0]), np.array([0, 1, 2]))
+    model = StructuredSIRModel(
+        [1000, 1000],
+        beta=0.3,
+        gamma=0.1,
+        mobility=mobility,
+        initial_infected=10,
+        regions=["a", "b"],
+    )
+    df = model.simulate(days=30, dt=0.5)
+    assert list(df.columns) == ["region", "group", "t", "S", "I", "R"] and len(df) == 2 * 61
+    for region in ("a", "b"):
+        rows = df[df["region"] == region]
+        assert np.abs(rows["I"].to_numpy() - ref["I"].to_numpy()).max() < 1e-9
+
+def test_structured_model_contacts_and_mobility():
+    import numpy as np
+
+    from healthcare_suite.sir import StructuredSIRModel
+
+    population = np.array([[600.0, 400.0], [900.0, 100.0], [500.0, 500.0]])
+    contact = np.array([[3.0, 1.0], [1.0, 2.0]])
+    dense = np.array([[0.0, 0.1, 0.0], [0.05, 0.0, 0.0], [0.0, 0.0, 0.0]])
+    sparse = (dense[dense > 0], np.nonzero(dense)[1], np.array([0, 1, 2, 2]))
+    kwargs = dict(
+        beta=0.05,
+        gamma=np.array([0.1, 0.2]),
+        contact=contact,
+        initial_infected=np.array([[5.0, 0.0], [0.0, 0.0], [0.0, 0.0]]),
+    )
+    _, y = StructuredSIRModel(population, mobility=dense, **kwargs).simulate(
+        days=40, dt=0.25, method="rk4", output="array"
+    )
+    _, y_sparse = StructuredSIRModel(population, mobility=sparse, **kwargs).simulate(
+        days=40, dt=0.25, method="rk4", output="array"
+    )
+    assert y.shape == (161, 3, 3, 2) and np.allclose(y, y_sparse)
+    assert np.allclose(y.sum(axis=1), population)
+    # No one travels to or from region 2, so it stays infection-free.
+    assert y[-1, 1, 1].sum() > 0 and y[:, 1, 2].max() == 0
+
+def test_fit_sir_recovers_parameters():
+    import numpy as np
+
+    from healthcare_suite.sir import fit_sir
+
+    truth = SIRParams(population=50000, beta=0.4, gamma=0.15, initial_infected=10)
+    df = SIRModel(truth).simulate(days=120, dt=0.5, method="rk4", output_dt=1.0)
+    noise = np.random.default_rng(3).lognormal(0.0, 0.05, len(df))
+    observed = df[["t"]].assign(I=df["I"] * noise)
+    fit = fit_sir(observed, population=50000, initial_infected=10, starts=4)
+    assert fit.converged
+    assert fit.beta_ci[0] < fit.params.beta < fit.beta_ci[1]
+    assert abs(fit.params.beta - 0.4) < 0.01 and abs(fit.params.gamma - 0.15) < 0.01
+    assert abs(fit.r0 - 0.4 / 0.15) < 0.1
+    cases = df[["t"]].assign(cases=np.concatenate([[0.0], -np.diff(df["S"])]))
+    exact = fit_sir(
+        cases, population=50000, column="cases", initial_infected=10, starts=[(0.3, 0.1)]
+    )
+    assert abs(exact.params.beta - 0.4) < 1e-3 and abs(exact.params.gamma - 0.15) < 1e-3
+
+def test_fit_sir_validates_input():
+    import pandas as pd
+    import pytest
+
+    from healthcare_suite.sir import fit_sir
+
+    with pytest.raises(ValueError):
+        fit_sir(pd.DataFrame({"t": [0, 1, 2], "X": [1, 2, 3]}), population=100)
+    with pytest.raises(ValueError):
+        fit_sir(pd.DataFrame({"t": [0, 0.5, 1], "I": [1, 2, 3]}), population=100)
+
+def test_simulate_cached_and_downsample():
+    from healthcare_suite.sir.cache import simulate_cached
+    from healthcare_suite.sir.downsample import downsample
+
+    params = SIRParams(population=1000, beta=0.3, gamma=0.1, initial_infected=10)
+    first = simulate_cached(params, 100, 0.1)
+    assert simulate_cached(params, 100, 0.1) is first
+    assert first.equals(SIRModel(params).simulate_euler(days=100, dt=0.1))
+    small = downsample(first, 50)
+    assert len(small) == 50
+    assert small["t"].iloc[0] == 0 and small["t"].iloc[-1] == first["t"].iloc[-1]
+    assert downsample(small, 100) is small
+
+def test_summary_matches_simulation():
+    import numpy as np
+
+    from healthcare_suite.sir import summarize
+
+    params = SIRParams(
+        population=5000, beta=0.4, gamma=0.1, initial_infected=5, initial_recovered=500
+    )
+    s = SIRModel(params).summary()
+    df = SIRModel(params).simulate(days=400, dt=0.01, method="rk4")
+    assert abs(s.r0 - 4.0) < 1e-12
+    assert abs(s.peak_infected - df["I"].max()) < 1e-3
+    assert abs(s.peak_day - df["t"][df["I"].idxmax()]) < 0.01
+    assert abs(s.final_recovered - df["R"].iloc[-1]) < 1e-3
+    assert abs(s.attack_rate - (df["R"].iloc[-1] - 500) / 5000) < 1e-6
+
+    grid = summarize(
+        1000, np.array([0.05, 0.3, 0.3]), np.array([0.1, 0.1, 0.0]), initial_infected=10
+    )
+    assert list(grid["peak_day"][[0, 2]]) == [0.0, np.inf]
+    assert grid["peak_infected"][0] == 10 and grid["attack_rate"][2] == 1.0